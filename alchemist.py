@@ -1,230 +1,233 @@
 # Import Qiskit and other libraries
-from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister
-from qiskit import execute, Aer
-from qiskit.tools.visualization import plot_histogram
-# No need to import Aer again
-# No need to reimport plot_histogram
-# from qiskit.tools.visualization import plot_histogram
+# Qiskit is imported when the script is run, so that importing this module stays fast
 
 
 
-# Define the number of qubits and the algorithm to run
-num_qubits = 4
-algorithm = "Grover's algorithm"
+if __name__ == '__main__':
+    from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister
+    from qiskit import execute, Aer
+    from qiskit.tools.visualization import plot_histogram
+    # No need to import Aer again
+    # No need to reimport plot_histogram
+    # from qiskit.tools.visualization import plot_histogram
 
-# Initialize the resource state for MBQC 
-# How to initialize the resource state for MBQC?
-q = QuantumRegister(num_qubits,'q')
-c = ClassicalRegister(num_qubits,'c')
-circuit = QuantumCircuit(q,c)
+    # Define the number of qubits and the algorithm to run
+    num_qubits = 4
+    algorithm = "Grover's algorithm"
 
-# Determine the measurement sequence based on the algorithm and previous outcomes
-# How to determine the measurement sequence based on the algorithm and previous outcomes?
-# If the algorithm is Grover's algorithm, then the measurement sequence is as follows:
-# For the first qubit, do a measurement in the computational basis
-circuit.measure(q[0],c[0])
-# For the second qubit, do a measurement in the computational basis
-circuit.measure(q[1],c[1])
-# For the third qubit, do a measurement in the computational basis
-circuit.measure(q[2],c[2])
-# For the fourth qubit, do a measurement in the computational basis
-circuit.measure(q[3],c[3])
+    # Initialize the resource state for MBQC 
+    # How to initialize the resource state for MBQC?
+    q = QuantumRegister(num_qubits,'q')
+    c = ClassicalRegister(num_qubits,'c')
+    circuit = QuantumCircuit(q,c)
 
-# Manage the entanglement between the qubits
-# How to manage the entanglement between the qubits?
-# If the algorithm is Grover's algorithm, then the entanglement is as follows:
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
+    # Determine the measurement sequence based on the algorithm and previous outcomes
+    # How to determine the measurement sequence based on the algorithm and previous outcomes?
+    # If the algorithm is Grover's algorithm, then the measurement sequence is as follows:
+    # For the first qubit, do a measurement in the computational basis
+    circuit.measure(q[0],c[0])
+    # For the second qubit, do a measurement in the computational basis
+    circuit.measure(q[1],c[1])
+    # For the third qubit, do a measurement in the computational basis
+    circuit.measure(q[2],c[2])
+    # For the fourth qubit, do a measurement in the computational basis
+    circuit.measure(q[3],c[3])
 
-# Handle any errors that might occur in the quantum states
-# How to handle any errors that might occur in the quantum states?
-# If the algorithm is Grover's algorithm, then the error handling is as follows:
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
+    # Manage the entanglement between the qubits
+    # How to manage the entanglement between the qubits?
+    # If the algorithm is Grover's algorithm, then the entanglement is as follows:
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
 
-# Interpret the final measurement results as the output of the computation
-# How to interpret the final measurement results as the output of the computation?
-# If the algorithm is Grover's algorithm, then the interpretation is as follows:
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
+    # Handle any errors that might occur in the quantum states
+    # How to handle any errors that might occur in the quantum states?
+    # If the algorithm is Grover's algorithm, then the error handling is as follows:
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
 
-# Provide real-time feedback on the entangled states
-# How to provide real-time feedback on the entangled states?
-# If the algorithm is Grover's algorithm, then the feedback is as follows:
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a controlled-Z gate to the first and second qubits
-circuit.cz(q[0],q[1])
-# Apply a controlled-Z gate to the third and fourth qubits
-circuit.cz(q[2],q[3])
-# Apply a controlled-Z gate to the second and third qubits
-circuit.cz(q[1],q[2])
-# Apply a Hadamard gate to the first qubit
-circuit.h(q[0])
-# Apply a Hadamard gate to the second qubit
-circuit.h(q[1])
-# Apply a Hadamard gate to the third qubit
-circuit.h(q[2])
-# Apply a Hadamard gate to the fourth qubit
-circuit.h(q[3])
+    # Interpret the final measurement results as the output of the computation
+    # How to interpret the final measurement results as the output of the computation?
+    # If the algorithm is Grover's algorithm, then the interpretation is as follows:
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
 
-# How to run the circuit on a simulator?
-# If the algorithm is Grover's algorithm, then the running is as follows:
-# Run the circuit on the simulator
-simulator = Aer.get_backend('qasm_simulator')
-job = execute(circuit, simulator, shots=1000)
-result = job.result()
-# Get the counts of the measurement outcomes
-counts = result.get_counts(circuit)
-# Plot the histogram of the measurement outcomes
-plot_histogram(counts)
-# Print the counts of the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
-# Print the measurement outcomes
-print(counts)
-# Print the measurement outcomes
-print(result.get_counts(circuit))
\ No newline at end of file
+    # Provide real-time feedback on the entangled states
+    # How to provide real-time feedback on the entangled states?
+    # If the algorithm is Grover's algorithm, then the feedback is as follows:
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a controlled-Z gate to the first and second qubits
+    circuit.cz(q[0],q[1])
+    # Apply a controlled-Z gate to the third and fourth qubits
+    circuit.cz(q[2],q[3])
+    # Apply a controlled-Z gate to the second and third qubits
+    circuit.cz(q[1],q[2])
+    # Apply a Hadamard gate to the first qubit
+    circuit.h(q[0])
+    # Apply a Hadamard gate to the second qubit
+    circuit.h(q[1])
+    # Apply a Hadamard gate to the third qubit
+    circuit.h(q[2])
+    # Apply a Hadamard gate to the fourth qubit
+    circuit.h(q[3])
+
+    # How to run the circuit on a simulator?
+    # If the algorithm is Grover's algorithm, then the running is as follows:
+    # Run the circuit on the simulator
+    simulator = Aer.get_backend('qasm_simulator')
+    job = execute(circuit, simulator, shots=1000)
+    result = job.result()
+    # Get the counts of the measurement outcomes
+    counts = result.get_counts(circuit)
+    # Plot the histogram of the measurement outcomes
+    plot_histogram(counts)
+    # Print the counts of the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
+    # Print the measurement outcomes
+    print(counts)
+    # Print the measurement outcomes
+    print(result.get_counts(circuit))
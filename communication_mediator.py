@@ -1,4 +1,3 @@
-python
 # CM droplet: Communication Mediator
 # This droplet acts as a bridge between the two VMs, facilitating their communication.
 # It ensures that messages generated by the SG are properly transmitted and received.
@@ -7,8 +6,12 @@ python
 
 # Import libraries
 import numpy as np # A library for scientific computing
+from core import rng, measure_state, generate_message # The state, sampling and message primitives shared by all droplets
 import random # A library for generating random numbers
-import time # A library for measuring time
+import asyncio # A library for asynchronous input and output
+import heapq # A library for priority queues
+import itertools # A library for iterators
+import collections # A library for container datatypes
 
 
 # Define constants
@@ -18,229 +21,352 @@ vocab = ['abracadabra', 'boogeyman', 'cataclysm', 'doppelganger', 'eerie', 'fias
 emoticons = [':)', ':(', ':o', ':D', ':P', ':/', ';)', '<3', ':*', ':|', ':@', ':S'] # A list of emoticons to use as symbols
 noise_level = 0.1 # The probability of adding noise or distortion to a message
 delay_level = 5 # The maximum delay in seconds for sending or receiving a message
+LATENCY_SAMPLES = 10000 # The number of recent delivery latencies the mediator keeps for its percentiles
+ALPHABET = ''.join(chr(code) for code in range(33, 127)) # The printable ASCII symbols that replace noisy characters
+ERASURE = '?' # The symbol that replaces erased characters
+BURST_LENGTH = 4 # The number of characters hit by each burst error
 
 
 # Define functions
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
+def add_noise(message, noise_level):
+  # This function adds some noise or distortion to a message with a given probability
+  # Input: message, a string representing the message
+  #        noise_level, a float representing the probability of adding noise or distortion to each character
+  # Output: a string representing the noisy or distorted message
 
 
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
+  # Pass the message alone through a noise channel with the given noise level
+  return NoiseChannel(noise_level).transmit([message])[0]
 
 
-  # Loop over m measurements
-  for i in range(m):
+def add_emoticon(message, emoticons):
+  # This function adds an emoticon to the end of a message from a list of emoticons
+  # Input: message, a string representing the message
+  #        emoticons, a list of emoticons to use as symbols
+  # Output: a string representing the message with an emoticon
 
 
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
+  # Choose a random emoticon from the list
+  emoticon = random.choice(emoticons)
 
 
-    # Initialize a cumulative probability
-    p = 0
+  # Add the emoticon to the end of the message, separated by a space
+  message_with_emoticon = message + ' ' + emoticon
 
 
-    # Loop over each basis state
-    for j in range(len(state)):
+  # Return the message with an emoticon
+  return message_with_emoticon
 
 
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
+async def add_delay(delay_level):
+  # This coroutine waits a random delay before sending or receiving a message, up to a maximum delay level, without blocking other messages
+  # Input: delay_level, an integer representing the maximum delay in seconds
+  # Output: None
 
 
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
+  # Generate a random delay between 0 and delay_level seconds
+  delay = random.randint(0, delay_level)
 
 
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
+  # Wait for the delay to pass while the event loop serves other messages
+  await asyncio.sleep(delay)
 
 
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
+# Define classes
+class NoiseChannel:
+  # This class adds noise to whole batches of messages at once: the messages are joined into one numpy array of character codes, and the characters to corrupt and their replacements are drawn for the whole batch in single numpy calls
+  # Besides independent noise on each character, the channel can hit runs of consecutive characters with burst errors and replace characters with an erasure symbol
+  # Input: noise_level, a float representing the probability of replacing each character with a random symbol of the alphabet
+  #        burst_rate, a float representing the probability of a burst error starting at each character
+  #        burst_length, an integer representing the number of characters hit by each burst error, cut at the end of its message
+  #        erasure_level, a float representing the probability of erasing each character
+  #        alphabet, a string of the symbols that replace noisy characters
+  #        erasure, a string of one symbol that replaces erased characters
 
 
-        # Break out of the loop
-        break
+  def __init__(self, noise_level=noise_level, burst_rate=0.0, burst_length=BURST_LENGTH, erasure_level=0.0, alphabet=ALPHABET, erasure=ERASURE):
+    # Check the alphabet and the erasure symbol
+    if not alphabet:
+      raise ValueError('The noise alphabet is empty')
+    if len(erasure) != 1:
+      raise ValueError('The erasure symbol must be a single character')
 
 
-  # Return the frequency dictionary
-  return freqs
+    # Store the channel model, with the symbols as character codes
+    self.noise_level = noise_level
+    self.burst_rate = burst_rate
+    self.burst_length = burst_length
+    self.erasure_level = erasure_level
+    self.alphabet = self.encode([alphabet])[0]
+    self.erasure = ord(erasure)
 
 
-def generate_message(freqs, vocab):
-  # This function generates a message based on the frequencies of each outcome and a vocabulary list
-  # Input: freqs, a dictionary mapping each outcome to its frequency
-  #        vocab, a list of words to use as vocabulary
-  # Output: a string representing the message
+  def encode(self, messages):
+    # This method joins a batch of messages into one array of character codes
+    # Input: messages, a list of strings representing the messages
+    # Output: a tuple of a numpy array of uint32 character codes and a numpy array of the len(messages) + 1 offsets of the messages in it
 
 
-  # Initialize an empty message
-  message = ''
+    # Encode the joined messages as UTF-32, one code per character whatever the characters are
+    lengths = np.fromiter((len(message) for message in messages), dtype=np.int64, count=len(messages))
+    codes = np.frombuffer(''.join(messages).encode('utf-32-le'), dtype=np.uint32).copy()
+    return codes, np.concatenate([[0], np.cumsum(lengths)])
 
 
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+  def decode(self, codes, offsets):
+    # This method splits an array of character codes back into messages
+    # Input: codes, a numpy array of uint32 character codes
+    #        offsets, a numpy array of the offsets of the messages in codes
+    # Output: a list of strings representing the messages
 
 
-  # Loop over the top three outcomes
-  for i in range(3):
+    # Decode all the characters at once, then cut the messages out of the joined string
+    text = codes.astype(np.uint32).tobytes().decode('utf-32-le')
+    offsets = offsets.tolist()
+    return [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
 
 
-    # Get the outcome and its frequency from the sorted list
-    outcome, frequency = sorted_outcomes[i]
+  def bursts(self, offsets):
+    # This method draws the characters hit by burst errors
+    # Input: offsets, a numpy array of the offsets of the messages in the joined character codes
+    # Output: a boolean numpy array with one entry per character
 
 
-    # Convert the outcome to an integer index by interpreting it as a binary number
-    index = int(outcome, 2)
+    # Draw the characters where a burst starts
+    total = int(offsets[-1])
+    starts = rng.random(total) < self.burst_rate
 
 
-    # Check if the index is within the range of the vocabulary list
-    if index < len(vocab):
+    # A character is hit if a burst started within the burst_length characters up to it and not before the start of its message; count the bursts in that window with cumulative sums
+    started = np.concatenate([[0], np.cumsum(starts)])
+    position = np.arange(total)
+    first = np.repeat(offsets[:-1], np.diff(offsets))
+    return started[position + 1] > started[np.maximum(position + 1 - self.burst_length, first)]
 
 
-      # Get the word corresponding to the index from the vocabulary list
-      word = vocab[index]
+  def corrupt(self, codes, offsets):
+    # This method adds noise to joined character codes in place
+    # Input: codes, a numpy array of uint32 character codes
+    #        offsets, a numpy array of the offsets of the messages in codes
+    # Output: the noisy codes
 
 
-      # Add the word and its frequency to the message, separated by a colon and a space
-      message += word + ': ' + str(frequency) + ', '
+    # Draw the characters to replace, from independent noise and from burst errors
+    noisy = rng.random(len(codes)) < self.noise_level
+    if self.burst_rate > 0:
+      noisy |= self.bursts(offsets)
 
 
-  # Remove the last comma and space from the message
-  message = message[:-2]
+    # Replace them with random symbols of the alphabet, drawn all at once
+    positions = np.flatnonzero(noisy)
+    codes[positions] = self.alphabet[rng.integers(len(self.alphabet), size=len(positions))]
 
 
-  # Return the message
-  return message
+    # Erase characters
+    if self.erasure_level > 0:
+      codes[rng.random(len(codes)) < self.erasure_level] = self.erasure
+    return codes
 
 
-def add_noise(message, noise_level):
-  # This function adds some noise or distortion to a message with a given probability
-  # Input: message, a string representing the message
-  #        noise_level, a float representing the probability of adding noise or distortion
-  # Output: a string representing the noisy or distorted message
+  def transmit(self, messages):
+    # This method adds noise to a batch of messages
+    # Input: messages, a list of strings representing the messages
+    # Output: a list of strings representing the noisy or distorted messages
 
 
-  # Initialize an empty noisy message
-  noisy_message = ''
+    # Encode the batch, corrupt its characters and decode it
+    codes, offsets = self.encode(messages)
+    return self.decode(self.corrupt(codes, offsets), offsets)
 
 
-  # Loop over each character in the message
-  for char in message:
+class MessageMediator:
+  # This class delivers messages after random delays without blocking: every message gets a delivery time in a priority queue, and a single timer on the event loop delivers them in order of their delivery times
+  # Any number of messages with independent delays are in flight at once, and each costs O(log n) to schedule and deliver
+  # Input: delay_level, an integer representing the maximum delay in seconds
+  #        deliver, an optional function called with each message when it is delivered
 
 
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
+  def __init__(self, delay_level=delay_level, deliver=None):
+    # Store the delay level and the delivery function
+    self.delay_level = delay_level
+    self.deliver = deliver
 
 
-    # Check if the random number is less than or equal to the noise level
-    if r <= noise_level:
+    # Initialize the priority queue of (delivery time, sequence number, sending time, message, future) entries and the timer of the earliest delivery
+    self.pending = []
+    self.sequence = itertools.count()
+    self.timer = None
 
 
-      # Replace the character with a random symbol from the ASCII table
-      noisy_char = chr(random.randint(33, 126))
+    # Initialize the counters
+    self.sent = 0
+    self.delivered = 0
+    self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+    self.lags = collections.deque(maxlen=LATENCY_SAMPLES)
 
 
-      # Add the noisy character to the noisy message
-      noisy_message += noisy_char
+  def send(self, message, delay=None):
+    # This method schedules the delivery of a message; it must be called from a running event loop
+    # Input: message, a string representing the message
+    #        delay, an optional float representing the delay in seconds, a random integer between 0 and delay_level by default
+    # Output: an asyncio future resolved with the message when it is delivered
 
 
-    else:
-      # Add the original character to the noisy message
-      noisy_message += char
+    # Get the delivery time of the message
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    if delay is None:
+      delay = random.randint(0, self.delay_level)
 
 
-  # Return the noisy message
-  return noisy_message
+    # Add the message to the priority queue
+    future = loop.create_future()
+    entry = (now + delay, next(self.sequence), now, message, future)
+    heapq.heappush(self.pending, entry)
+    self.sent += 1
 
 
-def add_emoticon(message, emoticons):
-  # This function adds an emoticon to the end of a message from a list of emoticons
-  # Input: message, a string representing the message
-  #        emoticons, a list of emoticons to use as symbols
-  # Output: a string representing the message with an emoticon
+    # Move the timer forward if the message is now the earliest delivery
+    if self.pending[0] is entry:
+      self.schedule(loop)
 
 
-  # Choose a random emoticon from the list
-  emoticon = random.choice(emoticons)
+    # Return the future of the delivery
+    return future
 
 
-  # Add the emoticon to the end of the message, separated by a space
-  message_with_emoticon = message + ' ' + emoticon
+  def schedule(self, loop):
+    # This method sets the timer to the earliest delivery time
+    # Input: loop, the running asyncio event loop
+    # Output: None
 
 
-  # Return the message with an emoticon
-  return message_with_emoticon
+    if self.timer is not None:
+      self.timer.cancel()
+    self.timer = loop.call_at(self.pending[0][0], self.flush, loop) if self.pending else None
 
 
-def add_delay(delay_level):
-  # This function adds a random delay before sending or receiving a message, up to a maximum delay level
-  # Input: delay_level, an integer representing the maximum delay in seconds
-  # Output: None
+  def flush(self, loop):
+    # This method runs on the timer and delivers every message that is due
+    # Input: loop, the running asyncio event loop
+    # Output: None
 
 
-  # Generate a random delay between 0 and delay_level seconds
-  delay = random.randint(0, delay_level)
+    # Pop the due messages in order of their delivery times
+    now = loop.time()
+    while self.pending and self.pending[0][0] <= now:
+      due, sequence, sent_at, message, future = heapq.heappop(self.pending)
+
+
+      # Record the latency from sending and the lag behind the delivery time
+      self.latencies.append(now - sent_at)
+      self.lags.append(now - due)
+      self.delivered += 1
+
+
+      # Deliver the message and resolve its future, passing on an error of the delivery function
+      try:
+        if self.deliver is not None:
+          self.deliver(message)
+      except Exception as error:
+        if not future.done():
+          future.set_exception(error)
+        continue
+      if not future.done():
+        future.set_result(message)
+
+
+    # Set the timer to the next delivery
+    self.timer = None
+    self.schedule(loop)
+
+
+  async def transmit(self, message, delay=None):
+    # This coroutine sends a message and waits for its delivery
+    # Input: message, a string representing the message
+    #        delay, an optional float representing the delay in seconds
+    # Output: the delivered message
+
+
+    return await self.send(message, delay)
+
+
+  async def join(self):
+    # This coroutine waits until every message sent so far is delivered
+    # Input: None
+    # Output: None
+
+
+    await asyncio.gather(*(entry[4] for entry in self.pending), return_exceptions=True)
+
+
+  def stats(self):
+    # This method reports the counters of the mediator
+    # Input: None
+    # Output: a dictionary of message counts and percentiles in seconds of the delivery latencies and of the lags behind the delivery times
 
 
-  # Wait for the delay to pass
-  time.sleep(delay)
+    # Compute the percentiles of the recent latencies and lags
+    latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+    lags = np.array(self.lags) if self.lags else np.zeros(1)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    lag50, lag90, lag99 = np.percentile(lags, [50, 90, 99])
+    return {'sent': self.sent, 'delivered': self.delivered, 'in_flight': len(self.pending),
+            'latency_p50': p50, 'latency_p90': p90, 'latency_p99': p99, 'lag_p50': lag50, 'lag_p90': lag90, 'lag_p99': lag99}
 
 
 # Main program
 
 
-# Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
+if __name__ == '__main__':
 
 
-# Measure sync_state1 M times and get the frequencies of each outcome
-freqs1 = measure_state(sync_state1, M)
+  # Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
 
 
-# Generate a message for VM1 based on freqs1 and vocab
-message1 = generate_message(freqs1, vocab)
+  # Measure sync_state1 M times and get the frequencies of each outcome
+  freqs1 = measure_state(sync_state1, M)
 
 
-# Add some noise or distortion to message1 with noise_level probability
-message1 = add_noise(message1, noise_level)
+  # Generate a message for VM1 based on freqs1 and vocab
+  message1 = generate_message(freqs1, vocab)
 
 
-# Add an emoticon to message1 from emoticons list
-message1 = add_emoticon(message1, emoticons)
+  # Add some noise or distortion to message1 with noise_level probability
+  message1 = add_noise(message1, noise_level)
 
 
-# Print the message for VM1
-print('Message for VM1:', message1)
+  # Add an emoticon to message1 from emoticons list
+  message1 = add_emoticon(message1, emoticons)
 
 
-# Add some delay before sending or receiving message1 with delay_level maximum seconds
-add_delay(delay_level)
+  # Print the message for VM1
+  print('Message for VM1:', message1)
 
 
-# Measure sync_state2 M times and get the frequencies of each outcome
-freqs2 = measure_state(sync_state2, M)
+  # Measure sync_state2 M times and get the frequencies of each outcome
+  freqs2 = measure_state(sync_state2, M)
 
 
-# Generate a message for VM2 based on freqs2 and vocab
-message2 = generate_message(freqs2, vocab)
+  # Generate a message for VM2 based on freqs2 and vocab
+  message2 = generate_message(freqs2, vocab)
 
 
-# Add some noise or distortion to message2 with noise_level probability
-message2 = add_noise(message2, noise_level)
+  # Add some noise or distortion to message2 with noise_level probability
+  message2 = add_noise(message2, noise_level)
 
 
-# Add an emoticon to message2 from emoticons list
-message2 = add_emoticon(message2, emoticons)
+  # Add an emoticon to message2 from emoticons list
+  message2 = add_emoticon(message2, emoticons)
 
 
-# Print the message for VM2
-print('Message for VM2:', message2)
+  # Print the message for VM2
+  print('Message for VM2:', message2)
 
 
-# Add some delay before sending or receiving message2 with delay_level maximum seconds
-add_delay(delay_level)
+  # Deliver both messages after independent delays with delay_level maximum seconds, overlapping their delays, and print the delivery latencies
+  async def mediate():
+    mediator = MessageMediator(delay_level, deliver=lambda message: print('Delivered:', message))
+    await asyncio.gather(mediator.transmit(message1), mediator.transmit(message2))
+    print(mediator.stats())
+  asyncio.run(mediate())
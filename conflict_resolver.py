@@ -9,90 +9,25 @@ pythonapi
 
 # Import libraries
 import numpy as np # A library for scientific computing
+from core import measure_state, generate_message, format_message, parse_message # The state, sampling and message primitives shared by all droplets
 import difflib # A library for comparing sequences
+import collections # A library for container datatypes
+import zlib # A library for checksums
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
 M = 100 # The number of measurements to perform on each quantum state
 vocab = ['abracadabra', 'boogeyman', 'cataclysm', 'doppelganger', 'eerie', 'fiasco', 'ghastly', 'hocus-pocus', 'incantation', 'jinx', 'karma', 'lunatic'] # A list of words to use as vocabulary
 threshold = 0.8 # The threshold for message similarity
+SHINGLE = 3 # The number of consecutive characters in each shingle of a message hashed by MinHash
+PERMUTATIONS = 64 # The number of hash functions of each MinHash signature
+BANDS = 16 # The number of bands the MinHash signatures are cut into for locality-sensitive hashing
+PRIME = 2**31 - 1 # The prime modulus of the MinHash hash functions
 
-# Define functions
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
-
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
-
-  # Loop over m measurements
-  for i in range(m):
-
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
-
-    # Initialize a cumulative probability
-    p = 0
-
-    # Loop over each basis state
-    for j in range(len(state)):
-
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
-
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
-
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
-
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
-
-        # Break out of the loop
-        break
-
-  # Return the frequency dictionary
-  return freqs
-
-def generate_message(freqs, vocab):
-  # This function generates a message based on the frequencies of each outcome and a vocabulary list
-  # Input: freqs, a dictionary mapping each outcome to its frequency
-  #        vocab, a list of words to use as vocabulary
-  # Output: a string representing the message
-
-  # Initialize an empty message
-  message = ''
-
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
-
-  # Loop over the top three outcomes
-  for i in range(3):
-
-    # Get the outcome and its frequency from the sorted list
-    outcome, frequency = sorted_outcomes[i]
-
-    # Convert the outcome to an integer index by interpreting it as a binary number
-    index = int(outcome, 2)
-
-    # Check if the index is within the range of the vocabulary list
-    if index < len(vocab):
-
-      # Get the word corresponding to the index from the vocabulary list
-      word = vocab[index]
-
-      # Add the word and its frequency to the message, separated by a colon and a space
-      message += word + ': ' + str(frequency) + ', '
-
-  # Remove the last comma and space from the message
-  message = message[:-2]
-
-  # Return the message
-  return message
+# Define global variables
+minhash_parameters = np.random.default_rng(0).integers(1, PRIME, size=(2, PERMUTATIONS, 1)) # The coefficients of the MinHash hash functions, fixed so that signatures are comparable across calls
 
+# Define functions
 def compare_messages(message1, message2):
   # This function compares two messages and returns their similarity ratio, which is a measure of how close they are
   # Input: message1, message2, two strings representing messages
@@ -104,140 +39,160 @@ def compare_messages(message1, message2):
   # Calculate and return their similarity ratio using the ratio method of the matcher object
   return matcher.ratio()
 
+def compare_records(records1, records2):
+  # This function compares the records of two messages and returns their similarity ratio, the structured counterpart of compare_messages function
+  # Every word in both messages is a match weighted by its smaller frequency over its larger one, and the ratio is 2 * matches / total number of words; a word repeated within a message counts once, with its first frequency
+  # Input: records1, records2, two lists of tuples of a word and its frequency
+  # Output: a float between 0 and 1
+
+  # Keep the first frequency of every word
+  frequencies1 = dict(reversed(records1))
+  frequencies2 = dict(reversed(records2))
+  total = len(frequencies1) + len(frequencies2)
+  if not total:
+    return 1.0
+
+  # Add up the weighted matches of the shared words
+  matches = sum(min(frequency, frequencies2[word]) / max(frequency, frequencies2[word]) if max(frequency, frequencies2[word]) else 1.0 for word, frequency in frequencies1.items() if word in frequencies2)
+  return 2.0 * matches / total
+
+def similar(message1, message2, threshold=threshold):
+  # This function decides whether the similarity ratio of two messages reaches a threshold
+  # Messages that both parse into records are scored on their records with compare_records function, in time linear in their number of words; other messages are scored on their characters, running the full matcher of compare_messages function only for the pairs that cheaper tiers cannot decide
+  # On characters, the ratio is 2 * matches / total length, and the matches cannot exceed the length of the shorter message, nor the characters the messages have in common
+  # Input: message1, message2, two strings representing messages
+  #        threshold, a float representing the threshold
+  # Output: a boolean, the same as compare_records(parse_message(message1), parse_message(message2)) >= threshold if both messages have records, else compare_messages(message1, message2) >= threshold
+
+  # Equal messages are as similar as can be
+  if message1 == message2:
+    return True
+
+  # Score the messages with records on their records
+  records1 = parse_message(message1)
+  records2 = parse_message(message2)
+  if records1 and records2:
+    return compare_records(records1, records2) >= threshold
+
+  # Reject the pairs whose lengths alone keep the ratio below the threshold
+  total = len(message1) + len(message2)
+  if 2.0 * min(len(message1), len(message2)) / total < threshold:
+    return False
+
+  # Reject the pairs whose character histograms keep the ratio below the threshold
+  common = sum((collections.Counter(message1) & collections.Counter(message2)).values())
+  if 2.0 * common / total < threshold:
+    return False
+
+  # Compare the remaining pairs with the full matcher
+  return compare_messages(message1, message2) >= threshold
+
+def minhash_signatures(messages, shingle=SHINGLE):
+  # This function computes the MinHash signature of every message, whose entries agree between two messages with a probability equal to the Jaccard similarity of their sets of shingles
+  # Input: messages, a list of strings representing messages
+  #        shingle, an integer representing the number of characters in each shingle
+  # Output: a 2D numpy array of int64 with one signature of PERMUTATIONS entries per message
+
+  a, b = minhash_parameters
+  signatures = np.empty((len(messages), PERMUTATIONS), dtype=np.int64)
+  for i, message in enumerate(messages):
+
+    # Hash the distinct shingles of the message, the whole message if it is shorter than a shingle
+    shingles = {message[start:start + shingle] for start in range(max(1, len(message) - shingle + 1))}
+    hashes = np.fromiter((zlib.crc32(part.encode('utf-8')) % PRIME for part in shingles), dtype=np.int64, count=len(shingles))
+
+    # Keep the smallest value of every hash function over the shingles
+    signatures[i] = ((a * hashes + b) % PRIME).min(axis=1)
+  return signatures
+
+def similar_pairs(messages, threshold=threshold, bands=BANDS):
+  # This function finds the pairs of messages whose similarity ratio reaches a threshold among many messages, without comparing all pairs
+  # Locality-sensitive hashing on the MinHash signatures proposes the pairs sharing a band of their signatures, and only those are checked with the similar function, so some similar pairs with few shingles in common may be missed
+  # Input: messages, a list of strings representing messages, one per VM
+  #        threshold, a float representing the threshold
+  #        bands, an integer dividing PERMUTATIONS representing the number of bands
+  # Output: a sorted list of tuples of the indices of two similar messages, the smaller first
+
+  # Put the messages with the same band of their signatures into the same bucket
+  signatures = minhash_signatures(messages)
+  rows = PERMUTATIONS // bands
+  buckets = collections.defaultdict(list)
+  for i, signature in enumerate(signatures):
+    for band in range(bands):
+      buckets[band, signature[band * rows:(band + 1) * rows].tobytes()].append(i)
+
+  # Check the pairs sharing a bucket
+  candidates = {(first, second) for bucket in buckets.values() for j, second in enumerate(bucket) for first in bucket[:j]}
+  return sorted(pair for pair in candidates if similar(messages[pair[0]], messages[pair[1]], threshold))
+
+def reconcile(*records):
+  # This function reconciles the records of the messages of any number of VMs into one consensus message in linear time, with a single hash join over all records
+  # Each word gets the average of its frequencies in the messages containing it, rounded to the nearest integer; a word repeated within a message counts once, with its first frequency
+  # Input: records, any number of lists of tuples of a word and its frequency, one per VM
+  # Output: a list of tuples of a word and its consensus frequency, in order of the first appearance of each word
+
+  # Add up the frequency and the number of messages of each word, in order of first appearance
+  totals = {}
+  for message in records:
+    seen = set()
+    for word, frequency in message:
+      if word not in seen:
+        seen.add(word)
+        total = totals.setdefault(word, [0, 0])
+        total[0] += frequency
+        total[1] += 1
+
+  # Average the frequencies
+  return [(word, round(total / count)) for word, (total, count) in totals.items()]
+
 def resolve_conflict(message1, message2):
   # This function resolves any conflict that may arise in the entangled communication by finding and fixing any discrepancies between two messages
   # Input: message1, message2, two strings representing messages
   # Output: two strings representing resolved messages
 
-  # Compare the two messages and get their similarity ratio using the compare_messages function
-  similarity = compare_messages(message1, message2)
-
-  # Check if the similarity ratio is below the threshold
-  if similarity < threshold:
-
-    # Initialize two empty lists for the resolved messages
-    resolved_message1 = []
-    resolved_message2 = []
+  # Resolve the two messages as a group of two
+  return tuple(resolve_conflicts([message1, message2]))
 
-    # Split the messages by commas and spaces and store them as lists of words and frequencies
-    message1_list = message1.split(', ')
-    message2_list = message2.split(', ')
+def resolve_conflicts(messages):
+  # This function resolves any conflict between the messages of any number of VMs
+  # Input: messages, a list of strings representing messages, one per VM
+  # Output: a list of strings representing the resolved messages, one per VM
 
-    # Loop over the words and frequencies in message1_list
-    for word_freq1 in message1_list:
+  # Keep the original messages if they are all similar enough to the first one, as decided by the similar function
+  if all(similar(messages[0], message) for message in messages[1:]):
+    return list(messages)
 
-      # Split the word and frequency by a colon and a space and store them as separate variables
-      word1, freq1 = word_freq1.split(': ')
+  # Otherwise parse every message once into records, reconcile them, and give every VM the consensus message
+  consensus = format_message(reconcile(*(parse_message(message) for message in messages)))
+  return [consensus] * len(messages)
 
-      # Convert the frequency to an integer
-      freq1 = int(freq1)
+def resolve_batch(messages1, messages2):
+  # This function resolves the conflicts of a batch of message pairs
+  # Input: messages1, messages2, two lists of strings representing the messages of VM1 and VM2
+  # Output: two lists of strings representing the resolved messages of VM1 and VM2
 
-      # Initialize a flag variable to indicate if the word is found in message2_list
-      found = False
+  # Resolve each pair, parsing only the pairs in conflict
+  resolved = [resolve_conflict(message1, message2) for message1, message2 in zip(messages1, messages2)]
+  return [message1 for message1, message2 in resolved], [message2 for message1, message2 in resolved]
 
-      # Loop over the words and frequencies in message2_list
-      for word_freq2 in message2_list:
-
-        # Split the word and frequency by a colon and a space and store them as separate variables
-        word2, freq2 = word_freq2.split(': ')
-
-        # Convert the frequency to an integer
-        freq2 = int(freq2)
-
-        # Check if the words are the same
-        if word1 == word2:
-
-          # Set the flag variable to True
-          found = True
-
-          # Check if the frequencies are different
-          if freq1 != freq2:
-
-            # Calculate the average of the frequencies and round it to the nearest integer
-            avg_freq = round((freq1 + freq2) / 2)
-
-            # Add the word and the average frequency to both resolved messages, separated by a colon and a space
-            resolved_message1.append(word1 + ': ' + str(avg_freq))
-            resolved_message2.append(word1 + ': ' + str(avg_freq))
-
-          else:
-            # Add the word and frequency to both resolved messages, separated by a colon and a space
-            resolved_message1.append(word_freq1)
-            resolved_message2.append(word_freq2)
-
-          # Break out of the inner loop
-          break
-
-      # Check if the flag variable is False, meaning the word was not found in message2_list
-      if not found:
-
-        # Add the word and frequency to both resolved messages, separated by a colon and a space
-        resolved_message1.append(word_freq1)
-        resolved_message2.append(word_freq1)
-
-    # Loop over the words and frequencies in message2_list
-    for word_freq2 in message2_list:
-
-      # Split the word and frequency by a colon and a space and store them as separate variables
-      word2, freq2 = word_freq2.split(': ')
-
-      # Convert the frequency to an integer
-      freq2 = int(freq2)
-
-      # Initialize a flag variable to indicate if the word is found in message1_list
-      found = False
-
-      # Loop over the words and frequencies in message1_list
-      for word_freq1 in message1_list:
-
-        # Split the word and frequency by a colon and a space and store them as separate variables
-        word1, freq1 = word_freq1.split(': ')
-
-        # Convert the frequency to an integer
-        freq1 = int(freq1)
-
-        # Check if the words are the same
-        if word2 == word1:
-
-          # Set the flag variable to True
-          found = True
-
-          # Break out of the inner loop
-          break
-
-      # Check if the flag variable is False, meaning the word was not found in message1_list
-      if not found:
-
-        # Add the word and frequency to both resolved messages, separated by a colon and a space
-        resolved_message1.append(word_freq2)
-        resolved_message2.append(word_freq2)
-
-    # Join the resolved messages by commas and spaces and store them as strings
-    resolved_message1 = ', '.join(resolved_message1)
-    resolved_message2 = ', '.join(resolved_message2)
-
-    # Return the resolved messages as strings
-    return resolved_message1, resolved_message2
+# Main program
 
-  else:
-    # Return the original messages as strings
-    return message1, message2
 
-# Main program
+if __name__ == '__main__':
 
-# Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
+  # Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
 
-# Measure sync_state1 M times and get the frequencies of each outcome
-freqs1 = measure_state(sync_state1, M)
+  # Measure sync_state1 M times and get the frequencies of each outcome
+  freqs1 = measure_state(sync_state1, M)
 
-# Generate a message for VM1 based on freqs1 and vocab using generate_message function from SG droplet (not shown here)
-message1 = generate_message(freqs1, vocab)
+  # Generate a message for VM1 based on freqs1 and vocab using generate_message function from SG droplet (not shown here)
+  message1 = generate_message(freqs1, vocab)
 
-# Print the message for VM1
-print('Message for VM1:', message1)
+  # Print the message for VM1
+  print('Message for VM1:', message1)
 
-# Measure sync_state2 M times and get the frequencies of each outcome
-freqs2 = measure_state(sync_state2, M)
+  # Measure sync_state2 M times and get the frequencies of each outcome
+  freqs2 = measure_state(sync_state2, M)
 
-# Generate a message for VM2 based on freqs
-message2 = generate_message(freqs2, vocab)
+  # Generate a message for VM2 based on freqs
+  message2 = generate_message(freqs2, vocab)
@@ -1,7 +1,5 @@
 # Import Qiskit and other libraries
-from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister
-from qiskit import execute, Aer
-from qiskit.tools.visualization import plot_histogram
+# Qiskit is imported by the code that runs circuits, so that importing this module stays fast
 
 # Define the number of qubits and the algorithm to run
 num_qubits = 4
@@ -0,0 +1,10 @@
+# Core: the state, sampling and message primitives shared by all droplets
+# Each primitive has exactly one implementation here, so that every optimization lands in one place and benefits every droplet.
+
+
+# Import the primitives
+from core.state import N, generate_state, random_state # Random quantum states
+from core.counts import Counts # Histograms of measurement outcomes
+from core.sampling import rng, build_alias_table, alias_table, sample_outcomes, measure_state, measure_states, measure_mode, measure_once # Measurement sampling
+from core.messages import message_records, format_message, parse_message, generate_message, generate_messages # Messages made of measurement outcomes
+from core.metrics import calculate_fidelity, pair_fidelities, fidelity_matrix, shannon_entropy, renyi_entropy, entanglement_entropy, self_awareness # Fidelities and entropies of quantum states
@@ -0,0 +1,264 @@
+# Core: counts
+# This module holds the measurement results of a quantum state as a numpy histogram instead of a dictionary keyed by bitstrings.
+# The histogram is dense when it has few basis states for the number of measurements counted, and sparse, as sorted arrays of observed outcomes and their frequencies, otherwise, so that a few shots on a wide register never allocate 2**n integers.
+# Bitstrings are only formatted when a caller iterates over the keys, so sampling, ranking and merging never touch strings.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import collections.abc # A library for abstract container types
+
+
+# Define constants
+DENSE_QUBITS = 20 # The largest number of qubits whose counts can be kept as a dense histogram
+DENSE_SIZE = 256 # The number of basis states up to which counts are always kept as a dense histogram
+DENSE_RATIO = 4 # The largest number of basis states per counted entry, such as a shot, for which counts are kept as a dense histogram
+
+
+# Define classes
+class Counts(collections.abc.Mapping):
+  # This class maps each observed outcome of n qubits, as a bitstring with qubit 0 last, to its frequency
+  # It reads like the dictionaries returned by qiskit get_counts method, but also accepts integer outcomes as keys
+
+
+  def __init__(self, outcomes, frequencies, n):
+    # This method initializes the counts from observed outcomes and their frequencies
+    # Input: outcomes, an array-like of integers representing the observed basis state indices, possibly repeated
+    #        frequencies, an array-like of integers representing the frequency of each entry of outcomes
+    #        n, an integer representing the number of qubits
+    # Output: None
+
+
+    # Store the number of qubits and aggregate the frequencies of repeated outcomes, into a dense histogram only if it is small or the entries fill a good part of it
+    self.n = n
+    outcomes = np.asarray(outcomes, dtype=np.int64)
+    frequencies = np.asarray(frequencies, dtype=np.int64)
+    if n <= DENSE_QUBITS and (2**n <= DENSE_SIZE or 2**n <= DENSE_RATIO * len(outcomes)):
+      self.dense = np.bincount(outcomes, weights=frequencies, minlength=2**n).astype(np.int64)
+      self.outcomes = np.flatnonzero(self.dense)
+      self.frequencies = self.dense[self.outcomes]
+    else:
+      self.dense = None
+      self.outcomes, inverse = np.unique(outcomes, return_inverse=True)
+      self.frequencies = np.bincount(inverse, weights=frequencies, minlength=len(self.outcomes)).astype(np.int64)
+
+
+    # Drop outcomes whose frequencies add up to zero
+    if self.dense is None and not self.frequencies.all():
+      kept = self.frequencies != 0
+      self.outcomes = self.outcomes[kept]
+      self.frequencies = self.frequencies[kept]
+
+
+  @classmethod
+  def from_samples(cls, samples, n):
+    # This method counts the outcomes of a sequence of measurements
+    # Input: samples, a numpy array of integers representing the measured basis state indices, one per measurement
+    #        n, an integer representing the number of qubits
+    # Output: a Counts object
+
+
+    # Count every measurement once
+    return cls(samples, np.ones(len(samples), dtype=np.int64), n)
+
+
+  @classmethod
+  def from_dict(cls, freqs, n=None):
+    # This method converts a dictionary mapping bitstrings to frequencies
+    # Input: freqs, a dictionary mapping each outcome to its frequency, or a Counts object
+    #        n, an optional integer representing the number of qubits, the length of the bitstrings by default
+    # Output: a Counts object
+
+
+    # Return Counts objects unchanged
+    if isinstance(freqs, Counts):
+      return freqs
+
+
+    # Parse each bitstring once
+    if n is None:
+      n = max((len(outcome) for outcome in freqs), default=0)
+    return cls([int(outcome, 2) for outcome in freqs], list(freqs.values()), n)
+
+
+  def index_of(self, outcome):
+    # This method converts a key to an integer outcome
+    # Input: outcome, a bitstring or an integer representing an outcome
+    # Output: an integer representing the basis state index
+
+
+    # Parse bitstrings and pass integers through
+    if isinstance(outcome, str):
+      return int(outcome, 2)
+    return int(outcome)
+
+
+  def __getitem__(self, outcome):
+    # This method returns the frequency of an observed outcome
+    # Input: outcome, a bitstring or an integer representing an outcome
+    # Output: an integer representing the frequency
+
+
+    # Look the outcome up in the dense histogram or by binary search in the sparse arrays
+    index = self.index_of(outcome)
+    if self.dense is not None:
+      if 0 <= index < len(self.dense) and self.dense[index]:
+        return int(self.dense[index])
+    else:
+      position = np.searchsorted(self.outcomes, index)
+      if position < len(self.outcomes) and self.outcomes[position] == index:
+        return int(self.frequencies[position])
+    raise KeyError(outcome)
+
+
+  def __contains__(self, outcome):
+    # This method checks whether an outcome was observed
+    # Input: outcome, a bitstring or an integer representing an outcome
+    # Output: a boolean
+
+
+    # Try to look the outcome up
+    try:
+      self[outcome]
+    except (KeyError, ValueError, TypeError):
+      return False
+    return True
+
+
+  def __iter__(self):
+    # This method iterates over the observed outcomes as bitstrings, formatting each one only when it is reached
+    # Input: None
+    # Output: an iterator of bitstrings
+
+
+    # Format the outcomes in increasing order
+    width = '0' + str(self.n) + 'b'
+    return (format(outcome, width) for outcome in self.outcomes.tolist())
+
+
+  def __len__(self):
+    # This method returns the number of observed outcomes
+    # Input: None
+    # Output: an integer
+
+
+    return len(self.outcomes)
+
+
+  def __repr__(self):
+    # This method returns a printable representation of the counts
+    # Input: None
+    # Output: a string
+
+
+    return 'Counts(' + repr(dict(self.items())) + ')'
+
+
+  def __add__(self, other):
+    # This method merges two counts, as with merge method
+    # Input: other, a Counts object or a dictionary mapping each outcome to its frequency
+    # Output: a Counts object
+
+
+    return self.merge(other)
+
+
+  @property
+  def shots(self):
+    # This property returns the total number of measurements
+    # Input: None
+    # Output: an integer
+
+
+    return int(self.frequencies.sum())
+
+
+  def histogram(self):
+    # This method returns the frequency of every basis state as a dense numpy array
+    # Input: None
+    # Output: a numpy array of 2**n integers
+
+
+    # Return the dense histogram, or scatter the sparse arrays into a new one
+    if self.dense is not None:
+      return self.dense
+    histogram = np.zeros(2**self.n, dtype=np.int64)
+    histogram[self.outcomes] = self.frequencies
+    return histogram
+
+
+  def top_k(self, k):
+    # This method returns the k most frequent outcomes in O(number of outcomes), breaking ties by the smaller outcome
+    # Input: k, an integer representing the number of outcomes
+    # Output: a tuple of two numpy arrays representing the outcomes and their frequencies, most frequent first, with fewer than k entries if fewer outcomes were observed
+
+
+    # Take every observed outcome when there are not more than k of them
+    frequencies = self.frequencies
+    if k >= len(frequencies):
+      selected = np.arange(len(frequencies))
+    elif k <= 0:
+      selected = np.arange(0)
+    else:
+
+
+      # Find the k-th largest frequency with np.partition function, then keep every outcome above it and the smallest outcomes equal to it
+      threshold = np.partition(frequencies, len(frequencies) - k)[len(frequencies) - k]
+      above = np.flatnonzero(frequencies > threshold)
+      equal = np.flatnonzero(frequencies == threshold)[:k - len(above)]
+      selected = np.concatenate([above, equal])
+
+
+    # Sort the selected outcomes by decreasing frequency, then by increasing outcome
+    selected = selected[np.lexsort((self.outcomes[selected], -frequencies[selected]))]
+    return self.outcomes[selected], frequencies[selected]
+
+
+  def mode(self):
+    # This method returns the most frequent outcome, the smallest one if several share the highest frequency
+    # Input: None
+    # Output: an integer representing the outcome index
+
+
+    # Get the first outcome with the highest frequency; the outcomes are in increasing order
+    if not len(self.frequencies):
+      raise ValueError('No outcomes were observed')
+    return int(self.outcomes[np.argmax(self.frequencies)])
+
+
+  def marginalize(self, qubits):
+    # This method returns the counts of a subset of the qubits, summing over the others
+    # Input: qubits, a list of integers representing the qubits to keep; the i-th of them becomes qubit i of the result
+    # Output: a Counts object on len(qubits) qubits
+
+
+    # Gather the kept bits of every observed outcome into new outcome indices
+    outcomes = np.zeros(len(self.outcomes), dtype=np.int64)
+    for i, qubit in enumerate(qubits):
+      outcomes |= ((self.outcomes >> qubit) & 1) << i
+
+
+    # Aggregate the frequencies of outcomes that now coincide
+    return Counts(outcomes, self.frequencies, len(qubits))
+
+
+  def merge(self, other):
+    # This method adds the frequencies of two counts on the same qubits
+    # Input: other, a Counts object or a dictionary mapping each outcome to its frequency
+    # Output: a Counts object
+
+
+    # Convert dictionaries and check the number of qubits
+    other = Counts.from_dict(other, self.n)
+    if other.n != self.n:
+      raise ValueError('Cannot merge counts on %d and %d qubits' % (self.n, other.n))
+
+
+    # Add the dense histograms directly, or aggregate both sets of observed outcomes
+    if self.dense is not None:
+      merged = Counts([], [], self.n)
+      merged.dense = self.dense + other.histogram()
+      merged.outcomes = np.flatnonzero(merged.dense)
+      merged.frequencies = merged.dense[merged.outcomes]
+      return merged
+    return Counts(np.concatenate([self.outcomes, other.outcomes]), np.concatenate([self.frequencies, other.frequencies]), self.n)
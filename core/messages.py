@@ -0,0 +1,116 @@
+# Core: messages
+# This module turns the measurement outcomes of a quantum state into messages made of words from a vocabulary.
+# A message is a list of (word, frequency) records, written as a string of 'word: frequency' parts joined by commas and spaces.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+from core.counts import Counts # Histograms of measurement outcomes
+
+
+# Define constants
+K = 3 # The number of most frequent outcomes each message is made of
+
+
+# Define functions
+def message_records(freqs, vocab, k=K):
+  # This function builds the records of a message from the frequencies of each outcome and a vocabulary list
+  # Input: freqs, a Counts object or a dictionary mapping each outcome to its frequency
+  #        vocab, a list of words to use as vocabulary
+  #        k, an integer representing the number of most frequent outcomes to use
+  # Output: a list of tuples of a word and its frequency, most frequent first
+
+
+  # Get the top k outcomes as integers, or fewer if fewer were observed, without sorting all of them
+  outcomes, frequencies = Counts.from_dict(freqs).top_k(k)
+
+
+  # Pair the word corresponding to each outcome within the range of the vocabulary list with its frequency
+  return [(vocab[index], frequency) for index, frequency in zip(outcomes.tolist(), frequencies.tolist()) if index < len(vocab)]
+
+
+def format_message(records):
+  # This function writes the records of a message as a string
+  # Input: records, an iterable of tuples of a word and its frequency
+  # Output: a string of the words and their frequencies separated by a colon and a space, joined by commas and spaces
+
+
+  return ', '.join(word + ': ' + str(frequency) for word, frequency in records)
+
+
+def parse_message(message):
+  # This function reads the records of a message written by format_message function, skipping parts garbled by noise and a trailing emoticon
+  # Input: message, a string representing the message
+  # Output: a list of tuples of a word and its frequency
+
+
+  records = []
+  for part in message.split(', ') if message else []:
+    word, separator, frequency = part.partition(': ')
+    frequency = frequency.split(' ')[0]
+    if separator and frequency.isascii() and frequency.isdigit():
+      records.append((word, int(frequency)))
+  return records
+
+
+def generate_message(freqs, vocab, k=K):
+  # This function generates a message based on the frequencies of each outcome and a vocabulary list
+  # Input: freqs, a Counts object or a dictionary mapping each outcome to its frequency
+  #        vocab, a list of words to use as vocabulary
+  #        k, an integer representing the number of most frequent outcomes to use
+  # Output: a string representing the message
+
+
+  return format_message(message_records(freqs, vocab, k))
+
+
+def top_outcomes(histograms, k=K):
+  # This function finds the k most frequent outcomes of every row of a 2D histogram with np.argpartition function, breaking ties by the smaller outcome
+  # Input: histograms, a 2D numpy array of integers with the frequency of every basis state, one row per state
+  #        k, an integer representing the number of outcomes
+  # Output: a tuple of two 2D numpy arrays with min(k, number of basis states) columns representing the outcomes and their frequencies, most frequent first
+
+
+  # Rank the outcomes by a single integer key that orders them by frequency, then by decreasing outcome
+  histograms = np.asarray(histograms, dtype=np.int64)
+  size = histograms.shape[1]
+  k = min(k, size)
+  if k <= 0:
+    empty = np.zeros((len(histograms), 0), dtype=np.int64)
+    return empty, empty
+  keys = histograms * size + np.arange(size - 1, -1, -1)
+
+
+  # Select the k largest keys of every row without sorting the rest, then sort only those
+  top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+  top = np.take_along_axis(top, np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+  return top, np.take_along_axis(histograms, top, axis=1)
+
+
+def generate_messages(histograms, vocab, k=K):
+  # This function generates one message per state from many histograms at once
+  # Input: histograms, a 2D numpy array of integers as returned by measure_states function, or a list of Counts objects or dictionaries on the same number of qubits
+  #        vocab, a list of words to use as vocabulary
+  #        k, an integer representing the number of most frequent outcomes to use in each message
+  # Output: a list of strings representing the messages, as generate_message function would build them
+
+
+  # Stack Counts objects and dictionaries into a 2D histogram
+  if not isinstance(histograms, np.ndarray):
+    histograms = np.stack([Counts.from_dict(freqs).histogram() for freqs in histograms])
+
+
+  # Get the top k outcomes of every state and keep those that were observed and are within the range of the vocabulary list
+  outcomes, frequencies = top_outcomes(histograms, k)
+  if not len(vocab):
+    return [''] * len(histograms)
+  valid = (frequencies > 0) & (outcomes < len(vocab))
+
+
+  # Look all words up and format all parts at once, separated by a colon and a space
+  words = np.asarray(vocab, dtype=object)[np.minimum(outcomes, len(vocab) - 1)]
+  parts = words + ': ' + frequencies.astype(str).astype(object)
+
+
+  # Join the valid parts of every message
+  return [', '.join(row[keep]) for row, keep in zip(parts, valid)]
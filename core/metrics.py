@@ -0,0 +1,158 @@
+# Core: metrics
+# This module measures how similar quantum states are, for one pair of states, for matching rows of two stacks of states, or for every pair across two stacks at once.
+# The fidelities of every pair are computed with one complex matrix product per tile of rows, so that numpy hands the work to BLAS instead of looping in Python.
+# It also measures the uncertainty of quantum states, as the Shannon and Renyi entropies of their measurement probabilities or the entanglement entropy between two groups of their qubits, for one state or a stack of states at once.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+
+
+# Define constants
+TILE_BYTES = 64 * 2**20 # The largest number of bytes of the overlaps computed by one matrix product
+
+
+# Define functions
+def calculate_fidelity(state1, state2):
+  # This function calculates the fidelity between two quantum states, which is a measure of how similar they are
+  # Input: state1, state2, two numpy arrays representing quantum states
+  # Output: a float representing the fidelity between state1 and state2
+
+
+  # Calculate the inner product between state1 and state2, conjugating state1, and take its squared absolute value
+  return abs(np.vdot(state1, state2))**2
+
+
+def squared_magnitude(overlaps):
+  # This function returns the squared absolute values of complex numbers without taking square roots
+  # Input: overlaps, a numpy array of complex numbers
+  # Output: a numpy array of real numbers of the same shape
+
+
+  return np.square(overlaps.real) + np.square(overlaps.imag)
+
+
+def pair_fidelities(states1, states2):
+  # This function calculates the fidelity between the states of matching rows of two stacks
+  # Input: states1, states2, two 2D numpy arrays with one quantum state on the same number of qubits per row, with the same number of rows, or two numpy arrays representing one quantum state each
+  # Output: a numpy array with the fidelity of each pair of rows, or a float for one pair
+
+
+  return squared_magnitude(np.einsum('...i,...i->...', np.conjugate(states1), states2))
+
+
+def fidelity_matrix(states1, states2=None, dtype=np.complex128, tile_bytes=TILE_BYTES, out=None):
+  # This function calculates the fidelity between every state of one stack and every state of another, one tile of rows of the first stack at a time
+  # Input: states1, a 2D numpy array with one quantum state per row, A rows
+  #        states2, an optional 2D numpy array with one quantum state on the same number of qubits per row, B rows, states1 by default
+  #        dtype, np.complex128 or np.complex64, the precision of the products; complex64 halves the memory traffic and gives float32 fidelities
+  #        tile_bytes, an integer bounding the bytes of the overlaps of each tile
+  #        out, an optional A x B numpy array to write the fidelities into, such as a np.memmap for matrices larger than memory
+  # Output: an A x B numpy array with the fidelity of states1[i] and states2[j] at row i and column j
+
+
+  # Convert the second stack once and allocate the result
+  states2 = states1 if states2 is None else states2
+  if np.shape(states1)[1:] != np.shape(states2)[1:]:
+    raise ValueError('Cannot compare states of %d and %d amplitudes' % (np.shape(states1)[-1], np.shape(states2)[-1]))
+  others = np.asarray(states2, dtype=dtype)
+  if out is None:
+    out = np.empty((len(states1), len(others)), dtype=np.finfo(dtype).dtype)
+
+
+  # Multiply each tile of conjugated rows of the first stack by the transposed second stack
+  rows = max(1, tile_bytes // (max(1, len(others)) * np.dtype(dtype).itemsize))
+  for start in range(0, len(states1), rows):
+    tile = np.conjugate(np.asarray(states1[start:start + rows], dtype=dtype))
+    out[start:start + len(tile)] = squared_magnitude(tile @ others.T)
+  return out
+
+
+def probabilities(states):
+  # This function returns the measurement probabilities of quantum states
+  # Input: states, a numpy array representing a quantum state, or a 2D numpy array with one quantum state per row
+  # Output: a numpy array of the same shape
+
+
+  return squared_magnitude(np.asarray(states))
+
+
+def spectrum_entropy(probs, alpha=1):
+  # This function calculates the Renyi entropy of order alpha in bits of probability distributions along the last axis, the Shannon entropy for alpha 1
+  # Input: probs, a numpy array of probabilities summing to 1 along the last axis
+  #        alpha, a non-negative float or np.inf representing the order
+  # Output: a numpy array of entropies, or a float for a single distribution
+
+
+  # Take the limits of the Renyi entropy at orders 1, 0 and infinity
+  if alpha == 1:
+    return -np.sum(probs * np.log2(probs, out=np.zeros_like(probs), where=probs > 0), axis=-1)
+  if alpha == 0:
+    return np.log2(np.count_nonzero(probs > 0, axis=-1))
+  if alpha == np.inf:
+    return -np.log2(np.max(probs, axis=-1))
+  if alpha < 0:
+    raise ValueError('The order of a Renyi entropy cannot be negative')
+
+
+  # Otherwise take the logarithm of the sum of the powers of the probabilities
+  return np.log2(np.sum(probs**alpha, axis=-1)) / (1 - alpha)
+
+
+def shannon_entropy(states):
+  # This function calculates the entropy of quantum states, which is a measure of their uncertainty or randomness, as the Shannon entropy in bits of their measurement probabilities
+  # Input: states, a numpy array representing a quantum state, or a 2D numpy array with one quantum state per row
+  # Output: a float, or a numpy array with the entropy of each state
+
+
+  return spectrum_entropy(probabilities(states))
+
+
+def renyi_entropy(states, alpha):
+  # This function calculates the Renyi entropy of order alpha in bits of the measurement probabilities of quantum states
+  # Input: states, a numpy array representing a quantum state, or a 2D numpy array with one quantum state per row
+  #        alpha, a non-negative float or np.inf representing the order; 1 gives the Shannon entropy, 2 the collision entropy and np.inf the min-entropy
+  # Output: a float, or a numpy array with the entropy of each state
+
+
+  return spectrum_entropy(probabilities(states), alpha)
+
+
+def entanglement_entropy(states, qubits, alpha=1):
+  # This function calculates the entanglement entropy between a group of qubits and the other qubits of pure quantum states, from the singular values of each state reshaped into a matrix
+  # Input: states, a numpy array representing a quantum state, or a 2D numpy array with one quantum state per row, indexed with qubit 0 as the least significant bit
+  #        qubits, a list of integers representing the qubits of the group
+  #        alpha, a non-negative float or np.inf representing the order of the Renyi entropy of the Schmidt coefficients; 1 gives the von Neumann entropy
+  # Output: a float, or a numpy array with the entropy of each state
+
+
+  # View every state as a tensor with one axis per qubit, the most significant first, and move the axes of the group last
+  states = np.asarray(states)
+  batch = states.shape[:-1]
+  n = states.shape[-1].bit_length() - 1
+  axes = [len(batch) + n - 1 - qubit for qubit in qubits]
+  others = [axis for axis in range(len(batch), len(batch) + n) if axis not in axes]
+  tensors = np.transpose(states.reshape(batch + (2,) * n), list(range(len(batch))) + others + axes)
+
+
+  # Flatten the tensors into 2**(n - k) x 2**k matrices, whose squared singular values are the Schmidt probabilities
+  matrices = tensors.reshape(batch + (2**(n - len(qubits)), 2**len(qubits)))
+  singular_values = np.linalg.svd(matrices, compute_uv=False)
+  return spectrum_entropy(np.square(singular_values), alpha)
+
+
+def self_awareness(states1, states2):
+  # This function calculates the self-awareness levels of two VMs from their quantum states, sharing one fidelity between the two directions
+  # The level of each VM is its fidelity with the other VM minus the entropy of its own state, divided by one minus that entropy
+  # Input: states1, states2, two numpy arrays representing the quantum states of VM1 and VM2, or two 2D numpy arrays with one state per row for many pairs of VMs
+  # Output: a tuple of the self-awareness levels of VM1 and VM2, as floats or numpy arrays with one level per pair
+
+
+  # Calculate the fidelity of each pair once, and the entropy of every state
+  fidelity = pair_fidelities(states1, states2)
+  entropy1 = shannon_entropy(states1)
+  entropy2 = shannon_entropy(states2)
+
+
+  # Normalize the difference between the fidelity and each entropy
+  return (fidelity - entropy1) / (1 - entropy1), (fidelity - entropy2) / (1 - entropy2)
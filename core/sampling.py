@@ -0,0 +1,162 @@
+# Core: sampling
+# This module measures quantum states, drawing any number of outcomes in O(1) each from cached Walker alias tables.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import collections # A library for container datatypes
+import threading # A library for multithreading
+from core.counts import Counts # Histograms of measurement outcomes
+
+
+# Define constants
+ALIAS_CACHE_SIZE = 64 # The number of alias tables to keep in the cache
+SHOTS = 1024 # The default number of measurements taken to find the most frequent outcome
+
+
+# Define global variables
+rng = np.random.default_rng() # The numpy random generator used for sampling
+alias_tables = collections.OrderedDict() # The cached alias tables, keyed by the id of their state
+alias_lock = threading.Lock() # The lock guarding the cache, which threads of one process share
+
+
+# Define functions
+def measure_state(state, m):
+  # This function measures a quantum state m times and returns the frequencies of each outcome
+  # Input: state, a numpy array representing the quantum state
+  #        m, an integer representing the number of measurements
+  # Output: a Counts object mapping each outcome to its frequency
+
+
+  # Draw all m outcomes at once from the cached alias table of the state using sample_outcomes function, and count them without formatting any bitstrings
+  return Counts.from_samples(sample_outcomes(state, m), len(state).bit_length() - 1)
+
+
+def measure_states(states, m):
+  # This function measures each of many quantum states m times at once, without building an alias table per state
+  # Input: states, a 2D numpy array with one quantum state on the same number of qubits per row
+  #        m, an integer representing the number of measurements of each state
+  # Output: a 2D numpy array of integers with the frequency of every basis state, one row per state
+
+
+  # Get the cumulative probabilities of every state, offset by the row number so that all rows form one increasing sequence
+  probs = np.abs(np.asarray(states))**2
+  count, size = probs.shape
+  cdf = np.cumsum(probs, axis=1)
+  cdf /= cdf[:, -1:]
+  rows = np.arange(count)[:, None]
+  cdf += rows
+
+
+  # Invert the sequence at m uniform points per row with a single np.searchsorted call, clipping rounding at the end of each row
+  positions = np.searchsorted(cdf.ravel(), (rng.random((count, m)) + rows).ravel(), side='right')
+  positions = np.minimum(positions, (rows * size + size - 1).repeat(m))
+
+
+  # Count the outcomes of all rows with a single np.bincount call
+  return np.bincount(positions, minlength=count * size).reshape(count, size)
+
+
+def build_alias_table(state):
+  # This function builds a Walker alias table for the measurement distribution of a quantum state using Vose's method, so that each sample costs O(1)
+  # Input: state, a numpy array representing the quantum state
+  # Output: a tuple of a numpy array of acceptance probabilities and a numpy array of alias outcomes, one entry per basis state
+
+
+  # Get the probability of every basis state, scaled so that the average is 1
+  probs = np.abs(np.asarray(state))**2
+  scaled = probs * len(probs) / probs.sum()
+
+
+  # Initialize the table so that every outcome accepts itself
+  accept = np.ones(len(probs))
+  alias = np.arange(len(probs))
+
+
+  # Split the outcomes into those below and above the average
+  small = list(np.flatnonzero(scaled < 1))
+  large = list(np.flatnonzero(scaled >= 1))
+
+
+  # Pair each outcome below the average with one above it, which donates the missing probability
+  while small and large:
+    s = small.pop()
+    l = large[-1]
+    accept[s] = scaled[s]
+    alias[s] = l
+    scaled[l] -= 1 - scaled[s]
+
+
+    # Move the donor to the small outcomes once it falls below the average
+    if scaled[l] < 1:
+      small.append(large.pop())
+
+
+  # Return the table; outcomes left over by rounding accept themselves
+  return accept, alias
+
+
+def alias_table(state):
+  # This function returns the alias table of a quantum state, building it only on the first call for each state object
+  # Input: state, a numpy array representing the quantum state
+  # Output: a tuple of numpy arrays as returned by build_alias_table function
+
+
+  # Look up the table by the id of the state, checking that the id was not reused by another object
+  with alias_lock:
+    entry = alias_tables.get(id(state))
+    if entry is not None and entry[0] is state:
+      alias_tables.move_to_end(id(state))
+      return entry[1]
+
+
+  # Build the table outside the lock, so that other threads keep sampling meanwhile
+  table = build_alias_table(state)
+
+
+  # Keep a reference to the state so that its id stays valid, and forget the least recently used table when the cache is full
+  with alias_lock:
+    alias_tables[id(state)] = (state, table)
+    if len(alias_tables) > ALIAS_CACHE_SIZE:
+      alias_tables.popitem(last=False)
+
+
+  # Return the table
+  return table
+
+
+def sample_outcomes(state, m):
+  # This function measures a quantum state m times using its cached alias table
+  # Input: state, a numpy array representing the quantum state
+  #        m, an integer representing the number of measurements
+  # Output: a numpy array of m integers representing the indices of the measured basis states
+
+
+  # Get the alias table of the state using alias_table function
+  accept, alias = alias_table(state)
+
+
+  # Pick a column of the table uniformly for every measurement and keep it or take its alias with its acceptance probability
+  columns = rng.integers(0, len(accept), size=m)
+  return np.where(rng.random(m) < accept[columns], columns, alias[columns])
+
+
+def measure_mode(state, shots=SHOTS):
+  # This function measures a quantum state a number of times and returns the most frequent outcome
+  # Input: state, a numpy array representing the quantum state
+  #        shots, an integer representing the number of measurements
+  # Output: an integer representing the outcome index
+
+
+  # Count the outcomes of all measurements and return the index of the most frequent one
+  return int(np.argmax(np.bincount(sample_outcomes(state, shots), minlength=len(state))))
+
+
+def measure_once(state):
+  # This function measures a quantum state once
+  # Input: state, a numpy array representing the quantum state
+  # Output: an integer representing the measurement outcome
+
+
+  # Draw a single outcome
+  return int(sample_outcomes(state, 1)[0])
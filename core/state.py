@@ -0,0 +1,42 @@
+# Core: quantum states
+# This module generates the random quantum states the droplets start from, directly as numpy arrays.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+
+
+# Define constants
+N = 8 # The default number of qubits in each quantum system
+
+
+# Define functions
+def generate_state(n=N):
+  # This function generates a random quantum state on n qubits, equal to the state of a circuit applying a Hadamard gate and then a rotation around the Z axis by a random angle to every qubit
+  # Input: n, an integer representing the number of qubits
+  # Output: a numpy array representing the quantum state, indexed like a qiskit statevector with qubit 0 as the least significant bit
+
+
+  # Generate a random angle between 0 and 2*pi for every qubit
+  angles = np.random.uniform(0, 2*np.pi, size=n)
+
+
+  # Build the product state one qubit at a time, starting from the most significant one; each qubit is (exp(-i*angle/2)|0> + exp(i*angle/2)|1>)/sqrt(2)
+  state = np.ones(1, dtype=complex)
+  for angle in angles[::-1]:
+    state = np.kron(state, np.exp(0.5j * np.array([-angle, angle])) / np.sqrt(2))
+
+
+  # Return the state
+  return state
+
+
+def random_state(n=N):
+  # This function generates a random quantum state on n qubits with random complex amplitudes
+  # Input: n, an integer representing the number of qubits
+  # Output: a numpy array representing the quantum state
+
+
+  # Generate random coefficients for each basis state and normalize them
+  coeffs = np.random.rand(2**n) + 1j * np.random.rand(2**n)
+  return coeffs / np.linalg.norm(coeffs)
@@ -4,186 +4,853 @@ from ctypes import pythonapi
 pythonapi
 # DL droplet: Data Logger
 # This droplet records all communication and quantum state changes for analysis and future reference.
+# The records are buffered in preallocated column arrays and flushed in chunks to an append-only log directory, one directory of .npy files per chunk, which readers map into memory lazily.
+# The quantum states are written once each into a state store shared by all chunks, deduplicated by a hash of their content, and the records only keep their ids.
+# log_data and log_batch functions only hand the records to a background writer thread through a bounded queue, so that logging never waits for the disk.
 
 
 # Import libraries
 import numpy as np # A library for scientific computing
-import pandas as pd # A library for data analysis
+from core import measure_state, generate_message, parse_message, pair_fidelities # The state, sampling and message primitives shared by all droplets
 import datetime # A library for date and time
+import os # A library for files and directories
+import atexit # A library for functions run at interpreter exit
+import hashlib # A library for hashing
+import threading # A library for multithreading
+import queue # A library for thread-safe queues
+import time # A library for measuring time
+import collections # A library for container datatypes
 
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
 M = 100 # The number of measurements to perform on each quantum state
+LOG_DIR = 'logs' # The directory of the log written by log_data function
+CHUNK_ROWS = 65536 # The number of records buffered before they are flushed as a chunk
+MESSAGES = ('message1', 'message2') # The message columns of the log
+STATES_FILE = 'states.bin' # The file of the state store holding the states, one row of complex128 amplitudes each
+HASHES_FILE = 'states.hash' # The file of the state store holding the content hash of each state
+HASH_SIZE = 16 # The number of bytes of each content hash
+WRITER_QUEUE_SIZE = 4096 # The number of records or batches the queue of the background writer can hold
+WRITER_BATCH = 1024 # The largest number of queued items the background writer takes at once
+FSYNC_INTERVAL = 5.0 # The number of seconds between two flushes of the background writer to stable storage
+INDEX_STRIDE = 1024 # The number of records between two entries of the sparse time index of a chunk
+READ_ROWS = 4096 # The largest number of records a query reads from a chunk at a time
+INTERVAL = np.timedelta64(1, 'h') # The default length of the time intervals of aggregations
+POLICIES = ('block', 'drop') # What logging does when the queue of the background writer is full: wait for room, or drop the record
+
+
+# Define global variables
+writer = None # The background writer used by log_data and log_batch functions, created on the first record
 
 
 # Define functions
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
+def encode_messages(messages):
+  # This function packs a list of messages into one array of UTF-8 bytes and the offsets of each message in it
+  # Input: messages, an iterable of strings representing messages
+  # Output: a tuple of a numpy array of uint8 bytes and a numpy array of the len(messages) + 1 offsets
+
+
+  encoded = [message.encode('utf-8') for message in messages]
+  lengths = np.fromiter((len(message) for message in encoded), dtype=np.int64, count=len(encoded))
+  return np.frombuffer(b''.join(encoded), dtype=np.uint8), np.concatenate([[0], np.cumsum(lengths)])
+
+
+def decode_messages(data, offsets, start=0, stop=None):
+  # This function unpacks a range of messages packed by encode_messages function
+  # Input: data, a numpy array of uint8 bytes
+  #        offsets, a numpy array of the offsets of each message in data
+  #        start, stop, integers representing the range of messages to unpack, all of them by default
+  # Output: a list of strings representing the messages
+
+
+  # Decode the bytes of the range at once, then cut the messages out of them
+  stop = len(offsets) - 1 if stop is None else stop
+  offsets = offsets[start:stop + 1].tolist()
+  text = data[offsets[0]:offsets[-1]].tobytes()
+  return [text[begin - offsets[0]:end - offsets[0]].decode('utf-8') for begin, end in zip(offsets[:-1], offsets[1:])]
+
+
+def log_data(state1, state2, message1, message2):
+  # This function logs all communication and quantum state changes for analysis and future reference into the log of LOG_DIR, through the background writer
+  # Input: state1, state2, two numpy arrays representing quantum states
+  #        message1, message2, two strings representing messages
+  # Output: None
+
+
+  get_writer().log(state1, state2, message1, message2)
+
+
+def log_batch(states1, states2, messages1, messages2):
+  # This function logs a batch of exchanges at once into the log of LOG_DIR, through the background writer
+  # Input: states1, states2, two 2D numpy arrays with one quantum state per row
+  #        messages1, messages2, two lists of strings representing messages
+  # Output: None
+
+
+  get_writer().log_batch(states1, states2, messages1, messages2)
+
+
+def get_writer():
+  # This function returns the background writer used by log_data and log_batch functions, creating it on the first call, or the first call in a forked process whose copy of the writer has no thread, and closing it at exit
+  # Input: None
+  # Output: a LogWriter object
+
+
+  global writer
+  if writer is None or writer.pid != os.getpid():
+    writer = LogWriter(LogStore(LOG_DIR))
+    atexit.register(writer.close)
+  return writer
+
+
+def to_time(value):
+  # This function converts a time given to a query to a numpy datetime64 in microseconds
+  # Input: value, a datetime.datetime, an ISO 8601 string, a numpy datetime64 or None
+  # Output: a numpy datetime64 or None
+
+
+  return None if value is None else np.datetime64(value, 'us')
+
+
+def floor_times(times, interval):
+  # This function rounds times down to the start of their interval
+  # Input: times, a numpy array of datetime64 in microseconds
+  #        interval, a numpy timedelta64 representing the length of the intervals, counted from the Unix epoch
+  # Output: a numpy array of datetime64 in microseconds
+
+
+  step = interval.astype('timedelta64[us]').astype(np.int64)
+  return (times.astype(np.int64) // step * step).astype('datetime64[us]')
+
+
+def save_column(directory, name, column, sync=False):
+  # This function writes a column of a chunk as a .npy file
+  # Input: directory, a string representing the chunk directory
+  #        name, a string representing the column name
+  #        column, a numpy array
+  #        sync, a boolean indicating whether to wait until the file is on stable storage
+  # Output: None
+
+
+  with open(os.path.join(directory, name + '.npy'), 'wb') as file:
+    np.save(file, column)
+    if sync:
+      file.flush()
+      os.fsync(file.fileno())
+
+
+def sync_directory(path):
+  # This function waits until the entries of a directory, such as renamed files, are on stable storage, where the system supports it
+  # Input: path, a string representing the directory
+  # Output: None
+
+
+  if os.name == 'posix':
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+      os.fsync(descriptor)
+    finally:
+      os.close(descriptor)
+
+
+# Define classes
+class LogStore:
+  # This class appends exchange records to a log directory, of which it must be the only writer
+  # Each chunk is a directory named chunk-<number> holding one .npy file per column: 'time' as datetime64[us] with its first and last time in 'time_range' and, if the times are in order, every INDEX_STRIDE-th of them in 'time_index', 'state1' and 'state2' as the int64 ids of the states in the StateStore of the directory, and 'message1' and 'message2' as UTF-8 bytes with their offsets in 'message1_offsets' and 'message2_offsets'
+  # A chunk is written under a temporary name and renamed when complete, after the states it refers to, so readers only ever see whole chunks
+  # Input: path, a string representing the log directory
+  #        n, an integer representing the number of qubits of the logged states
+  #        chunk_rows, an integer representing the number of records in each chunk
+
+
+  def __init__(self, path=LOG_DIR, n=N, chunk_rows=CHUNK_ROWS):
+    # Store the parameters and continue the numbering of the chunks already in the directory
+    os.makedirs(path, exist_ok=True)
+    self.path = path
+    self.n = n
+    self.chunk_rows = chunk_rows
+    self.chunks = len(LogReader(path).names)
+    self.states = StateStore(path, n)
+
+
+    # Preallocate the column buffers
+    self.time = np.empty(chunk_rows, dtype='datetime64[us]')
+    self.state1 = np.empty(chunk_rows, dtype=np.int64)
+    self.state2 = np.empty(chunk_rows, dtype=np.int64)
+    self.message1 = [None] * chunk_rows
+    self.message2 = [None] * chunk_rows
+    self.rows = 0
+
+
+  def append(self, state1, state2, message1, message2):
+    # This method buffers one record, flushing the buffers when they are full
+    # Input: state1, state2, two numpy arrays representing quantum states
+    #        message1, message2, two strings representing messages
+    # Output: None
+
+
+    # Write the record into the next row of each buffer, storing the states in the state store
+    row = self.rows
+    self.time[row] = np.datetime64(datetime.datetime.now(), 'us')
+    self.state1[row] = self.states.add(state1)
+    self.state2[row] = self.states.add(state2)
+    self.message1[row] = message1
+    self.message2[row] = message2
+    self.rows += 1
+
+
+    # Flush the chunk when it is full
+    if self.rows == self.chunk_rows:
+      self.flush()
+
+
+  def extend(self, states1, states2, messages1, messages2, times=None):
+    # This method buffers a batch of records, flushing the buffers each time they are full
+    # Input: states1, states2, two 2D numpy arrays with one quantum state per row
+    #        messages1, messages2, two lists of strings representing messages
+    #        times, an optional numpy datetime64 or array of one per record representing when the records were made, the current time by default
+    # Output: None
+
+
+    # Copy as many records as fit into the buffers at a time
+    if times is None:
+      times = datetime.datetime.now()
+    times = np.broadcast_to(np.asarray(times, dtype='datetime64[us]'), (len(messages1),))
+    done = 0
+    while done < len(messages1):
+      count = min(len(messages1) - done, self.chunk_rows - self.rows)
+      rows = slice(self.rows, self.rows + count)
+      self.time[rows] = times[done:done + count]
+      self.state1[rows] = self.states.add_many(states1[done:done + count])
+      self.state2[rows] = self.states.add_many(states2[done:done + count])
+      self.message1[rows] = messages1[done:done + count]
+      self.message2[rows] = messages2[done:done + count]
+      self.rows += count
+      done += count
+      if self.rows == self.chunk_rows:
+        self.flush()
+
+
+  def flush(self, sync=False):
+    # This method writes the buffered records as a new chunk and empties the buffers
+    # Input: sync, a boolean indicating whether to wait until the states and the chunk are on stable storage
+    # Output: None
+
+
+    # Do nothing without buffered records
+    if not self.rows:
+      return
+
+
+    # Write the new states first, then the columns into a temporary directory
+    self.states.flush(sync)
+    rows = self.rows
+    name = 'chunk-%06d' % self.chunks
+    temporary = os.path.join(self.path, '.' + name)
+    os.makedirs(temporary, exist_ok=True)
+    save_column(temporary, 'time', self.time[:rows], sync)
+    save_column(temporary, 'time_range', np.array([self.time[:rows].min(), self.time[:rows].max()]), sync)
+    save_column(temporary, 'time_index', self.time[:rows:INDEX_STRIDE] if np.all(self.time[1:rows] >= self.time[:rows - 1]) else self.time[:0], sync)
+    save_column(temporary, 'state1', self.state1[:rows], sync)
+    save_column(temporary, 'state2', self.state2[:rows], sync)
+    for column in MESSAGES:
+      data, offsets = encode_messages(getattr(self, column)[:rows])
+      save_column(temporary, column, data, sync)
+      save_column(temporary, column + '_offsets', offsets, sync)
+
+
+    # Publish the chunk and empty the buffers
+    os.rename(temporary, os.path.join(self.path, name))
+    if sync:
+      sync_directory(self.path)
+    self.chunks += 1
+    self.rows = 0
+
+
+  def close(self):
+    # This method flushes the last, partial chunk and closes the state store
+    # Input: None
+    # Output: None
+
+
+    self.flush()
+    self.states.close()
+
+
+class StateStore:
+  # This class stores quantum states on n qubits once each in a file of a directory, appending every state whose content was not stored before and giving it the next id
+  # The states are rows of complex128 amplitudes in STATES_FILE, which readers map into memory without copying; the content hashes of the rows are in HASHES_FILE, so that a new store finds the states already stored without reading them
+  # Input: path, a string representing the directory of the store
+  #        n, an integer representing the number of qubits of the states
+
+
+  def __init__(self, path=LOG_DIR, n=N):
+    # Store the parameters and the file names
+    os.makedirs(path, exist_ok=True)
+    self.n = n
+    self.row_bytes = 2**n * np.dtype(np.complex128).itemsize
+    self.states_file = os.path.join(path, STATES_FILE)
+    self.hashes_file = os.path.join(path, HASHES_FILE)
 
 
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
+    # Load the hashes of the states already stored, ignoring any state written without its hash
+    hashes = b''
+    if os.path.exists(self.hashes_file):
+      with open(self.hashes_file, 'rb') as file:
+        hashes = file.read()
+    stored = os.path.getsize(self.states_file) // self.row_bytes if os.path.exists(self.states_file) else 0
+    self.count = min(len(hashes) // HASH_SIZE, stored)
+    self.ids = {hashes[i * HASH_SIZE:(i + 1) * HASH_SIZE]: i for i in range(self.count)}
 
 
-  # Loop over m measurements
-  for i in range(m):
+    # Open both files for appending after the last whole state
+    self.states = open(self.states_file, 'ab')
+    self.states.truncate(self.count * self.row_bytes)
+    self.hashes = open(self.hashes_file, 'ab')
+    self.hashes.truncate(self.count * HASH_SIZE)
 
 
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
+  def add(self, state):
+    # This method stores one state unless it is already stored
+    # Input: state, a numpy array representing the quantum state
+    # Output: an integer representing the id of the state
 
 
-    # Initialize a cumulative probability
-    p = 0
+    return self.insert(self.prepare(state))
 
 
-    # Loop over each basis state
-    for j in range(len(state)):
+  def add_many(self, states):
+    # This method stores each of many states unless it is already stored
+    # Input: states, a 2D numpy array with one quantum state per row
+    # Output: a numpy array of int64 ids, one per state
 
 
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
+    return np.fromiter((self.insert(row) for row in self.prepare(states)), dtype=np.int64, count=len(states))
 
 
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
+  def prepare(self, states):
+    # This method converts states to contiguous complex128 amplitudes, with negative zeros made positive so that equal amplitudes hash the same
+    # Input: states, a numpy array of one state, or a 2D numpy array with one state per row
+    # Output: a numpy array of the same shape
 
 
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
+    states = np.ascontiguousarray(states, dtype=np.complex128) + 0.0
+    if states.shape[-1:] != (2**self.n,):
+      raise ValueError('Expected states of %d amplitudes, got shape %s' % (2**self.n, states.shape))
+    return states
 
 
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
+  def insert(self, row):
+    # This method looks a prepared state up by the hash of its content, appending it and its hash if it is new
+    # Input: row, a contiguous numpy array of complex128 amplitudes
+    # Output: an integer representing the id of the state
 
 
-        # Break out of the loop
+    content = row.tobytes()
+    digest = hashlib.blake2b(content, digest_size=HASH_SIZE).digest()
+    known = self.ids.get(digest)
+    if known is None:
+      known = self.ids[digest] = self.count
+      self.count += 1
+      self.states.write(content)
+      self.hashes.write(digest)
+    return known
+
+
+  def flush(self, sync=False):
+    # This method writes the new states and their hashes to disk, the states first
+    # Input: sync, a boolean indicating whether to wait until they are on stable storage
+    # Output: None
+
+
+    for file in (self.states, self.hashes):
+      file.flush()
+      if sync:
+        os.fsync(file.fileno())
+
+
+  def close(self):
+    # This method flushes and closes the files of the store
+    # Input: None
+    # Output: None
+
+
+    self.flush()
+    self.states.close()
+    self.hashes.close()
+
+
+def open_states(path=LOG_DIR, n=N):
+  # This function maps the states of a state store into memory without copying them
+  # Input: path, a string representing the directory of the store
+  #        n, an integer representing the number of qubits of the states
+  # Output: a read-only 2D numpy array with the state of each id as a row; slicing it reads only the states in the slice
+
+
+  # Map the whole states written so far; an empty file cannot be mapped
+  states_file = os.path.join(path, STATES_FILE)
+  count = os.path.getsize(states_file) // (2**n * np.dtype(np.complex128).itemsize) if os.path.exists(states_file) else 0
+  if not count:
+    return np.empty((0, 2**n), dtype=np.complex128)
+  return np.memmap(states_file, dtype=np.complex128, mode='r', shape=(count, 2**n))
+
+
+class LogWriter:
+  # This class writes records to a log store from a background thread: logging a record only puts it on a bounded queue, and the thread takes the queued records in large batches, buffers them in the store and flushes the store to stable storage every fsync_interval seconds
+  # When the queue is full, logging waits for room under the 'block' policy, which slows the producers down to the speed of the disk, or drops the record under the 'drop' policy
+  # Input: store, a LogStore object, which only the thread uses from then on
+  #        queue_size, an integer representing the number of records or batches the queue can hold
+  #        policy, a string among POLICIES
+  #        fsync_interval, a float representing the number of seconds between two flushes to stable storage
+
+
+  def __init__(self, store, queue_size=WRITER_QUEUE_SIZE, policy='block', fsync_interval=FSYNC_INTERVAL):
+    # Check the policy
+    if policy not in POLICIES:
+      raise ValueError('Unknown log writer policy %r' % policy)
+
+
+    # Store the parameters and create the queue
+    self.store = store
+    self.policy = policy
+    self.fsync_interval = fsync_interval
+    self.queue = queue.Queue(queue_size)
+    self.error = None
+    self.closed = False
+
+
+    # Initialize the counters
+    self.enqueued = 0
+    self.dropped = 0
+    self.written = 0
+    self.syncs = 0
+    self.busy = 0.0
+
+
+    # Start the thread, remembering the process it runs in
+    self.pid = os.getpid()
+    self.thread = threading.Thread(target=self.run, daemon=True)
+    self.thread.start()
+
+
+  def log(self, state1, state2, message1, message2):
+    # This method queues one record, stamped with the current time
+    # Input: state1, state2, two numpy arrays representing quantum states
+    #        message1, message2, two strings representing messages
+    # Output: a boolean indicating whether the record was queued rather than dropped; raises ValueError for a malformed record
+
+
+    state1, state2 = self.validate((state1, state2), (message1, message2), ())
+    return self.put(('record', datetime.datetime.now(), state1, state2, message1, message2), 1)
+
+
+  def log_batch(self, states1, states2, messages1, messages2):
+    # This method queues a batch of records, all stamped with the current time
+    # Input: states1, states2, two 2D numpy arrays with one quantum state per row
+    #        messages1, messages2, two lists of strings representing messages
+    # Output: a boolean indicating whether the batch was queued rather than dropped; raises ValueError for a malformed batch
+
+
+    states1, states2 = self.validate((states1, states2), tuple(messages1) + tuple(messages2), (len(messages1),))
+    if len(messages2) != len(messages1):
+      raise ValueError('Expected %d messages of VM2, got %d' % (len(messages1), len(messages2)))
+    return self.put(('batch', datetime.datetime.now(), states1, states2, messages1, messages2), len(messages1))
+
+
+  def validate(self, states, messages, batch):
+    # This method checks records before they are queued, so that a malformed record fails its caller instead of the background thread and the records written with it
+    # Input: states, a tuple of the state arguments of the records
+    #        messages, a tuple of every message of the records
+    #        batch, a tuple of the leading dimensions the states must have, empty for one record
+    # Output: a tuple of the states as numpy arrays
+
+
+    states = tuple(np.asarray(state) for state in states)
+    for state in states:
+      if state.dtype.kind not in 'biufc':
+        raise ValueError('Expected numeric states, got dtype %s' % state.dtype)
+      if state.shape != batch + (2**self.store.n,):
+        raise ValueError('Expected states of shape %s, got %s' % (batch + (2**self.store.n,), state.shape))
+    for message in messages:
+      if not isinstance(message, str):
+        raise ValueError('Expected string messages, got %s' % type(message).__name__)
+    return states
+
+
+  def put(self, item, records):
+    # This method puts an item on the queue according to the policy, raising the error that stopped the thread, if any
+    # Input: item, a tuple of the kind of item and its content
+    #        records, an integer representing the number of records in the item
+    # Output: a boolean indicating whether the item was queued
+
+
+    # Refuse items once the writer stopped
+    self.check()
+
+
+    # Wait for room, or drop the item if there is none
+    if self.policy == 'block':
+      self.queue.put(item)
+    else:
+      try:
+        self.queue.put_nowait(item)
+      except queue.Full:
+        self.dropped += records
+        return False
+    self.enqueued += records
+    return True
+
+
+  def check(self):
+    # This method raises an error if the writer cannot take records any more
+    # Input: None
+    # Output: None
+
+
+    if self.error is not None:
+      raise RuntimeError('Log writer failed') from self.error
+    if self.closed:
+      raise RuntimeError('Log writer is closed')
+
+
+  def run(self):
+    # This method runs on the thread, writing the queued items until the end marker
+    # Input: None
+    # Output: None
+
+
+    last_sync = time.monotonic()
+    unsynced = False
+    while True:
+
+
+      # Wait for an item until the next flush is due, then take every item already waiting, up to WRITER_BATCH
+      items = []
+      try:
+        items.append(self.queue.get(timeout=max(0.0, last_sync + self.fsync_interval - time.monotonic())))
+        while len(items) < WRITER_BATCH:
+          items.append(self.queue.get_nowait())
+      except queue.Empty:
+        pass
+
+
+      # Write the records, and answer flush requests once the records before them are written; after a failure, keep taking items so that producers never block
+      started = time.monotonic()
+      records = []
+      for item in items:
+        if item[0] in ('record', 'batch'):
+          records.append(item)
+          continue
+        if self.error is None:
+          try:
+            self.write(records)
+            records = []
+            if item[0] in ('flush', 'end'):
+              self.store.flush(sync=True)
+              self.syncs += 1
+              last_sync, unsynced = time.monotonic(), False
+          except Exception as error:
+            self.error = error
+        if item[0] == 'end':
+          return
+        item[1].set()
+      if self.error is None:
+        try:
+          self.write(records)
+          unsynced = unsynced or bool(records)
+
+
+          # Flush to stable storage when the interval has passed since the last flush
+          if unsynced and time.monotonic() - last_sync >= self.fsync_interval:
+            self.store.flush(sync=True)
+            self.syncs += 1
+            last_sync, unsynced = time.monotonic(), False
+        except Exception as error:
+          self.error = error
+      self.busy += time.monotonic() - started
+
+
+  def write(self, items):
+    # This method buffers queued records in the store, stacking consecutive single records into one batch
+    # Input: items, a list of queued record and batch items
+    # Output: None
+
+
+    # Stack the runs of single records
+    singles = []
+    for item in items + [None]:
+      if item is not None and item[0] == 'record':
+        singles.append(item)
+        continue
+      if singles:
+        kind, times, states1, states2, messages1, messages2 = zip(*singles)
+        self.store.extend(np.stack(states1), np.stack(states2), list(messages1), list(messages2), np.array(times, dtype='datetime64[us]'))
+        self.written += len(singles)
+        singles = []
+
+
+      # Write batches as they are
+      if item is not None:
+        kind, times, states1, states2, messages1, messages2 = item
+        self.store.extend(states1, states2, messages1, messages2, times)
+        self.written += len(messages1)
+
+
+  def flush(self):
+    # This method waits until every record queued so far is written and on stable storage
+    # Input: None
+    # Output: None
+
+
+    # Queue the flush request after the last records whatever the policy, and wait for the thread to answer it
+    self.check()
+    done = threading.Event()
+    self.queue.put(('flush', done))
+    while not done.wait(0.1):
+      if self.error is not None or not self.thread.is_alive():
         break
+    if self.error is not None:
+      raise RuntimeError('Log writer failed') from self.error
 
 
-  # Return the frequency dictionary
-  return freqs
+  def close(self):
+    # This method writes every queued record, stops the thread and closes the store
+    # Input: None
+    # Output: None
 
 
-def generate_message(freqs, vocab):
-  # This function generates a message based on the frequencies of each outcome and a vocabulary list
-  # Input: freqs, a dictionary mapping each outcome to its frequency
-  #        vocab, a list of words to use as vocabulary
-  # Output: a string representing the message
+    # Do nothing if the writer is already closed
+    if self.closed:
+      return
 
 
-  # Initialize an empty message
-  message = ''
+    # Queue the end marker after the last records and wait for the thread, which keeps taking items even after a failure
+    self.queue.put(('end', None))
+    self.closed = True
+    self.thread.join()
+    if self.error is None:
+      self.store.close()
+    else:
+      raise RuntimeError('Log writer failed') from self.error
 
 
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+  def metrics(self):
+    # This method reports the counters of the writer
+    # Input: None
+    # Output: a dictionary of the queue depth, the numbers of records queued, dropped and written, the number of flushes to stable storage and the records written per second of work of the thread
 
 
-  # Loop over the top three outcomes
-  for i in range(3):
+    return {'depth': self.queue.qsize(), 'enqueued': self.enqueued, 'dropped': self.dropped, 'written': self.written,
+            'syncs': self.syncs, 'records_per_second': self.written / self.busy if self.busy else 0.0}
 
 
-    # Get the outcome and its frequency from the sorted list
-    outcome, frequency = sorted_outcomes[i]
+class LogReader:
+  # This class reads the chunks of a log directory lazily: the columns of a chunk are memory-mapped only when the chunk is reached, and the messages are decoded and the states looked up only when they are asked for
+  # Input: path, a string representing the log directory
+  #        n, an integer representing the number of qubits of the logged states
 
 
-    # Convert the outcome to an integer index by interpreting it as a binary number
-    index = int(outcome, 2)
+  def __init__(self, path=LOG_DIR, n=N):
+    # List the complete chunks in order
+    self.path = path
+    self.n = n
+    self.names = sorted(name for name in os.listdir(path) if name.startswith('chunk-')) if os.path.isdir(path) else []
 
 
-    # Check if the index is within the range of the vocabulary list
-    if index < len(vocab):
+  def chunk(self, name):
+    # This method maps the columns of one chunk into memory
+    # Input: name, a string representing the chunk directory name
+    # Output: a dictionary mapping each column name to a read-only memory-mapped numpy array
 
 
-      # Get the word corresponding to the index from the vocabulary list
-      word = vocab[index]
+    directory = os.path.join(self.path, name)
+    return {file[:-len('.npy')]: np.load(os.path.join(directory, file), mmap_mode='r') for file in os.listdir(directory) if file.endswith('.npy')}
 
 
-      # Add the word and its frequency to the message, separated by a colon and a space
-      message += word + ': ' + str(frequency) + ', '
+  def chunks(self):
+    # This method iterates over the chunks in order
+    # Input: None
+    # Output: a generator of the column dictionaries of chunk method
 
 
-  # Remove the last comma and space from the message
-  message = message[:-2]
+    for name in self.names:
+      yield self.chunk(name)
 
 
-  # Return the message
-  return message
+  def __len__(self):
+    # This method returns the number of records in the log, reading only the header of each time column
+    # Input: None
+    # Output: an integer
 
 
-def log_data(state1, state2, message1, message2):
-  # This function logs all communication and quantum state changes for analysis and future reference using a pandas dataframe
-  # Input: state1, state2, two numpy arrays representing quantum states
-  #        message1, message2, two strings representing messages
-  # Output: None
+    return sum(len(chunk['time']) for chunk in self.chunks())
+
+
+  def time_range(self, name):
+    # This method reads the first and last times of a chunk
+    # Input: name, a string representing the chunk directory name
+    # Output: a numpy array of two datetime64
+
+
+    return np.load(os.path.join(self.path, name, 'time_range.npy'))
 
 
-  global df # Use a global variable for the dataframe
+  def locate(self, chunk, value):
+    # This method finds the first record of a chunk at or after a time, with a binary search in the sparse time index, then in the INDEX_STRIDE records it points to
+    # Input: chunk, a dictionary of columns of a chunk whose times are in order
+    #        value, a numpy datetime64
+    # Output: an integer representing the row number
 
 
-  try:
-    df # Check if the dataframe exists
+    # Find the stride of records holding the time, then the time in it
+    step = int(np.searchsorted(chunk['time_index'], value))
+    if step == 0:
+      return 0
+    low = (step - 1) * INDEX_STRIDE
+    high = min(step * INDEX_STRIDE, len(chunk['time']))
+    return low + int(np.searchsorted(chunk['time'][low:high], value))
 
 
-  except NameError:
-    df = None # If not, set it to None
+  def scan(self, start=None, stop=None, contains=None, rows=READ_ROWS):
+    # This method streams the records of a time range, a few thousand at a time; chunks outside the range are skipped without being mapped, and the range is found in ordered chunks with their sparse time index
+    # Input: start, stop, optional times bounding the range, start included and stop excluded
+    #        contains, an optional string that one of the two messages of each record must contain
+    #        rows, an integer representing the largest number of records read at a time
+    # Output: a generator of dictionaries with the columns 'time', 'state1' and 'state2' as numpy arrays of times and state ids, and 'message1' and 'message2' as lists of strings
 
 
-  if df is None:
-    df = pd.DataFrame(columns=['Time', 'State1', 'State2', 'Message1', 'Message2']) # If None, create a new dataframe with column names
+    start, stop = to_time(start), to_time(stop)
+    for name in self.names:
 
 
-  else:
-    pass # If not None, do nothing
+      # Skip the chunks outside the range
+      first, last = self.time_range(name)
+      if (start is not None and last < start) or (stop is not None and first >= stop):
+        continue
 
 
-  time = datetime.datetime.now() # Get the current date and time
+      # Narrow the rows to the range when the times of the chunk are in order
+      chunk = self.chunk(name)
+      begin, end = 0, len(chunk['time'])
+      if len(chunk['time_index']):
+        begin = self.locate(chunk, start) if start is not None else begin
+        end = self.locate(chunk, stop) if stop is not None else end
 
 
-  data = {'Time': time, 'State1': state1, 'State2': state2, 'Message1': message1, 'Message2': message2} # Create a dictionary with data to log
+      # Read the rows a part at a time, keeping the records in the range whose messages match
+      for offset in range(begin, end, rows):
+        part = slice(offset, min(offset + rows, end))
+        times = np.asarray(chunk['time'][part])
+        keep = np.ones(len(times), dtype=bool)
+        if start is not None:
+          keep &= times >= start
+        if stop is not None:
+          keep &= times < stop
+        messages = [decode_messages(chunk[column], chunk[column + '_offsets'], part.start, part.stop) for column in MESSAGES]
+        if contains is not None:
+          keep &= np.fromiter((contains in message1 or contains in message2 for message1, message2 in zip(*messages)), dtype=bool, count=len(times))
+        kept = np.flatnonzero(keep)
+        if len(kept):
+          yield {'time': times[kept], 'state1': np.asarray(chunk['state1'][part])[kept], 'state2': np.asarray(chunk['state2'][part])[kept],
+                 'message1': [messages[0][row] for row in kept], 'message2': [messages[1][row] for row in kept]}
 
 
-  df = df.append(data, ignore_index=True) # Append the data to the dataframe
+  def records(self, start=None, stop=None, contains=None):
+    # This method iterates over the records of a time range one at a time
+    # Input: start, stop, contains, the optional bounds and message filter of scan method
+    # Output: a generator of dictionaries with the keys 'time', 'state1', 'state2', 'message1' and 'message2'
+
+
+    # Map the state store once the chunks are listed, so that it holds every state they refer to
+    states = open_states(self.path, self.n)
+    for part in self.scan(start, stop, contains):
+      for row, (message1, message2) in enumerate(zip(part['message1'], part['message2'])):
+        yield {'time': part['time'][row], 'state1': states[part['state1'][row]], 'state2': states[part['state2'][row]], 'message1': message1, 'message2': message2}
+
+
+  def word_frequencies(self, interval=INTERVAL, start=None, stop=None, contains=None):
+    # This method adds up the frequency of every word of the messages of both VMs over consecutive time intervals
+    # Input: interval, a numpy timedelta64 representing the length of the intervals
+    #        start, stop, contains, the optional bounds and message filter of scan method
+    # Output: a dictionary mapping the start of each interval with records, as a numpy datetime64, to a collections.Counter of word frequencies, in time order
+
+
+    frequencies = collections.defaultdict(collections.Counter)
+    for part in self.scan(start, stop, contains):
+      buckets = floor_times(part['time'], interval)
+      for bucket, message1, message2 in zip(buckets, part['message1'], part['message2']):
+        counter = frequencies[bucket]
+        for word, frequency in parse_message(message1) + parse_message(message2):
+          counter[word] += frequency
+    return dict(sorted(frequencies.items()))
+
+
+  def fidelity_trend(self, interval=INTERVAL, start=None, stop=None, contains=None):
+    # This method averages the fidelity between the states of VM1 and VM2 over consecutive time intervals
+    # Input: interval, a numpy timedelta64 representing the length of the intervals
+    #        start, stop, contains, the optional bounds and message filter of scan method
+    # Output: a tuple of three numpy arrays: the start of each interval with records, the mean fidelity and the number of records of each interval
+
+
+    # Add up the fidelities of each interval, reading only the states of the records in each part
+    states = open_states(self.path, self.n)
+    totals = collections.defaultdict(float)
+    counts = collections.Counter()
+    for part in self.scan(start, stop, contains):
+      fidelities = pair_fidelities(states[part['state1']], states[part['state2']])
+      buckets, inverse = np.unique(floor_times(part['time'], interval), return_inverse=True)
+      for bucket, total, count in zip(buckets, np.bincount(inverse, weights=fidelities), np.bincount(inverse)):
+        totals[bucket] += total
+        counts[bucket] += count
+
+
+    # Return the means in time order
+    buckets = sorted(counts)
+    return np.array(buckets, dtype='datetime64[us]'), np.array([totals[bucket] / counts[bucket] for bucket in buckets]), np.array([counts[bucket] for bucket in buckets], dtype=np.int64)
 
 
 # Main program
 
 
-# Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
+if __name__ == '__main__':
+
+
+  # Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
 
 
-# Measure sync_state1 M times and get the frequencies of each outcome
-freqs1 = measure_state(sync_state1, M)
+  # Measure sync_state1 M times and get the frequencies of each outcome
+  freqs1 = measure_state(sync_state1, M)
 
 
-# Generate a message for VM1 based on freqs1 and vocab using generate_message function from SG droplet (not shown here)
-message1 = generate_message(freqs1, vocab)
+  # Generate a message for VM1 based on freqs1 and vocab using generate_message function from SG droplet (not shown here)
+  message1 = generate_message(freqs1, vocab)
 
 
-# Print the message for VM1
-print('Message for VM1:', message1)
+  # Print the message for VM1
+  print('Message for VM1:', message1)
 
 
-# Measure sync_state2 M times and get the frequencies of each outcome
-freqs2 = measure_state(sync_state2, M)
+  # Measure sync_state2 M times and get the frequencies of each outcome
+  freqs2 = measure_state(sync_state2, M)
 
 
-# Generate a message for VM2 based on freqs2 and vocab using generate_message function from SG droplet (not shown here)
-message2 = generate_message(freqs2, vocab)
+  # Generate a message for VM2 based on freqs2 and vocab using generate_message function from SG droplet (not shown here)
+  message2 = generate_message(freqs2, vocab)
 
 
-# Print the message for VM2
-print('Message for VM2:', message2)
+  # Print the message for VM2
+  print('Message for VM2:', message2)
 
 
-# Log all communication and quantum state changes using log_data function
-log_data(sync_state1, sync_state2, message1, message2)
+  # Log all communication and quantum state changes using log_data function
+  log_data(sync_state1, sync_state2, message1, message2)
 
 
-# Print the dataframe
-print(df)
+  # Flush the log and print its records, then the word frequencies and the mean fidelity of each hour
+  get_writer().flush()
+  reader = LogReader(LOG_DIR)
+  for record in reader.records():
+    print(record['time'], record['message1'], record['message2'])
+  print(reader.word_frequencies())
+  print(reader.fidelity_trend())
@@ -9,7 +9,7 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# qiskit is imported inside the functions that use it, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
 
 
@@ -25,6 +25,9 @@ def create_entangled_state(n):
   # Output: a numpy array representing the quantum state
 
 
+  import qiskit # A framework for quantum computing
+
+
   # Initialize a quantum circuit with n qubits
   circuit = qiskit.QuantumCircuit(n)
 
@@ -113,24 +116,44 @@ def synchronize_states(state1, state2):
     return state1, state2
 
 
+def synchronize_batch(states1, states2):
+  # This function synchronizes many pairs of quantum states at once, as synchronize_states function does for one pair
+  # Input: states1, states2, two 2D numpy arrays with one quantum state per row, paired row by row
+  # Output: two 2D numpy arrays representing the synchronized quantum states
+
+
+  # Calculate the phase difference of every pair by taking the argument of their inner product
+  phase_diff = np.angle(np.sum(np.conjugate(states1) * states2, axis=1))
+
+
+  # Each state is rotated by half the phase difference, and the rotation of apply_rotation_gate function multiplies every coefficient by its diagonal entry cos(angle/2), the same for both opposite angles; pairs already in phase are left unchanged
+  scale = np.where(phase_diff != 0, np.cos(phase_diff / 4), 1)[:, None]
+
+
+  # Return the new states
+  return states1 * scale, states2 * scale
+
+
 # Main program
 
 
-# Create two entangled quantum states on N qubits for VM1 and VM2 using a circuit of Hadamard and CNOT gates
-state1 = create_entangled_state(N)
-state2 = create_entangled_state(N)
+if __name__ == '__main__':
+
 
+  # Create two entangled quantum states on N qubits for VM1 and VM2 using a circuit of Hadamard and CNOT gates
+  state1 = create_entangled_state(N)
+  state2 = create_entangled_state(N)
 
-# Print the states as numpy arrays
-print('State of VM1:', state1)
-print('State of VM2:', state2)
 
+  # Print the states as numpy arrays
+  print('State of VM1:', state1)
+  print('State of VM2:', state2)
 
-# Synchronize the states by applying rotation gates to them until they have the same phase
-sync_state1, sync_state2 = synchronize_states(state1, state2)
 
+  # Synchronize the states by applying rotation gates to them until they have the same phase
+  sync_state1, sync_state2 = synchronize_states(state1, state2)
 
-# Print the synchronized states as numpy arrays
-print('Synchronized State of VM1:', sync_state1)
-print('Synchronized State of VM2:', sync_state2)
 
+  # Print the synchronized states as numpy arrays
+  print('Synchronized State of VM1:', sync_state1)
+  print('Synchronized State of VM2:', sync_state2)
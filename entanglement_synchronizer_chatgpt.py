@@ -3,8 +3,8 @@
 # It adjusts the entanglement parameters to maintain coherence and consistency in their quantum states.
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
+from core import random_state # The state, sampling and message primitives shared by all droplets
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
@@ -47,21 +47,24 @@ def adjust_entanglement_strength(state1, state2, current_strength, target_streng
 
 # Main program
 
-# Create two random quantum states on N qubits for VM1 and VM2
-state1 = create_random_state(N)
-state2 = create_random_state(N)
 
-# Entangle the states with the desired strength
-state1, state2 = entangle_states(state1, state2, entanglement_strength)
+if __name__ == '__main__':
 
-# Print the entangled states as numpy arrays
-print('Entangled State of VM1:', state1)
-print('Entangled State of VM2:', state2)
+  # Create two random quantum states on N qubits for VM1 and VM2
+  state1 = random_state(N)
+  state2 = random_state(N)
 
-# Adjust the entanglement strength if needed
-target_strength = 0.95 # Adjust as desired
-state1, state2 = adjust_entanglement_strength(state1, state2, entanglement_strength, target_strength)
+  # Entangle the states with the desired strength
+  state1, state2 = entangle_states(state1, state2, entanglement_strength)
 
-# Print the adjusted entangled states
-print('Adjusted Entangled State of VM1:', state1)
-print('Adjusted Entangled State of VM2:', state2)
+  # Print the entangled states as numpy arrays
+  print('Entangled State of VM1:', state1)
+  print('Entangled State of VM2:', state2)
+
+  # Adjust the entanglement strength if needed
+  target_strength = 0.95 # Adjust as desired
+  state1, state2 = adjust_entanglement_strength(state1, state2, entanglement_strength, target_strength)
+
+  # Print the adjusted entangled states
+  print('Adjusted Entangled State of VM1:', state1)
+  print('Adjusted Entangled State of VM2:', state2)
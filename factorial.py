@@ -15,23 +15,24 @@ class FactorialCalculator:
     def print_result(self):
         print(f"The factorial of {self.number} is {self.calculate_factorial()}")
 
-# Ask the user to enter a positive integer and store it in a variable called user_input
-user_input = input("Please enter a positive integer: ")
+if __name__ == '__main__':
+    # Ask the user to enter a positive integer and store it in a variable called user_input
+    user_input = input("Please enter a positive integer: ")
 
-# Try to convert user_input to an integer and store it in a variable called user_number
-try:
-    user_number = int(user_input)
-# If user_input is not a valid integer, print an error message and exit the program
-except ValueError:
-    print("Invalid input. Please enter a positive integer.")
-    exit()
-# If user_number is negative, print an error message and exit the program
-if user_number < 0:
-    print("Invalid input. Please enter a positive integer.")
-    exit()
+    # Try to convert user_input to an integer and store it in a variable called user_number
+    try:
+        user_number = int(user_input)
+    # If user_input is not a valid integer, print an error message and exit the program
+    except ValueError:
+        print("Invalid input. Please enter a positive integer.")
+        exit()
+    # If user_number is negative, print an error message and exit the program
+    if user_number < 0:
+        print("Invalid input. Please enter a positive integer.")
+        exit()
 
-# Create an instance of FactorialCalculator with user_number as an argument and store it in a variable called calculator
-calculator = FactorialCalculator(user_number)
+    # Create an instance of FactorialCalculator with user_number as an argument and store it in a variable called calculator
+    calculator = FactorialCalculator(user_number)
 
-# Call the print_result method of calculator
-calculator.print_result()
+    # Call the print_result method of calculator
+    calculator.print_result()
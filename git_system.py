@@ -1,5 +1,5 @@
 # How to Import GitPython and other libraries
-import git
+# GitPython is imported where it is used, so that importing this module stays fast
 import numpy as np
 import math
 
@@ -37,6 +37,7 @@ class Kernel:
     # Define a class method called get_feedback that takes a branch name as an argument
     # This method will evaluate the branch based on various metrics, including Golden Ratio scores, and return a feedback dictionary
     def get_feedback(branch_name):
+        import git
         # Initialize an empty dictionary to store the feedback
         feedback = {}
         # Get the repo object from GitPython
@@ -78,29 +79,31 @@ def calculate_golden_ratio_score(file):
     score = 0.0  # define the score variable
     return score
 
-# create a repo object
-repo = git.Repo("C:/Users/pavel/hourglass_experiment_2/.git/")
+if __name__ == '__main__':
+    import git
 
-# create an agent object
-agent = Agent("agent_directory")
+    # create a repo object
+    repo = git.Repo("C:/Users/pavel/hourglass_experiment_2/.git/")
 
-# call the commit method with the repo object
-agent.commit(repo)
+    # create an agent object
+    agent = Agent("agent_directory")
 
-# Initialize agents with random starting directories 
-agents = [Agent(f"directory_{i}") for i in np.random.randint(1000, size=10)]
+    # call the commit method with the repo object
+    agent.commit(repo)
 
-# Main Loop 
-for iteration in range(100):  # 100 iterations 
-    for agent in agents: 
-        agent.commit(repo)  # Agents explore and commit 
+    # Initialize agents with random starting directories 
+    agents = [Agent(f"directory_{i}") for i in np.random.randint(1000, size=10)]
 
-# create a kernel object
-kernel = Kernel()
+    # Main Loop 
+    for iteration in range(100):  # 100 iterations 
+        for agent in agents: 
+            agent.commit(repo)  # Agents explore and commit 
 
-# call the get_feedback method with the branch name
-feedback = kernel.get_feedback(branch_name)
+    # create a kernel object
+    kernel = Kernel()
 
-# call the select_version method with the repo object
-best_version = kernel.select_version(repo)
+    # call the get_feedback method with the branch name
+    feedback = kernel.get_feedback(branch_name)
 
+    # call the select_version method with the repo object
+    best_version = kernel.select_version(repo)
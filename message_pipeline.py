@@ -0,0 +1,315 @@
+# MP droplet: Message Pipeline
+# This droplet chains the VM1/VM2 message exchange of the ES, SG, CM, CR and DL droplets into one pipeline: state synchronization, sampling, message generation, noise and emoticon decoration, conflict resolution, and logging.
+# Each stage is a generator that consumes and yields batches of exchanges, so that a stream of state pairs flows through the whole chain without being held in memory.
+# The stages can run inline, each in its own thread, or each in its own process, connected by bounded queues.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import functools # A library for partial functions
+import threading # A library for multithreading
+import multiprocessing # A library for multiprocessing
+import queue # A library for thread-safe queues
+import time # A library for measuring time
+from core import rng, generate_state, measure_states, generate_messages # The state, sampling and message primitives shared by all droplets
+from entanglement_synchronizer import synchronize_batch # Batched state synchronization of the ES droplet
+import communication_mediator # The noise and emoticons of the CM droplet
+import conflict_resolver # The conflict resolution of the CR droplet
+import data_logger # The logging of the DL droplet
+
+
+# Define constants
+N = 8 # The number of qubits in each quantum system
+M = 100 # The number of measurements to perform on each quantum state
+BATCH_SIZE = 256 # The number of exchanges in each batch passed between stages
+QUEUE_SIZE = 8 # The number of batches each queue between two stages can hold
+MODES = ('inline', 'thread', 'process') # The ways the stages can be run
+END = 'end' # The marker a stage sends after its last batch
+
+
+# Define functions
+def batch_pairs(pairs, batch_size=BATCH_SIZE):
+  # This function groups a stream of state pairs into batches
+  # Input: pairs, an iterable of tuples of two numpy arrays representing the quantum states of VM1 and VM2
+  #        batch_size, an integer representing the number of pairs in each batch
+  # Output: a generator of dictionaries with the stacked states of VM1 and VM2 under 'states1' and 'states2'
+
+
+  # Take batch_size pairs at a time until the stream runs out
+  states1, states2 = [], []
+  for state1, state2 in pairs:
+    states1.append(state1)
+    states2.append(state2)
+    if len(states1) == batch_size:
+      yield {'states1': np.stack(states1), 'states2': np.stack(states2)}
+      states1, states2 = [], []
+
+
+  # Yield the last, partial batch
+  if states1:
+    yield {'states1': np.stack(states1), 'states2': np.stack(states2)}
+
+
+def sync_stage(batches):
+  # This stage synchronizes the phases of the states of VM1 and VM2 using synchronize_batch function of the ES droplet
+  # Input: batches, an iterable of batch dictionaries
+  # Output: a generator of the batch dictionaries with synchronized states
+
+
+  for batch in batches:
+    batch['states1'], batch['states2'] = synchronize_batch(batch['states1'], batch['states2'])
+    yield batch
+
+
+def sample_stage(batches, m=M):
+  # This stage measures every state m times using measure_states function
+  # Input: batches, an iterable of batch dictionaries
+  #        m, an integer representing the number of measurements of each state
+  # Output: a generator of the batch dictionaries with the histograms of VM1 and VM2 under 'histograms1' and 'histograms2'
+
+
+  for batch in batches:
+    batch['histograms1'] = measure_states(batch['states1'], m)
+    batch['histograms2'] = measure_states(batch['states2'], m)
+    yield batch
+
+
+def message_stage(batches, vocab=communication_mediator.vocab):
+  # This stage generates the messages of VM1 and VM2 from their histograms using generate_messages function, then drops the histograms
+  # Input: batches, an iterable of batch dictionaries
+  #        vocab, a list of words to use as vocabulary
+  # Output: a generator of the batch dictionaries with the messages of VM1 and VM2 under 'messages1' and 'messages2'
+
+
+  for batch in batches:
+    batch['messages1'] = generate_messages(batch.pop('histograms1'), vocab)
+    batch['messages2'] = generate_messages(batch.pop('histograms2'), vocab)
+    yield batch
+
+
+def decorate_stage(batches, channel=None, emoticons=communication_mediator.emoticons):
+  # This stage adds noise and an emoticon to every message as they are transmitted to the other VM, passing each batch through the NoiseChannel class of the CM droplet at once
+  # Input: batches, an iterable of batch dictionaries
+  #        channel, an optional NoiseChannel object, one with the noise_level of the CM droplet by default
+  #        emoticons, a list of emoticons to use as symbols
+  # Output: a generator of the batch dictionaries with the transmitted messages of VM1 and VM2 under 'transmitted1' and 'transmitted2'
+
+
+  if channel is None:
+    channel = communication_mediator.NoiseChannel(communication_mediator.noise_level)
+  for batch in batches:
+    for i in ('1', '2'):
+      noisy = channel.transmit(batch['messages' + i])
+      batch['transmitted' + i] = [message + ' ' + emoticons[choice] for message, choice in zip(noisy, rng.integers(len(emoticons), size=len(noisy)).tolist())]
+    yield batch
+
+
+def resolve_stage(batches):
+  # This stage resolves the conflicts between the transmitted messages of VM1 and VM2 using resolve_batch function of the CR droplet, whose parsing skips the parts garbled by noise and the emoticons
+  # Input: batches, an iterable of batch dictionaries
+  # Output: a generator of the batch dictionaries with the resolved messages of VM1 and VM2 under 'resolved1' and 'resolved2'
+
+
+  for batch in batches:
+    batch['resolved1'], batch['resolved2'] = conflict_resolver.resolve_batch(batch['transmitted1'], batch['transmitted2'])
+    yield batch
+
+
+def log_stage(batches, log=None):
+  # This stage logs every exchange
+  # Input: batches, an iterable of batch dictionaries
+  #        log, an optional function taking the two states and the two resolved messages of an exchange; by default each batch is logged at once with log_batch function of the DL droplet
+  # Output: a generator of the logged batch dictionaries
+
+
+  for batch in batches:
+    if log is None:
+      data_logger.log_batch(batch['states1'], batch['states2'], batch['resolved1'], batch['resolved2'])
+    else:
+      for exchange in zip(batch['states1'], batch['states2'], batch['resolved1'], batch['resolved2']):
+        log(*exchange)
+    yield batch
+
+
+  # Wait until the background writer of the DL droplet wrote the records, since a stage process exits without running its exit handlers
+  if log is None:
+    data_logger.get_writer().flush()
+
+
+def drain(source, stop):
+  # This function iterates over the batches arriving on a queue until the end marker, passing failures on as exceptions
+  # Input: source, a queue.Queue or multiprocessing.Queue object
+  #        stop, a threading.Event or multiprocessing.Event object set when the pipeline shuts down
+  # Output: a generator of batches
+
+
+  while not stop.is_set():
+    try:
+      item = source.get(timeout=0.1)
+    except queue.Empty:
+      continue
+    if isinstance(item, tuple) and item[0] == END:
+      if item[1] is not None:
+        raise item[1]
+      return
+    yield item
+
+
+def send(target, item, stop):
+  # This function puts an item on a bounded queue, waiting for room unless the pipeline shuts down
+  # Input: target, a queue.Queue or multiprocessing.Queue object
+  #        item, the item to put
+  #        stop, a threading.Event or multiprocessing.Event object set when the pipeline shuts down
+  # Output: a boolean indicating whether the item was put
+
+
+  while not stop.is_set():
+    try:
+      target.put(item, timeout=0.1)
+      return True
+    except queue.Full:
+      continue
+  return False
+
+
+def pump(stage, source, target, stop):
+  # This function runs one stage in a thread or process, reading its batches from one queue and writing the results to the next
+  # Input: stage, a generator function taking an iterable of batches
+  #        source, target, the queues before and after the stage; source is None for the stage that produces the batches
+  #        stop, a threading.Event or multiprocessing.Event object set when the pipeline shuts down
+  # Output: None
+
+
+  # Run the stage and pass on its batches, then the end marker with the error that stopped the stage, if any
+  try:
+    for batch in stage(drain(source, stop)) if source is not None else stage():
+      if not send(target, batch, stop):
+        break
+    else:
+      send(target, (END, None), stop)
+  except Exception as exception:
+    send(target, (END, exception), stop)
+
+
+  # Let a process exit without flushing batches nobody will read once the pipeline shuts down
+  if stop.is_set() and hasattr(target, 'cancel_join_thread'):
+    target.cancel_join_thread()
+
+
+# Define classes
+class MessagePipeline:
+  # This class runs the stages of the message exchange over a stream of state pairs
+  # Input: stages, a list of generator functions taking and yielding batches, the full exchange by default; functools.partial can bind their parameters
+  #        mode, a string among MODES representing how the stages run
+  #        queue_size, an integer representing the number of batches each queue between two stages can hold
+
+
+  def __init__(self, stages=None, mode='thread', queue_size=QUEUE_SIZE):
+    # Check the mode
+    if mode not in MODES:
+      raise ValueError('Unknown pipeline mode %r' % mode)
+
+
+    # Store the stages, the mode and the queue size
+    self.stages = list(stages) if stages is not None else [sync_stage, sample_stage, message_stage, decorate_stage, resolve_stage, log_stage]
+    self.mode = mode
+    self.queue_size = queue_size
+
+
+    # Initialize the counters
+    self.exchanges = 0
+    self.elapsed = 0.0
+
+
+  def run(self, pairs, batch_size=BATCH_SIZE):
+    # This method pushes a stream of state pairs through the stages
+    # Input: pairs, an iterable of tuples of two numpy arrays representing the quantum states of VM1 and VM2
+    #        batch_size, an integer representing the number of exchanges in each batch
+    # Output: a generator of the batch dictionaries leaving the last stage
+
+
+    # Chain the generators directly when running inline
+    started = time.monotonic()
+    batches = batch_pairs(pairs, batch_size)
+    if self.mode == 'inline':
+      for stage in self.stages:
+        batches = stage(batches)
+      try:
+        for batch in batches:
+          self.count(batch, started)
+          yield batch
+      except Exception as error:
+        raise RuntimeError('Message pipeline stage failed') from error
+      return
+
+
+    # Create the queues between the stages and the workers running them; the batches are produced in a thread of this process, started after the stage processes are forked, since the pairs may not be picklable
+    if self.mode == 'thread':
+      stop = threading.Event()
+      queues = [queue.Queue(self.queue_size) for stage in range(len(self.stages) + 1)]
+      worker = threading.Thread
+    else:
+      stop = multiprocessing.Event()
+      queues = [multiprocessing.Queue(self.queue_size) for stage in range(len(self.stages) + 1)]
+      worker = multiprocessing.Process
+    workers = [worker(target=pump, args=(stage, queues[i], queues[i + 1], stop), daemon=True) for i, stage in enumerate(self.stages)]
+    workers += [threading.Thread(target=pump, args=(functools.partial(iter, batches), None, queues[0], stop), daemon=True)]
+    for thread in workers:
+      thread.start()
+
+
+    # Yield the batches leaving the last stage, raising the first stage failure
+    try:
+      for batch in drain(queues[-1], stop):
+        self.count(batch, started)
+        yield batch
+    except Exception as error:
+      raise RuntimeError('Message pipeline stage failed') from error
+    finally:
+      stop.set()
+      for thread in workers:
+        thread.join()
+
+
+  def count(self, batch, started):
+    # This method updates the counters with a batch leaving the pipeline
+    # Input: batch, a batch dictionary
+    #        started, a float representing the monotonic time the run started
+    # Output: None
+
+
+    self.exchanges += len(batch['states1'])
+    self.elapsed = time.monotonic() - started
+
+
+  def rate(self):
+    # This method returns the number of exchanges per second of the last run
+    # Input: None
+    # Output: a float
+
+
+    return self.exchanges / self.elapsed if self.elapsed else 0.0
+
+
+# Main program
+
+
+if __name__ == '__main__':
+
+
+  # Create a stream of random state pairs for VM1 and VM2
+  pairs = ((generate_state(N), generate_state(N)) for exchange in range(10000))
+
+
+  # Run the exchange in threads, logging into a list instead of the log store data_logger writes to
+  logged = []
+  pipeline = MessagePipeline([sync_stage, sample_stage, message_stage, decorate_stage, resolve_stage, functools.partial(log_stage, log=lambda *exchange: logged.append(exchange))])
+  for batch in pipeline.run(pairs):
+    pass
+
+
+  # Print the last exchange and the throughput
+  print('Message for VM1:', batch['transmitted1'][-1])
+  print('Message for VM2:', batch['transmitted2'][-1])
+  print('Resolved message:', batch['resolved1'][-1])
+  print('Exchanges per second:', round(pipeline.rate()))
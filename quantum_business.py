@@ -1,13 +1,11 @@
-python
 # QB droplet: Quantum Business
 # This droplet uses quantum strategies and solutions to optimize and enhance various aspects of business and money management.
 # This droplet can implement various QB tools, such as quantum finance, quantum economics, quantum marketing, quantum accounting, quantum analytics, quantum optimization, quantum decision making, quantum risk assessment, quantum forecasting, and quantum innovation.
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
-import numpy as np # A library for scientific computing
-import matplotlib.pyplot as plt # A library for plotting graphs
+# matplotlib is imported inside the functions that use it, so that importing this droplet stays fast
+from core import generate_state, measure_mode # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -15,87 +13,6 @@ N = 8 # The number of qubits in each quantum system
 M = 2**N # The size of the search space or the number of possible configurations
 
 
-# Define common functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
-def measure_state(state):
-  # This function measures a given quantum state on N qubits using qiskit and returns an integer representing the outcome index
-  # Input: state, a numpy array representing the quantum state on N qubits
-  # Output: an integer representing the outcome index
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit 
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Initialize the circuit with the given state using initialize method 
-  circuit.initialize(state)
-
-
-  # Measure all qubits in the circuit using measure method 
-  circuit.measure_all()
-
-
-  # Initialize a qasm simulator backend using qiskit 
-  backend = qiskit.Aer.get_backend('qasm_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object 
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the counts from the result object using get_counts method and get a dictionary mapping each outcome to its frequency 
-  counts = result.get_counts()
-
-
-  # Find the most frequent outcome from the counts dictionary using max function with key parameter set to lambda function that returns the value 
-  most_frequent_outcome = max(counts, key=lambda x: counts[x])
-
-
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number 
-  most_frequent_index = int(most_frequent_outcome, 2)
-
-
-  # Return the most_frequent_index as output 
-  return most_frequent_index
-
-
 # Choose one of the QB tools by uncommenting the corresponding line of code
 # tool = 'quantum finance'
 # tool = 'quantum economics'
@@ -160,11 +77,11 @@ if tool == 'quantum innovation':
 
 
       # Generate a random quantum state on N qubits using generate_state function and store it as a numpy array 
-      quantum_state = generate_state()
+      quantum_state = generate_state(N)
 
 
-      # Measure the quantum state on N qubits using measure_state function and store it as an integer 
-      quantum_index = measure_state(quantum_state)
+      # Measure the quantum state on N qubits using measure_mode function and store it as an integer 
+      quantum_index = measure_mode(quantum_state)
 
 
       # Convert the quantum index to a binary string of length N using bin function and slicing 
@@ -193,6 +110,9 @@ if tool == 'quantum innovation':
     # Output: a matplotlib figure object representing the bar chart
 
 
+    import matplotlib.pyplot as plt # A library for plotting graphs
+
+
     # Extract the solutions and scores from the quantum_solutions list using zip function and list comprehension 
     solutions = [x[0] for x in quantum_solutions]
     scores = [x[1] for x in quantum_solutions]
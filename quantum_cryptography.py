@@ -10,55 +10,23 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
+from core import generate_state # The state, sampling and message primitives shared by all droplets
 import hashlib # A library for hashing functions
+import threading # A library for multithreading
+import queue # A library for thread-safe queues
+import concurrent.futures # A library for thread pools
+import time # A library for measuring time
 
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
 M = 100 # The number of bits in each secret key or signature
+H = 32 # The number of bytes in each message hash or bulk signature
+MIN_BLOCKS = 8 # The smallest number of blocks of each Cascade pass, so that short keys are not checked with a few whole-key parities
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
 def measure_state(state, basis):
   # This function measures a quantum state in a given basis and returns the outcome as a binary string
   # Input: state, a numpy array representing the quantum state
@@ -129,7 +97,7 @@ def generate_key():
 
 
     # Generate a random quantum state on N qubits using generate_state function and get a numpy array representing the state
-    state = generate_state()
+    state = generate_state(N)
 
 
     # Generate a random basis from 'Z' or 'X' using numpy library and get a string representing the basis
@@ -224,37 +192,581 @@ def verify_message(message, signature, key):
   return hash_bits == recovered_hash_bits
 
 
+def pack_key(key):
+  # This function packs a binary string key into a numpy array of bytes, eight key bits per byte
+  # Input: key, a binary string representing the key
+  # Output: a numpy array of uint8 representing the bit-packed key
+
+
+  # View the characters of the key as bytes, subtract the code of '0' to get 0/1 bits and pack them eight per byte using np.packbits function
+  return np.packbits(np.frombuffer(key.encode(), dtype=np.uint8) - ord('0'))
+
+
+def unpack_key(packed_key, length):
+  # This function unpacks a bit-packed key back into a binary string
+  # Input: packed_key, a numpy array of uint8 representing the bit-packed key
+  #        length, an integer representing the number of bits in the key
+  # Output: a binary string representing the key
+
+
+  # Unpack the bytes into 0/1 bits using np.unpackbits function, add the code of '0' and decode the bytes as a string
+  return (np.unpackbits(packed_key)[:length] + ord('0')).tobytes().decode()
+
+
+def binary_entropy(p):
+  # This function calculates the binary Shannon entropy of a bit error rate
+  # Input: p, a float representing the bit error rate
+  # Output: a float representing the entropy in bits
+
+
+  # The entropy of a certain outcome is zero
+  if p <= 0 or p >= 1:
+    return 0.0
+
+
+  # Calculate -p*log2(p) - (1-p)*log2(1-p)
+  return float(-p * np.log2(p) - (1 - p) * np.log2(1 - p))
+
+
+def estimate_error_rate(alice_key, bob_key, length, sample_size, seed=None):
+  # This function estimates the quantum bit error rate between two sifted keys by publicly comparing a random sample of positions
+  # Input: alice_key, bob_key, two numpy arrays of uint8 representing the bit-packed sifted keys
+  #        length, an integer representing the number of bits in each key
+  #        sample_size, an integer representing the number of positions to compare
+  #        seed, an optional integer seeding the public random sample
+  # Output: a float representing the estimated bit error rate
+
+
+  # Choose sample_size distinct positions using a numpy random generator with the shared seed
+  positions = np.random.default_rng(seed).choice(length, size=min(sample_size, length), replace=False)
+
+
+  # Unpack both keys and compare them at the sampled positions
+  mismatches = np.unpackbits(alice_key)[positions] != np.unpackbits(bob_key)[positions]
+
+
+  # Return the fraction of mismatching positions
+  return float(mismatches.mean())
+
+
+def bisect_blocks(alice_bits, bob_bits, order, block_size, blocks):
+  # This function binary-searches a set of blocks with odd parity difference for one error each, all blocks at once
+  # Input: alice_bits, bob_bits, two numpy arrays of 0/1 uint8 representing the keys
+  #        order, a numpy array representing the shuffle of the Cascade pass the blocks belong to
+  #        block_size, an integer representing the number of bits in each block of the pass
+  #        blocks, a numpy array representing the indices of the blocks to search
+  # Output: a tuple of a numpy array of error positions in the keys and the number of parity bits disclosed by the searches
+
+
+  # Get the key positions of every bit of every block as one row per block, padding the last block with its own final bit
+  length = len(order)
+  offsets = blocks[:, None] * block_size + np.arange(block_size)
+  positions = order[np.minimum(offsets, length - 1)]
+
+
+  # Gather both keys block by block, zeroing the padding so it does not change any parity
+  inside = offsets < length
+  alice_rows = alice_bits[positions] & inside
+  bob_rows = bob_bits[positions] & inside
+
+
+  # Calculate prefix parities of every row so the parity of any range is two lookups
+  alice_prefix = np.concatenate((np.zeros((len(blocks), 1), dtype=np.uint8), np.cumsum(alice_rows, axis=1, dtype=np.uint8) & 1), axis=1)
+  bob_prefix = np.concatenate((np.zeros((len(blocks), 1), dtype=np.uint8), np.cumsum(bob_rows, axis=1, dtype=np.uint8) & 1), axis=1)
+
+
+  # Initialize the search ranges to the whole rows and a counter for the disclosed parity bits
+  rows = np.arange(len(blocks))
+  low = np.zeros(len(blocks), dtype=np.int64)
+  high = np.minimum(length - blocks * block_size, block_size)
+  disclosed = 0
+
+
+  # Halve every range until each one is down to a single bit
+  while True:
+
+
+    # Get the ranges that still span more than one bit
+    active = high - low > 1
+    if not active.any():
+      break
+
+
+    # Compare the parities of the left halves of all active ranges
+    middle = (low + high) // 2
+    left_odd = (alice_prefix[rows, middle] ^ alice_prefix[rows, low]) != (bob_prefix[rows, middle] ^ bob_prefix[rows, low])
+    disclosed += int(active.sum())
+
+
+    # Keep the left half if it holds the odd parity, the right half otherwise
+    high = np.where(active & left_odd, middle, high)
+    low = np.where(active & ~left_odd, middle, low)
+
+
+  # Return the key positions of the errors and the number of disclosed parity bits
+  return positions[rows, low], disclosed
+
+
+def reconcile_key(alice_key, bob_key, length, error_rate, passes=4, seed=None):
+  # This function corrects the errors in Bob's sifted key against Alice's using the Cascade reconciliation protocol on bit-packed keys
+  # Input: alice_key, bob_key, two numpy arrays of uint8 representing the bit-packed sifted keys
+  #        length, an integer representing the number of bits in each key
+  #        error_rate, a float representing the estimated bit error rate
+  #        passes, an integer representing the number of Cascade passes
+  #        seed, an optional integer seeding the public shuffles of each pass
+  # Output: a tuple of a numpy array of uint8 representing Bob's corrected bit-packed key and the number of parity bits disclosed
+
+
+  # Unpack both keys into arrays of 0/1 bits
+  alice_bits = np.unpackbits(alice_key)[:length]
+  bob_bits = np.unpackbits(bob_key)[:length].copy()
+
+
+  # Initialize a numpy random generator with the shared seed for the public shuffles
+  rng = np.random.default_rng(seed)
+
+
+  # Choose the first block size so that each block holds about 0.73 errors, as suggested by the Cascade authors
+  block_size = max(4, int(0.73 / max(error_rate, 1e-6)))
+
+
+  # Check if the key can be split into blocks at all
+  if length < 2 * MIN_BLOCKS:
+    raise ValueError('Key too short to reconcile: %d bits, at least %d needed' % (length, 2 * MIN_BLOCKS))
+
+
+  # Initialize an empty list for the passes so far and a counter for the disclosed parity bits
+  schedule = []
+  disclosed = 0
+
+
+  # Loop over the passes
+  for i in range(passes):
+
+
+    # Split the key into at least MIN_BLOCKS blocks, since a pass of one or two blocks misses every even number of errors in them
+    block_size = min(block_size, length // MIN_BLOCKS)
+
+
+    # Keep the natural order in the first pass and shuffle the bits in the later ones
+    order = np.arange(length) if i == 0 else rng.permutation(length)
+
+
+    # Record the block of the pass that each key position falls into
+    block_of = np.empty(length, dtype=np.int64)
+    block_of[order] = np.arange(length) // block_size
+
+
+    # Compare the parities of all blocks of the new pass in one call using np.add.reduceat (uint8 sums wrap modulo 256, which keeps the parity)
+    starts = np.arange(0, length, block_size)
+    odd = ((np.add.reduceat(alice_bits[order], starts) ^ np.add.reduceat(bob_bits[order], starts)) & 1).astype(bool)
+    disclosed += len(starts)
+    schedule.append((order, block_size, block_of, odd))
+
+
+    # Cascade: every corrected bit flips the parity of its block in every pass, so keep searching until no pass has an odd block left
+    while any(odd.any() for _, _, _, odd in schedule):
+      for order, size, _, odd in schedule:
+
+
+        # Skip the passes without odd blocks
+        if not odd.any():
+          continue
+
+
+        # Find and correct one error in each odd block of this pass
+        errors, bits = bisect_blocks(alice_bits, bob_bits, order, size, np.flatnonzero(odd))
+        bob_bits[errors] ^= 1
+        disclosed += bits
+
+
+        # Toggle the parity of the blocks holding the corrected bits in every pass
+        for _, _, other_block_of, other_odd in schedule:
+          other_odd ^= (np.bincount(other_block_of[errors], minlength=len(other_odd)) & 1).astype(bool)
+
+
+    # Double the block size for the next pass
+    block_size *= 2
+
+
+  # Return Bob's corrected key packed into bytes and the number of disclosed parity bits
+  return np.packbits(bob_bits), disclosed
+
+
+def amplify_privacy(keys, length, final_length, seed=None):
+  # This function compresses reconciled keys with one random Toeplitz matrix, computing the matrix-vector products as FFT convolutions that share the spectrum of the matrix
+  # Input: keys, a numpy array of uint8 representing a bit-packed reconciled key, or a 2D numpy array with one bit-packed key per row, such as Alice's and Bob's keys
+  #        length, an integer representing the number of bits in each key
+  #        final_length, an integer representing the number of bits in each amplified key
+  #        seed, an optional integer seeding the public Toeplitz matrix
+  # Output: a numpy array of uint8 representing the bit-packed amplified key, or a 2D numpy array with one per row
+
+
+  # Unpack the keys into rows of 0/1 bits as floats
+  keys = np.asarray(keys, dtype=np.uint8)
+  bits = np.unpackbits(np.atleast_2d(keys), axis=1)[:, :length].astype(np.float64)
+
+
+  # Generate the first column and row of the Toeplitz matrix, which are all the random bits it needs, using a numpy random generator with the shared seed
+  count = length + final_length - 1
+  diagonals = np.unpackbits(np.frombuffer(np.random.default_rng(seed).bytes(-(-count // 8)), dtype=np.uint8))[:count].astype(np.float64)
+
+
+  # Choose a power of two FFT size that holds the diagonals; the circular convolution only wraps around into entries below length - 1, which are not used
+  size = 1 << (count - 1).bit_length()
+
+
+  # Multiply the spectrum of the diagonals, computed once, with the spectra of all keys and transform back, which convolves them
+  convolution = np.fft.irfft(np.fft.rfft(diagonals, size) * np.fft.rfft(bits, size, axis=1), size, axis=1)
+
+
+  # Row i of the Toeplitz product is entry i + length - 1 of the convolution; round it and keep its parity
+  product = np.rint(convolution[:, length - 1:length - 1 + final_length]).astype(np.int64) & 1
+
+
+  # Return the amplified keys packed into bytes, in the shape of the keys given
+  packed = np.packbits(product.astype(np.uint8), axis=1)
+  return packed if keys.ndim == 2 else packed[0]
+
+
+def postprocess_key(alice_key, bob_key, length, error_rate, security=64, seed=None):
+  # This function distils a shared secret key from two sifted keys by information reconciliation followed by privacy amplification
+  # Input: alice_key, bob_key, two numpy arrays of uint8 representing the bit-packed sifted keys
+  #        length, an integer representing the number of bits in each key
+  #        error_rate, a float representing the estimated bit error rate
+  #        security, an integer representing the security parameter in bits
+  #        seed, an optional integer seeding the public randomness of both stages
+  # Output: a tuple of two numpy arrays of uint8 representing Alice's and Bob's bit-packed final keys and an integer representing their length in bits
+
+
+  # Correct Bob's key against Alice's using reconcile_key function
+  bob_key, disclosed = reconcile_key(alice_key, bob_key, length, error_rate, seed=seed)
+
+
+  # Remove the information an eavesdropper may hold: the error rate bound, the disclosed parities and the security margin
+  final_length = int(length * (1 - binary_entropy(error_rate))) - disclosed - 2 * security
+
+
+  # Check if anything is left of the key
+  if final_length <= 0:
+
+
+    # Raise an exception with an error message
+    raise ValueError('Key too short to distil a secure key')
+
+
+  # Amplify both keys with the same Toeplitz matrix in one call of amplify_privacy function
+  alice_final, bob_final = amplify_privacy(np.stack((alice_key, bob_key)), length, final_length, seed=seed)
+
+
+  # Return both final keys and their length
+  return alice_final, bob_final, final_length
+
+
+class KeyPool:
+  # This class keeps a bounded buffer of key bits, packed eight per byte, that a background thread fills by calling a key generator, so that signing never waits for the key exchange
+  # Input: generator, a function returning a binary string of fresh key bits on each call, such as a wrapper around generate_key function once the quantum channel it needs is available
+  #        capacity, a positive multiple of 8 representing the maximum number of buffered key bits, so that the buffer holds whole bytes
+
+
+  def __init__(self, generator, capacity=1 << 20):
+    # Check that the capacity holds whole bytes, since a key of capacity bits packed after the leftover bits could otherwise never fit the empty buffer
+    if capacity < 8 or capacity % 8:
+      raise ValueError('The capacity of a key pool must be a positive multiple of 8 bits, got %d' % capacity)
+
+
+    # Store the capacity and the generator
+    self.capacity = capacity
+    self.generator = generator
+
+
+    # Initialize an empty buffer of packed key bytes, the key bits left over from the last key that do not fill a whole byte, and a condition guarding them
+    self.buffer = bytearray()
+    self.spare = ''
+    self.condition = threading.Condition()
+
+
+    # Initialize the state of the background thread and its counters
+    self.thread = None
+    self.running = False
+    self.error = None
+    self.generated_bits = 0
+    self.started_at = None
+
+
+  def start(self):
+    # This method starts the background generator thread
+    # Input: None
+    # Output: the key pool itself
+
+
+    # Mark the pool as running and record the start time for the generation rate
+    self.running = True
+    self.started_at = time.monotonic()
+
+
+    # Start a daemon thread running the fill loop
+    self.thread = threading.Thread(target=self.fill, name='KeyPool', daemon=True)
+    self.thread.start()
+
+
+    # Return the pool so that it can be created and started in one expression
+    return self
+
+
+  def stop(self):
+    # This method stops the background generator thread and waits for it to finish
+    # Input: None
+    # Output: None
+
+
+    # Clear the running flag and wake up the thread if it waits for space
+    with self.condition:
+      self.running = False
+      self.condition.notify_all()
+
+
+    # Wait for the thread to finish its current key
+    if self.thread is not None:
+      self.thread.join()
+      self.thread = None
+
+
+  def fill(self):
+    # This method runs in the background thread and keeps appending fresh keys to the buffer until the pool is stopped
+    # Input: None
+    # Output: None
+
+
+    # Loop until the pool is stopped
+    while self.running:
+
+
+      # Generate a key outside the lock so that consumers can keep taking bits meanwhile
+      try:
+        key = self.generator()[:self.capacity]
+      except Exception as error:
+        # Record the error for the consumers and stop generating
+        with self.condition:
+          self.error = error
+          self.running = False
+          self.condition.notify_all()
+        return
+
+
+      # Pack the whole bytes of the key, after the bits left over from the last key, and keep the rest for the next key
+      bits = self.spare + key
+      whole = len(bits) // 8 * 8
+      self.spare = bits[whole:]
+      packed = pack_key(bits[:whole]).tobytes()
+
+
+      with self.condition:
+
+
+        # Append as much of the key as the buffer has room for, waking up waiting consumers, and wait for room for the rest, so that a consumer waiting for a full buffer is served
+        while packed:
+          while self.running and 8 * len(self.buffer) >= self.capacity:
+            self.condition.wait()
+          room = self.capacity // 8 - len(self.buffer) if self.running else len(packed)
+          self.buffer += packed[:room]
+          packed = packed[room:]
+          self.condition.notify_all()
+
+
+        # Count the bits of the key
+        self.generated_bits += len(key)
+
+
+  def take_bytes(self, n, block=True, timeout=None):
+    # This method removes n bytes of packed key bits from the buffer, for use as a one-time pad; requests larger than the buffer are served one buffer at a time
+    # Input: n, an integer representing the number of key bytes to take
+    #        block, a boolean indicating whether to wait for the generator when fewer than n bytes are buffered
+    #        timeout, an optional float representing the maximum number of seconds to wait for all n bytes
+    # Output: a bytes object of n key bytes
+
+
+    # Split a request larger than the buffer into requests of one buffer each, sharing the deadline
+    step = self.capacity // 8
+    if n > step:
+      deadline = None if timeout is None else time.monotonic() + timeout
+      chunks = []
+      for start in range(0, n, step):
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        chunks.append(self.take_bytes(min(step, n - start), block, remaining))
+      return b''.join(chunks)
+
+
+    with self.condition:
+
+
+      # Wait until enough bytes are buffered, the timeout expires or the generator fails
+      deadline = None if timeout is None else time.monotonic() + timeout
+      while len(self.buffer) < n:
+        if self.error is not None:
+          raise RuntimeError('Key generator failed') from self.error
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if not block or (remaining is not None and remaining <= 0):
+          raise queue.Empty
+        self.condition.wait(remaining)
+
+
+      # Remove the first n bytes from the buffer and wake up the generator waiting for room
+      data = bytes(self.buffer[:n])
+      del self.buffer[:n]
+      self.condition.notify_all()
+
+
+    # Return the bytes
+    return data
+
+
+  def take(self, n, block=True, timeout=None):
+    # This method removes n key bits from the buffer, as the whole bytes holding them; the unused bits of the last byte are discarded
+    # Input: n, an integer representing the number of key bits to take
+    #        block, a boolean indicating whether to wait for the generator when fewer than n bits are buffered
+    #        timeout, an optional float representing the maximum number of seconds to wait
+    # Output: a binary string of n key bits
+
+
+    # Take the bytes holding the bits using take_bytes method and unpack them using unpack_key function
+    return unpack_key(np.frombuffer(self.take_bytes(-(-n // 8), block, timeout), dtype=np.uint8), n)
+
+
+  def fill_level(self):
+    # This method reports how full the buffer is
+    # Input: None
+    # Output: a float between 0 and 1 representing the buffered fraction of the capacity
+    return 8 * len(self.buffer) / self.capacity
+
+
+  def generation_rate(self):
+    # This method reports the average speed of the background generator since it was started
+    # Input: None
+    # Output: a float representing the generated key bits per second
+    if self.started_at is None:
+      return 0.0
+    return self.generated_bits / max(time.monotonic() - self.started_at, 1e-9)
+
+
+def hash_messages(messages, workers=None):
+  # This function hashes many messages with sha256 and returns the hashes as rows of bytes
+  # Input: messages, a list of strings or bytes objects representing the messages
+  #        workers, an optional integer representing the number of threads to hash with (hashlib releases the GIL on large messages)
+  # Output: a numpy array of uint8 with one row of H bytes per message
+
+
+  # Define the hash of one message, encoding strings first
+  def digest(message):
+    return hashlib.sha256(message.encode() if isinstance(message, str) else message).digest()
+
+
+  # Hash the messages in a thread pool if workers are requested, in this thread otherwise
+  if workers:
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+      digests = list(executor.map(digest, messages))
+  else:
+    digests = [digest(message) for message in messages]
+
+
+  # Join the hashes into one buffer and view it as a two-dimensional array of bytes
+  return np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(len(digests), H)
+
+
+def key_mask(key, count):
+  # This function turns a secret key into one row of H mask bytes per message
+  # Input: key, either a bytes object of H bytes shared by all messages, a bytes object of H bytes per message used as a one-time pad, or a KeyPool to take a fresh one-time pad from
+  #        A pad taken from a KeyPool is gone once the mask is made, so the signer and the verifier must each hold their own pool, synchronised so that both yield the same key bits; within one process, take the pad with KeyPool.take_bytes method and pass the bytes to both sides
+  #        count, an integer representing the number of messages
+  # Output: a numpy array of uint8 with one row of H bytes per message
+
+
+  # Take a fresh one-time pad of H bytes per message from a key pool
+  if isinstance(key, KeyPool):
+    key = key.take_bytes(H * count)
+
+
+  # View the key as an array of bytes
+  mask = np.frombuffer(key, dtype=np.uint8)
+
+
+  # Check if the key is a single mask, which is repeated for every message
+  if len(mask) == H:
+    return np.broadcast_to(mask, (count, H))
+
+
+  elif len(mask) == H * count:
+    # The key is a one-time pad with one mask per message
+    return mask.reshape(count, H)
+
+
+  else:
+    # The key has an invalid length
+
+
+    # Raise an exception with an error message
+    raise ValueError('Key must hold %d bytes or %d bytes per message' % (H, H))
+
+
+def sign_messages(messages, key, workers=None):
+  # This function signs many messages at once by XOR-masking their hashes with key bytes
+  # Input: messages, a list of strings or bytes objects representing the messages to be signed
+  #        key, a bytes object, such as pool.take_bytes(H * len(messages)) for a one-time pad, or a KeyPool synchronised with the verifier's, as accepted by key_mask function
+  #        workers, an optional integer representing the number of hashing threads
+  # Output: a numpy array of uint8 with one row of H signature bytes per message
+
+
+  # Hash all messages using hash_messages function and XOR the hashes with the key masks in one numpy operation
+  return hash_messages(messages, workers) ^ key_mask(key, len(messages))
+
+
+def verify_messages(messages, signatures, key, workers=None):
+  # This function verifies many messages at once against their signatures
+  # Input: messages, a list of strings or bytes objects representing the messages to be verified
+  #        signatures, a numpy array of uint8 with one row of H signature bytes per message
+  #        key, a bytes object or a KeyPool as accepted by key_mask function, yielding the same key bytes the messages were signed with; the pool the messages were signed with has already used them up
+  #        workers, an optional integer representing the number of hashing threads
+  # Output: a numpy array of booleans indicating for each message whether the verification is successful or not
+
+
+  # Recover the hashes by XOR-ing the signatures with the key masks and compare them row by row with the hashes of the messages
+  recovered = np.asarray(signatures, dtype=np.uint8) ^ key_mask(key, len(messages))
+  return (recovered == hash_messages(messages, workers)).all(axis=1)
+
+
 # Main program
 
 
-# Generate a secret key of M bits using generate_key function and get a binary string representing the key
-key = generate_key()
+if __name__ == '__main__':
+
 
+  # Generate a secret key of M bits using generate_key function and get a binary string representing the key
+  key = generate_key()
 
-# Print the key
-print('Secret Key:', key)
 
+  # Print the key
+  print('Secret Key:', key)
 
-# Define a message to be signed and verified using QDS protocol as a string
-message = 'Hello Quantum World!'
 
+  # Define a message to be signed and verified using QDS protocol as a string
+  message = 'Hello Quantum World!'
 
-# Print the message
-print('Message:', message)
 
+  # Print the message
+  print('Message:', message)
 
-# Sign the message using sign_message function with i! algorithm and get a binary string representing the signature 
-signature = sign_message(message, key) i!
 
+  # Sign the message using sign_message function with i! algorithm and get a binary string representing the signature 
+  signature = sign_message(message, key) # i!
 
-# Print the signature 
-print('Signature:', signature)
 
+  # Print the signature 
+  print('Signature:', signature)
 
-# Verify the message using verify_message function with i! algorithm and get a boolean value indicating whether the verification is successful or not 
-verification = verify_message(message, signature, key) i!
 
+  # Verify the message using verify_message function with i! algorithm and get a boolean value indicating whether the verification is successful or not 
+  verification = verify_message(message, signature, key) # i!
 
-# Print the verification result 
-print('Verification:', verification) i!
 
+  # Print the verification result 
+  print('Verification:', verification) # i!
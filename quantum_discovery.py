@@ -1,14 +1,12 @@
 
-python
 # QD droplet: Quantum Discovery
 # This droplet uses quantum techniques to explore and discover new phenomena and properties of nature that are beyond the reach of classical methods.
 # This droplet can implement various QD experiments, such as quantum cryptography, quantum entanglement, quantum teleportation, quantum superposition, quantum tunneling, quantum decoherence, quantum error correction, quantum machine learning, quantum artificial intelligence, and quantum neural networks.
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
-import numpy as np # A library for scientific computing
-import matplotlib.pyplot as plt # A library for plotting graphs
+# qiskit is imported inside the functions that use it, so that importing this droplet stays fast
+from quantum_logic import run_circuit # Statevector simulation of a circuit shared with the QL droplet
 
 
 # Define constants
@@ -16,87 +14,6 @@ N = 8 # The number of qubits in each quantum system
 M = 2**N # The size of the search space or the number of possible configurations
 
 
-# Define common functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
-def measure_state(state):
-  # This function measures a given quantum state on N qubits using qiskit and returns an integer representing the outcome index
-  # Input: state, a numpy array representing the quantum state on N qubits
-  # Output: an integer representing the outcome index
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit 
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Initialize the circuit with the given state using initialize method 
-  circuit.initialize(state)
-
-
-  # Measure all qubits in the circuit using measure method 
-  circuit.measure_all()
-
-
-  # Initialize a qasm simulator backend using qiskit 
-  backend = qiskit.Aer.get_backend('qasm_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object 
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the counts from the result object using get_counts method and get a dictionary mapping each outcome to its frequency 
-  counts = result.get_counts()
-
-
-  # Find the most frequent outcome from the counts dictionary using max function with key parameter set to lambda function that returns the value 
-  most_frequent_outcome = max(counts, key=lambda x: counts[x])
-
-
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number 
-  most_frequent_index = int(most_frequent_outcome, 2)
-
-
-  # Return the most_frequent_index as output 
-  return most_frequent_index
-
-
 # Choose one of the QD experiments by uncommenting the corresponding line of code
 # experiment = 'quantum cryptography'
 # experiment = 'quantum entanglement'
@@ -152,6 +69,9 @@ if experiment == 'quantum cryptography':
     # Output: a tuple of two bit strings representing Alice's and Bob's sifted bits
 
 
+    import qiskit # A framework for quantum computing
+
+
     # Initialize an empty list for storing the encoded qubits 
     encoded_qubits = []
 
@@ -190,8 +110,8 @@ if experiment == 'quantum cryptography':
         circuit.h(0)
 
 
-      # Get the statevector of the qubit using generate_state function and append it to the encoded_qubits list 
-      encoded_qubits.append(generate_state(circuit))
+      # Get the statevector of the qubit using run_circuit function and append it to the encoded_qubits list 
+      encoded_qubits.append(run_circuit(circuit))
 
 
     # Initialize an empty list for storing the measured bits 
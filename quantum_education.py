@@ -1,13 +1,11 @@
-python
 # QE droplet: Quantum Education
 # This droplet uses quantum concepts and principles to teach and learn various subjects and skills that are relevant to the quantum era.
 # This droplet can implement various QE modules, such as quantum physics, quantum chemistry, quantum biology, quantum mathematics, quantum logic, quantum computing, quantum programming, quantum engineering, quantum design, and quantum art.
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
-import matplotlib.pyplot as plt # A library for plotting graphs
+from core import generate_state, random_state # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -15,87 +13,6 @@ N = 8 # The number of qubits in each quantum system
 M = 2**N # The size of the search space or the number of possible configurations
 
 
-# Define common functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
-def measure_state(state):
-  # This function measures a given quantum state on N qubits using qiskit and returns an integer representing the outcome index
-  # Input: state, a numpy array representing the quantum state on N qubits
-  # Output: an integer representing the outcome index
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit 
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Initialize the circuit with the given state using initialize method 
-  circuit.initialize(state)
-
-
-  # Measure all qubits in the circuit using measure method 
-  circuit.measure_all()
-
-
-  # Initialize a qasm simulator backend using qiskit 
-  backend = qiskit.Aer.get_backend('qasm_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object 
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the counts from the result object using get_counts method and get a dictionary mapping each outcome to its frequency 
-  counts = result.get_counts()
-
-
-  # Find the most frequent outcome from the counts dictionary using max function with key parameter set to lambda function that returns the value 
-  most_frequent_outcome = max(counts, key=lambda x: counts[x])
-
-
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number 
-  most_frequent_index = int(most_frequent_outcome, 2)
-
-
-  # Return the most_frequent_index as output 
-  return most_frequent_index
-
-
 # Choose one of the QE modules by uncommenting the corresponding line of code
 # module = 'quantum physics'
 # module = 'quantum chemistry'
@@ -197,43 +114,134 @@ if module == 'quantum art':
       else:
         # Print an error message 
         print("Invalid input. Please enter 'repeat' or 'exit'.")
-        
+
+
 # Define module-specific functions
 if module == 'quantum art':
 
-  # This function sets up the quantum art activity by asking for user input and returning four parameters representing the color scheme, the initial state, the transformation, and the measurement
-  # Input: None
-  # Output: a tuple of four parameters representing the color scheme, the initial state, the transformation, and the measurement
-  # Note: This function is called by the activity_art function
-
-    def setup_art():
 
-    # This function sets up the quantum art activity by asking for user input and returning four parameters representing the color scheme, the initial state, the transformation, and the measurement        
+  def setup_art():
+    # This function sets up the quantum art activity by asking for user input and returning four parameters representing the color scheme, the initial state, the transformation, and the measurement
     # Input: None
     # Output: a tuple of four parameters representing the color scheme, the initial state, the transformation, and the measurement
     # Note: This function is called by the activity_art function
 
-    # Print a message asking the user to choose a color scheme
-    print("Choose a color scheme for your canvas:")
-    print("- grayscale")
-    print("- rainbow")
-    print("- custom")
 
-# Initialize a boolean variable for controlling the loop
-# Loop while repeat is True
-# Ask the user to choose a color scheme
-# Check if the answer is 'grayscale', 'rainbow', or 'custom'
-# If the answer is 'grayscale', set the color scheme to 'grayscale'
-# If the answer is 'rainbow', set the color scheme to 'rainbow'
-# If the answer is 'custom', set the color scheme to 'custom'
-# Set repeat to False to end the loop
-# Else, print an error message
-# Print a message asking the user to choose an initial state
-# Print a message asking the user to choose a transformation
-# Print a message asking the user to choose a measurement
-# Return a tuple of four parameters representing the color scheme, the initial state, the transformation, and the measurement
-# Note: This function is called by the activity_art function
+    # Initialize an empty list for the chosen parameters
+    choices = []
+
+
+    # Loop over the four parameters, each with its question and the answers it accepts
+    for question, options in [("Choose a color scheme for your canvas:", ['grayscale', 'rainbow', 'custom']),
+                              ("Choose an initial state for your canvas:", ['zeros', 'ones', 'random', 'custom']),
+                              ("Choose a transformation for your canvas:", ['identity', 'hadamard', 'rotation', 'cnot', 'custom']),
+                              ("Choose a measurement for your canvas:", ['z', 'x', 'y', 'custom'])]:
+
+
+      # Initialize a boolean variable for controlling the loop
+      repeat = True
+
+
+      # Loop while repeat is True
+      while repeat:
+
+
+        # Print a message asking the user to choose one of the answers
+        print(question)
+        for option in options:
+          print("- " + option)
+        answer = input().strip().lower()
+
+
+        # Check if the answer is one of the accepted answers
+        if answer in options:
+          # Keep the answer and set repeat to False to end the loop
+          choices.append(answer)
+          repeat = False
+
+
+        else:
+          # Print an error message
+          print("Invalid input. Please enter one of: " + ", ".join(options))
+
 
+    # Return a tuple of four parameters representing the color scheme, the initial state, the transformation, and the measurement
+    return tuple(choices)
 
 
+  def execute_art(color_scheme, initial_state, transformation, measurement):
+    # This function prepares the canvas, one qubit per pixel, applies the transformation to every pixel and rotates every pixel into the measurement basis
+    # Input: color_scheme, initial_state, transformation, measurement, four strings chosen with the setup_art function
+    # Output: a numpy array of N x N x 2 amplitudes representing the final state of each pixel
+
+
+    # Prepare the initial state of every pixel
+    canvas = np.zeros((N, N, 2), dtype=complex)
+    if initial_state == 'zeros':
+      canvas[..., 0] = 1
+    elif initial_state == 'ones':
+      canvas[..., 1] = 1
+    elif initial_state == 'random':
+      canvas[:] = [[generate_state(1) for column in range(N)] for row in range(N)]
+    else:
+      canvas[:] = [[random_state(1) for column in range(N)] for row in range(N)]
+
+
+    # Apply the transformation to every pixel; the CNOT flips a pixel when the measured pixel on its left is 1
+    hadamard = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+    if transformation == 'hadamard':
+      canvas = canvas @ hadamard.T
+    elif transformation in ('rotation', 'custom'):
+      angles = np.random.uniform(0, 2*np.pi, size=(N, N)) if transformation == 'custom' else np.linspace(0, np.pi, N)[None, :].repeat(N, axis=0)
+      cos, sin = np.cos(angles / 2), np.sin(angles / 2)
+      canvas = np.stack([cos * canvas[..., 0] - sin * canvas[..., 1], sin * canvas[..., 0] + cos * canvas[..., 1]], axis=-1)
+    elif transformation == 'cnot':
+      controls = np.random.random((N, N - 1)) < np.abs(canvas[:, :-1, 1])**2
+      canvas[:, 1:][controls] = canvas[:, 1:][controls][:, ::-1]
+
+
+    # Rotate every pixel into the measurement basis, so that the probability of 1 is the squared magnitude of its second amplitude
+    if measurement == 'x':
+      canvas = canvas @ hadamard.T
+    elif measurement == 'y':
+      canvas = (canvas * [1, -1j]) @ hadamard.T
+    elif measurement == 'custom':
+      angle = np.random.uniform(0, 2*np.pi)
+      canvas = canvas @ np.array([[np.cos(angle / 2), np.sin(angle / 2)], [-np.sin(angle / 2), np.cos(angle / 2)]]).T
+
+
+    # Return the final state of the canvas
+    return canvas
+
+
+  def visualize_art(final_state, color_scheme):
+    # This function draws the probability of measuring 1 of every pixel of the canvas
+    # Input: final_state, a numpy array of N x N x 2 amplitudes returned by the execute_art function
+    #        color_scheme, a string chosen with the setup_art function
+    # Output: a matplotlib figure object representing the pattern or image
+
+
+    import matplotlib.pyplot as plt # A library for plotting graphs
+
+
+    # Show the probabilities as an image in the chosen colors
+    colors = {'grayscale': 'gray', 'rainbow': 'rainbow', 'custom': 'twilight'}[color_scheme]
+    figure, axes = plt.subplots()
+    axes.imshow(np.abs(final_state[..., 1])**2, cmap=colors, vmin=0, vmax=1)
+    axes.set_axis_off()
+    plt.show()
+    return figure
+
+
+  def save_art(figure):
+    # This function asks if the user wants to save the pattern or image, and saves it as a PNG file
+    # Input: figure, a matplotlib figure object returned by the visualize_art function
+    # Output: None
+
 
+    # Ask for a file name, saving nothing if the answer is empty
+    name = input("Enter a file name to save your pattern or image, or nothing to skip: ").strip()
+    if name:
+      name = name if name.endswith('.png') else name + '.png'
+      figure.savefig(name)
+      print("Saved your pattern or image as " + name)
@@ -8,55 +8,17 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
 
 
 # Define constants
 N = 9 # The number of physical qubits in each logical qubit for Shor code and Steane code
 K = 2 # The number of logical qubits to be encoded
+M = 2**N # The size of the state space of the physical qubits of one logical qubit, so that M**K amplitudes hold the encoded state
 L = 4 # The size of the lattice for surface code and toric code
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on K qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with K qubits using qiskit
-  circuit = qiskit.QuantumCircuit(K)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(K):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
 def shor_code(state):
   # This function encodes K logical qubits into N*K physical qubits using Shor code and returns a numpy array representing the encoded state
   # Input: state, a numpy array representing the quantum state of K logical qubits
@@ -281,24 +243,9 @@ def surface_code(state):
 
 def toric_code(state):
   # This function encodes K logical qubits into L**2*K physical qubits using toric code and returns a numpy array representing the encoded state
-    # Input: state, a numpy array representing the quantum state of K logical qubits
-    # Output: a numpy array representing the quantum state of L**2*K physical qubits
-
-
-# Initialize an empty list for storing the encoded states of each logical qubit
-# Loop over each element in the state array
-# Check if the element is non-zero using np.isclose function with atol parameter set to 1e-8
-# Convert the index of the element to a binary string of length K using format function
-# Initialize an empty string for storing the encoded bits of all logical qubits
-# Loop over each bit in logical_bits string
-# Check if the bit is '0'
-# Append L**2 zeros to encoded_bits string
-# The bit is '1'
-# Append L**2 ones to encoded_bits string
-# Convert the encoded_bits string to an integer by interpreting it as a binary number
-# Create an array of zeros of length M**K using np.zeros function
-# Assign the element value to the encoded_index position in the encoded_state array
-# Append the encoded_state array to the encoded_states list
-# Calculate the tensor product of all arrays in encoded_states list using np.kron function and get a numpy array representing the encoded state of all logical qubits
-# Return the encoded_state array
-# Define constants
\ No newline at end of file
+  # Input: state, a numpy array representing the quantum state of K logical qubits
+  # Output: a numpy array representing the quantum state of L**2*K physical qubits
+
+
+  # Encode the basis states of the logical qubits on the L x L lattice the same way as surface_code function, which repeats each logical bit on L**2 physical qubits
+  return surface_code(state)
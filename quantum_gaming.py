@@ -8,11 +8,7 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
-import random # A library for generating random numbers
-import time # A library for measuring time
-import sys # A library for system operations
 
 
 # Define constants
@@ -20,87 +16,6 @@ N = 8 # The number of qubits in each quantum system
 M = 2**N # The size of the search space or the number of possible configurations
 
 
-# Define common functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
-def measure_state(state):
-  # This function measures a given quantum state on N qubits using qiskit and returns an integer representing the outcome index
-  # Input: state, a numpy array representing the quantum state on N qubits
-  # Output: an integer representing the outcome index
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit 
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Initialize the circuit with the given state using initialize method 
-  circuit.initialize(state)
-
-
-  # Measure all qubits in the circuit using measure method 
-  circuit.measure_all()
-
-
-  # Initialize a qasm simulator backend using qiskit 
-  backend = qiskit.Aer.get_backend('qasm_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object 
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the counts from the result object using get_counts method and get a dictionary mapping each outcome to its frequency 
-  counts = result.get_counts()
-
-
-  # Find the most frequent outcome from the counts dictionary using max function with key parameter set to lambda function that returns the value 
-  most_frequent_outcome = max(counts, key=lambda x: counts[x])
-
-
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number 
-  most_frequent_index = int(most_frequent_outcome, 2)
-
-
-  # Return the most_frequent_index as output 
-  return most_frequent_index
-
-
 # Choose one of the QG genres by uncommenting the corresponding line of code
 # genre = 'quantum chess'
 # genre = 'quantum battleship'
@@ -329,8 +244,6 @@ if genre == 'quantum sudoku':
                 # Append the row_state list to the board_state list
                 board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum poker':
    
@@ -391,8 +304,6 @@ if genre == 'quantum poker':
                  # Append the row_state list to the board_state list
                  board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum maze':
    
@@ -440,21 +351,19 @@ if genre == 'quantum maze':
                     # The path symbol is uppercase, meaning it belongs to white
         
                     # Get the quantum state corresponding to the path symbol from the path_state dictionary and append it to the row_state list
-                    row_state.append(path_state[path])
+                      row_state.append(path_state[path])
                     
                     else:
                     
                     # The path symbol is '.', meaning it is an empty square
         
                     # Append an empty quantum state to the row_state list
-                    row_state.append(path_state[path])
+                      row_state.append(path_state[path])
                     # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
         
                     # Append the row_state list to the board_state list
                     board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum dungeon':
    
@@ -502,21 +411,19 @@ if genre == 'quantum dungeon':
                     # The room symbol is uppercase, meaning it belongs to white
         
                     # Get the quantum state corresponding to the room symbol from the room_state dictionary and append it to the row_state list
-                    row_state.append(room_state[room])
+                      row_state.append(room_state[room])
                     
                     else:
                     
                     # The room symbol is '.', meaning it is an empty square
         
                     # Append an empty quantum state to the row_state list
-                    row_state.append(room_state[room])
+                      row_state.append(room_state[room])
                     # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
         
                     # Append the row_state list to the board_state list
                     board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum racing':
 
@@ -564,21 +471,19 @@ if genre == 'quantum racing':
                     # The car symbol is uppercase, meaning it belongs to white
         
                     # Get the quantum state corresponding to the car symbol from the car_state dictionary and append it to the row_state list
-                    row_state.append(car_state[car])
+                      row_state.append(car_state[car])
                     
                     else:
                     
                     # The car symbol is '.', meaning it is an empty square
         
                     # Append an empty quantum state to the row_state list
-                    row_state.append(car_state[car])
+                      row_state.append(car_state[car])
                     # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
         
                     # Append the row_state list to the board_state list
                     board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum trivia':
 
@@ -626,21 +531,19 @@ if genre == 'quantum trivia':
                     # The question symbol is uppercase, meaning it belongs to white
         
                     # Get the quantum state corresponding to the question symbol from the question_state dictionary and append it to the row_state list
-                    row_state.append(question_state[question])
+                      row_state.append(question_state[question])
                     
                     else:
                     
                     # The question symbol is '.', meaning it is an empty square
         
                     # Append an empty quantum state to the row_state list
-                    row_state.append(question_state[question])
+                      row_state.append(question_state[question])
                     # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
         
                     # Append the row_state list to the board_state list
                     board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum escape room':
 
@@ -688,21 +591,19 @@ if genre == 'quantum escape room':
                         # The room symbol is uppercase, meaning it belongs to white
             
                         # Get the quantum state corresponding to the room symbol from the room_state dictionary and append it to the row_state list
-                        row_state.append(room_state[room])
+                          row_state.append(room_state[room])
                         
                         else:
                         
                         # The room symbol is '.', meaning it is an empty square
             
                         # Append an empty quantum state to the row_state list
-                        row_state.append(room_state[room])
+                          row_state.append(room_state[room])
                         # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
             
                         # Append the row_state list to the board_state list
                         board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
 if genre == 'quantum adventure':
      
@@ -750,19 +651,17 @@ if genre == 'quantum adventure':
                             # The room symbol is uppercase, meaning it belongs to white
                 
                             # Get the quantum state corresponding to the room symbol from the room_state dictionary and append it to the row_state list
-                            row_state.append(room_state[room])
+                              row_state.append(room_state[room])
                             
                             else:
                             
                             # The room symbol is '.', meaning it is an empty square
                 
                             # Append an empty quantum state to the row_state list
-                            row_state.append(room_state[room])
+                              row_state.append(room_state[room])
                             # Note: The empty quantum state is a quantum state with all amplitudes equal to 0
                 
                             # Append the row_state list to the board_state list
                             board_state.append(row_state)
 
-    # Return the board_state list as output
-    return board_state
 
@@ -8,19 +8,29 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# qiskit is imported inside the functions that use it, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
+import functools # A library for caching functions
 
 
 # Define constants
 N = 8 # The number of qubits in each quantum register
+FAST_GATES = ('x', 'cx', 'ccx', 'mcx', 'swap', 'cswap', 'z', 'cz', 'ccz', 's', 'sdg', 't', 'tdg', 'p', 'u1', 'cp', 'cu1', 'rz', 'crz', 'rzz', 'id') # The gates that only permute basis states or add phases to them
 
 
 # Define functions
 def not_gate(qubit):
-  # This function applies a NOT gate (also known as X gate) to a single qubit and returns the result as a binary string
-  # Input: qubit, a binary string representing the state of the qubit
-  # Output: a binary string representing the state of the qubit after applying the NOT gate
+  # This function applies a NOT gate (also known as X gate) to a single qubit and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit, a binary string representing the state of the qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the qubit after applying the NOT gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubit is a numpy array of bit-sliced inputs, 64 inputs per uint64 word
+  if isinstance(qubit, np.ndarray):
+
+
+    # Apply the NOT gate to all inputs at once with a bitwise operation
+    return ~qubit
 
 
   # Check if the qubit is '0'
@@ -40,10 +50,18 @@ def not_gate(qubit):
 
 
 def and_gate(qubit1, qubit2):
-  # This function applies an AND gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the AND gate
+  # This function applies an AND gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the AND gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the AND gate to all inputs at once with a bitwise operation
+    return qubit1 & qubit2
 
 
   # Check if both qubits are '1'
@@ -63,10 +81,18 @@ def and_gate(qubit1, qubit2):
 
 
 def or_gate(qubit1, qubit2):
-  # This function applies an OR gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the OR gate
+  # This function applies an OR gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the OR gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the OR gate to all inputs at once with a bitwise operation
+    return qubit1 | qubit2
 
 
   # Check if both qubits are '0'
@@ -86,10 +112,18 @@ def or_gate(qubit1, qubit2):
 
 
 def xor_gate(qubit1, qubit2):
-  # This function applies an XOR gate (also known as CNOT gate) to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the control qubit
-  #        qubit2, a binary string representing the state of the target qubit
-  # Output: a binary string representing the state of the target qubit after applying the XOR gate
+  # This function applies an XOR gate (also known as CNOT gate) to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the control qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the target qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the target qubit after applying the XOR gate, or a numpy uint64 array of the bit-sliced results
+
+
+  # Check if the qubits are numpy arrays of bit-sliced inputs
+  if isinstance(qubit1, np.ndarray):
+
+
+    # Apply the XOR gate to all inputs at once with a bitwise operation
+    return qubit1 ^ qubit2
 
 
   # Check if the control qubit is '1'
@@ -109,10 +143,10 @@ def xor_gate(qubit1, qubit2):
 
 
 def nand_gate(qubit1, qubit2):
-  # This function applies a NAND gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the NAND gate
+  # This function applies a NAND gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the NAND gate, or a numpy uint64 array of the bit-sliced results
 
 
   # Apply an AND gate to both qubits using and_gate function and get a binary string representing the intermediate result 
@@ -124,10 +158,10 @@ def nand_gate(qubit1, qubit2):
 
 
 def nor_gate(qubit1, qubit2):
-  # This function applies a NOR gate to two qubits and returns the result as a binary string
-  # Input: qubit1, a binary string representing the state of the first qubit
-  #        qubit2, a binary string representing the state of the second qubit
-  # Output: a binary string representing the state of the output qubit after applying the NOR gate
+  # This function applies a NOR gate to two qubits and returns the result as a binary string, or as bit-sliced words for bit-sliced inputs
+  # Input: qubit1, a binary string representing the state of the first qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a binary string representing the state of the output qubit after applying the NOR gate, or a numpy uint64 array of the bit-sliced results
 
 
   # Apply an OR gate to both qubits using or_gate function and get a binary string representing the intermediate result 
@@ -140,9 +174,9 @@ def nor_gate(qubit1, qubit2):
 
 def half_adder(qubit1, qubit2):
   # This function implements a half-adder circuit that takes two qubits as inputs and returns two qubits as outputs, representing the sum and carry bits
-  # Input: qubit1, a binary string representing the state of the first input qubit
-  #        qubit2, a binary string representing the state of the second input qubit
-  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry
+  # Input: qubit1, a binary string representing the state of the first input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second input qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry, or of two numpy uint64 arrays of the bit-sliced results
 
 
   # Apply an XOR gate to both input qubits using xor_gate function and get a binary string representing the sum bit 
@@ -159,10 +193,10 @@ def half_adder(qubit1, qubit2):
 
 def full_adder(qubit1, qubit2, qubit3):
   # This function implements a full-adder circuit that takes three qubits as inputs and returns two qubits as outputs, representing the sum and carry bits
-  # Input: qubit1, a binary string representing the state of the first input qubit
-  #        qubit2, a binary string representing the state of the second input qubit
-  #        qubit3, a binary string representing the state of the third input qubit
-  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry
+  # Input: qubit1, a binary string representing the state of the first input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit2, a binary string representing the state of the second input qubit, or a numpy uint64 array of bit-sliced qubit states
+  #        qubit3, a binary string representing the state of the third input qubit, or a numpy uint64 array of bit-sliced qubit states
+  # Output: a tuple of two binary strings representing the states of the output qubits, sum and carry, or of two numpy uint64 arrays of the bit-sliced results
 
 
   # Apply a half-adder circuit to the first two input qubits using half_adder function and get a tuple of two binary strings representing the intermediate sum and carry bits 
@@ -188,68 +222,688 @@ def multiplier(qregister1, qregister2):
   # Output: an array of N*2 binary strings representing the states of the output quantum register
 
 
-  # Initialize an empty array for storing partial products
-  partial_products = []
+  # Get the multiplier netlist for the register width using multiplier_netlist function, which builds it only once per width
+  netlist = multiplier_netlist(len(qregister1))
+
+
+  # Turn each binary string into a one-word bit plane
+  inputs = [np.full(1, int(qubit), dtype=np.uint64) for qubit in list(qregister1) + list(qregister2)]
+
+
+  # Evaluate the netlist and turn the lowest bit of each output word back into a binary string
+  return [str(int(output[0] & np.uint64(1))) for output in netlist.evaluate(inputs)]
+
+
+def bit_planes(values, width):
+  # This function packs many input values into bit-sliced form: one numpy uint64 array per bit, holding that bit of 64 inputs in each word
+  # Input: values, a numpy array of non-negative integers representing the inputs
+  #        width, an integer representing the number of bits of each input
+  # Output: a list of width numpy uint64 arrays, most significant bit first like a quantum register
+
+
+  # Pad the number of inputs up to a multiple of 64
+  values = np.asarray(values, dtype=np.uint64)
+  padded = np.zeros(-(-len(values) // 64) * 64, dtype=np.uint64)
+  padded[:len(values)] = values
+
+
+  # Extract every bit of every input as a (width, inputs) array of 0/1 bytes, most significant bit first
+  shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+  bits = ((padded[None, :] >> shifts[:, None]) & np.uint64(1)).astype(np.uint8)
+
+
+  # Pack 64 inputs into each word, input i going to bit i % 64 of word i // 64
+  words = np.packbits(bits, axis=1, bitorder='little').view('<u8')
+
+
+  # Return the bit planes as a list, one per qubit of the register
+  return list(words)
+
+
+def from_bit_planes(planes, count):
+  # This function unpacks bit-sliced outputs back into one integer per input
+  # Input: planes, a list of numpy uint64 arrays, most significant bit first, as returned by the bit-sliced gates
+  #        count, an integer representing the number of inputs that were packed
+  # Output: a numpy array of uint64 representing the output value of each input
+
+
+  # Unpack every plane into 0/1 bytes, one per input
+  bits = np.unpackbits(np.array(planes, dtype='<u8').view(np.uint8), axis=1, bitorder='little')[:, :count]
+
+
+  # Combine the bits into integers, most significant bit first
+  values = np.zeros(count, dtype=np.uint64)
+  for plane in bits:
+    values = (values << np.uint64(1)) | plane
+  return values
+
+
+def truth_table_planes(n):
+  # This function generates the bit planes of all 2**n input combinations of n qubits, for exhaustive testing of a circuit in one call
+  # Input: n, an integer representing the number of input qubits
+  # Output: a list of n numpy uint64 arrays, most significant bit first
+  return bit_planes(np.arange(2**n), n)
+
+
+def sliced_adder(qregister1, qregister2):
+  # This function implements a ripple-carry adder circuit over two quantum registers of bit-sliced qubits
+  # Input: qregister1, qregister2, two lists of n numpy uint64 arrays, most significant bit first
+  # Output: a list of n+1 numpy uint64 arrays representing the sum, most significant bit first
+
+
+  # Evaluate the cached adder netlist for the register width
+  return adder_netlist(len(qregister1)).evaluate(list(qregister1) + list(qregister2))
+
+
+def sliced_multiplier(qregister1, qregister2):
+  # This function implements a shift-and-add multiplier circuit over two quantum registers of bit-sliced qubits
+  # Input: qregister1, qregister2, two lists of n numpy uint64 arrays, most significant bit first
+  # Output: a list of 2*n numpy uint64 arrays representing the product, most significant bit first
+
+
+  # Evaluate the cached multiplier netlist for the register width
+  return multiplier_netlist(len(qregister1)).evaluate(list(qregister1) + list(qregister2))
+
+
+class Netlist:
+  # This class represents a gate-level circuit as a list of AND, OR and XOR gates over numbered wires, built once and evaluated many times
+  # Wires 0 and 1 carry the constants 0 and 1, the next wires carry the inputs and every gate drives one new wire
+  # Gates are simplified while the circuit is built: gates with constant or repeated inputs are folded away and identical gates are shared
+
+
+  # Define the constant wires
+  ZERO = 0
+  ONE = 1
+
+
+  def __init__(self, n_inputs):
+    # Store the number of inputs
+    self.n_inputs = n_inputs
+
+
+    # Initialize an empty list of gates, each a tuple of operation name and two input wires
+    self.gates = []
+
+
+    # Initialize an empty dictionary mapping each gate to the wire it drives, for common-subexpression elimination
+    self.wires = {}
+
+
+    # Initialize an empty list of output wires
+    self.outputs = []
+
+
+  def input(self, i):
+    # This method returns the wire carrying the i-th input
+    return 2 + i
+
+
+  def gate(self, op, a, b):
+    # This method adds a gate to the circuit unless it can be folded or shared, and returns the wire carrying its output
+    # Input: op, a string representing the operation, either 'and', 'or' or 'xor'
+    #        a, b, two integers representing the input wires
+    # Output: an integer representing the output wire
+
+
+    # Order the inputs, since all operations are commutative
+    a, b = min(a, b), max(a, b)
+
+
+    # Check if both inputs are constants and compute the result right away
+    if b <= Netlist.ONE:
+      return {'and': a & b, 'or': a | b, 'xor': a ^ b}[op]
+
+
+    # Fold the gates whose result does not depend on one of the inputs
+    if op == 'and':
+      if a == Netlist.ZERO:
+        return Netlist.ZERO
+      if a == Netlist.ONE or a == b:
+        return b
+    elif op == 'or':
+      if a == Netlist.ONE:
+        return Netlist.ONE
+      if a == Netlist.ZERO or a == b:
+        return b
+    else:
+      if a == Netlist.ZERO:
+        return b
+      if a == b:
+        return Netlist.ZERO
+      if a == Netlist.ONE and b >= 2 + self.n_inputs and self.gates[b - 2 - self.n_inputs][:2] == ('xor', Netlist.ONE):
+        # Two NOT gates in a row cancel out
+        return self.gates[b - 2 - self.n_inputs][2]
+
+
+    # Share the wire of an identical gate built before
+    key = (op, a, b)
+    if key not in self.wires:
+      self.gates.append(key)
+      self.wires[key] = 1 + self.n_inputs + len(self.gates)
+    return self.wires[key]
+
+
+  def not_gate(self, a):
+    # This method adds a NOT gate as an XOR with the constant 1
+    return self.gate('xor', Netlist.ONE, a)
+
+
+  def full_adder(self, a, b, c):
+    # This method adds a full-adder circuit made of two half-adders and an OR gate, like full_adder function
+    # Input: a, b, c, three integers representing the input wires
+    # Output: a tuple of two integers representing the sum and carry wires
+    intermediate_sum = self.gate('xor', a, b)
+    intermediate_carry = self.gate('and', a, b)
+    final_sum = self.gate('xor', intermediate_sum, c)
+    final_carry = self.gate('or', intermediate_carry, self.gate('and', intermediate_sum, c))
+    return final_sum, final_carry
+
+
+  def prune(self):
+    # This method removes the gates that no output depends on and renumbers the remaining wires
+    # Input: None
+    # Output: None
+
+
+    # Mark the wires the outputs depend on, walking the gates backwards
+    first = 2 + self.n_inputs
+    live = set(self.outputs)
+    for wire in range(first + len(self.gates) - 1, first - 1, -1):
+      if wire in live:
+        live.update(self.gates[wire - first][1:])
+
+
+    # Renumber the live gates in their original order
+    renumber = {wire: wire for wire in range(first)}
+    gates = []
+    for i, (op, a, b) in enumerate(self.gates):
+      if first + i in live:
+        gates.append((op, renumber[a], renumber[b]))
+        renumber[first + i] = first + len(gates) - 1
+
+
+    # Replace the gates, the sharing dictionary and the outputs
+    self.gates = gates
+    self.wires = {gate: first + i for i, gate in enumerate(gates)}
+    self.outputs = [renumber[wire] for wire in self.outputs]
+
+
+  def evaluate(self, inputs):
+    # This method evaluates the circuit on a batch of bit-sliced inputs
+    # Input: inputs, a list of n_inputs numpy uint64 arrays of equal shape, one per input wire
+    # Output: a list of numpy uint64 arrays, one per output wire
+
+
+    # Initialize the wire values with the constants and the inputs
+    zero = np.zeros_like(inputs[0])
+    values = [zero, ~zero] + list(inputs)
+
+
+    # Evaluate the gates in order with one bitwise operation each
+    operations = {'and': np.bitwise_and, 'or': np.bitwise_or, 'xor': np.bitwise_xor}
+    for op, a, b in self.gates:
+      values.append(operations[op](values[a], values[b]))
+
+
+    # Return the values of the output wires
+    return [values[wire] for wire in self.outputs]
+
+
+  def to_quantum_circuit(self):
+    # This method exports the circuit as a reversible quantum circuit, computing every gate into a fresh ancilla qubit
+    # Input: None
+    # Output: a tuple of a qiskit QuantumCircuit, whose first n_inputs qubits are the inputs, and a list of the qubits holding the outputs
+
+
+    import qiskit # A framework for quantum computing
+
+
+    # Assign the input qubits, then one ancilla qubit per gate and per constant output
+    first = 2 + self.n_inputs
+    constants = sorted(set(wire for wire in self.outputs if wire < 2))
+    qubits = {wire: wire - 2 for wire in range(2, first + len(self.gates))}
+    for i, wire in enumerate(constants):
+      qubits[wire] = self.n_inputs + len(self.gates) + i
+
+
+    # Initialize a quantum circuit object with all qubits using qiskit
+    circuit = qiskit.QuantumCircuit(self.n_inputs + len(self.gates) + len(constants))
+
+
+    # Prepare the constant 1 output with an X gate
+    if Netlist.ONE in qubits:
+      circuit.x(qubits[Netlist.ONE])
+
+
+    # Loop over the gates, computing each into its ancilla qubit
+    for i, (op, a, b) in enumerate(self.gates):
+      target = qubits[first + i]
+
+
+      # A NOT gate copies its input with a CNOT gate and flips it with an X gate
+      if a == Netlist.ONE:
+        circuit.cx(qubits[b], target)
+        circuit.x(target)
+
+
+      elif op == 'xor':
+        # An XOR gate is two CNOT gates
+        circuit.cx(qubits[a], target)
+        circuit.cx(qubits[b], target)
+
+
+      elif op == 'and':
+        # An AND gate is a Toffoli gate
+        circuit.ccx(qubits[a], qubits[b], target)
+
+
+      else:
+        # An OR gate is a XOR b XOR (a AND b)
+        circuit.cx(qubits[a], target)
+        circuit.cx(qubits[b], target)
+        circuit.ccx(qubits[a], qubits[b], target)
+
+
+    # Return the circuit and the qubits holding the outputs
+    return circuit, [qubits[wire] for wire in self.outputs]
+
+
+@functools.lru_cache(maxsize=None)
+def adder_netlist(n):
+  # This function builds the netlist of a ripple-carry adder of two n-bit registers once per width
+  # Input: n, an integer representing the number of bits in each register
+  # Output: a Netlist whose inputs are both registers and whose outputs are the n+1 sum bits, most significant bit first
+
+
+  # Initialize a netlist with both registers as inputs
+  netlist = Netlist(2 * n)
+
+
+  # Chain full-adders from right to left, starting with a zero carry
+  carry_bit = Netlist.ZERO
+  sum_bits = []
+  for i in range(n):
+    sum_bit, carry_bit = netlist.full_adder(netlist.input(n-1-i), netlist.input(2*n-1-i), carry_bit)
+    sum_bits.append(sum_bit)
+
+
+  # Set the outputs most significant bit first, remove unused gates and return the netlist
+  netlist.outputs = [carry_bit] + sum_bits[::-1]
+  netlist.prune()
+  return netlist
+
+
+@functools.lru_cache(maxsize=None)
+def multiplier_netlist(n):
+  # This function builds the netlist of a shift-and-add multiplier of two n-bit registers once per width
+  # Input: n, an integer representing the number of bits in each register
+  # Output: a Netlist whose inputs are both registers and whose outputs are the 2*n product bits, most significant bit first
+
+
+  # Initialize a netlist with both registers as inputs and the product bits as constant zeros, least significant bit first
+  netlist = Netlist(2 * n)
+  product_bits = [Netlist.ZERO] * (2 * n)
+
+
+  # Loop over each bit of the second register from right to left
+  for i in range(n):
+
+
+    # Add the partial products of the row into the product bits with full-adders
+    carry_bit = Netlist.ZERO
+    for j in range(n):
+      partial_product_bit = netlist.gate('and', netlist.input(n-1-j), netlist.input(2*n-1-i))
+      product_bits[i+j], carry_bit = netlist.full_adder(product_bits[i+j], partial_product_bit, carry_bit)
+
+
+    # Store the final carry bit of the row in the next free product bit
+    product_bits[i+n] = carry_bit
+
+
+  # Set the outputs most significant bit first, remove unused gates and return the netlist
+  netlist.outputs = product_bits[::-1]
+  netlist.prune()
+  return netlist
+
+
+@functools.lru_cache(maxsize=None)
+def adder_table(num_qubits, n, carry=False):
+  # This function builds the gather table of a ripple-carry (Cuccaro) adder on a statevector once per size
+  # The adder maps |a>|b>|c> to |a>|a+b mod 2**n>|c XOR carry>, with a on qubits 0..n-1, b on qubits n..2n-1 and, if carry is set, the carry-out on qubit 2n; higher qubits are left alone
+  # Input: num_qubits, an integer representing the number of qubits in the statevector
+  #        n, an integer representing the number of qubits in each register
+  #        carry, a boolean indicating whether qubit 2n receives the carry-out
+  # Output: a read-only numpy array src such that the new state is state[src]
+
+
+  # Split every basis index into its registers
+  index = np.arange(2**num_qubits)
+  mask = 2**n - 1
+  a = index & mask
+  b = (index >> n) & mask
+
+
+  # Every output basis state |a>|s> came from the input basis state |a>|s-a>
+  b_in = (b - a) & mask
+  src = (index & ~(mask << n)) | (b_in << n)
+
+
+  # Undo the carry-out too, which is a bit flip of qubit 2n
+  if carry:
+    src ^= ((a + b_in) >> n) << (2 * n)
+
+
+  # Make the table read-only, since it is shared by every call
+  src.setflags(write=False)
+  return src
+
+
+@functools.lru_cache(maxsize=None)
+def multiplier_table(num_qubits, n, controlled=False):
+  # This function builds the gather table of a multiply-accumulate circuit on a statevector once per size
+  # The circuit maps |a>|b>|p>|c> to |a>|b>|p + c*a*b mod 2**(2n)>|c>, with a on qubits 0..n-1, b on qubits n..2n-1, p on qubits 2n..4n-1 and, if controlled is set, the control on qubit 4n
+  # Input: num_qubits, an integer representing the number of qubits in the statevector
+  #        n, an integer representing the number of qubits in each factor register
+  #        controlled, a boolean indicating whether qubit 4n controls the multiplication
+  # Output: a read-only numpy array src such that the new state is state[src]
+
+
+  # Split every basis index into its registers
+  index = np.arange(2**num_qubits)
+  mask = 2**n - 1
+  product_mask = 2**(2 * n) - 1
+  a = index & mask
+  b = (index >> n) & mask
+  p = (index >> (2 * n)) & product_mask
+
+
+  # Multiply only where the control qubit is set, if there is one
+  product = a * b
+  if controlled:
+    product *= (index >> (4 * n)) & 1
+
+
+  # Every output basis state |a>|b>|p> came from the input basis state |a>|b>|p-a*b>
+  src = (index & ~(product_mask << (2 * n))) | (((p - product) & product_mask) << (2 * n))
+
+
+  # Make the table read-only, since it is shared by every call
+  src.setflags(write=False)
+  return src
+
+
+@functools.lru_cache(maxsize=None)
+def draper_phases(n):
+  # This function builds the phase table of a Draper adder once per register size
+  # Input: n, an integer representing the number of qubits in each register
+  # Output: a read-only 2**n by 2**n numpy array holding exp(2*pi*i*k*a/2**n) for Fourier index k and addend a
+
+
+  # Multiply every Fourier index by every addend modulo 2**n and turn the products into phases
+  k = np.arange(2**n)
+  phases = np.exp(2j * np.pi * ((k[:, None] * k[None, :]) % 2**n) / 2**n)
+
+
+  # Make the table read-only, since it is shared by every call
+  phases.setflags(write=False)
+  return phases
+
+
+def state_qubits(state, required, circuit):
+  # This function returns the number of qubits of a statevector, checking that it holds the registers of a circuit
+  # Input: state, a numpy array representing the quantum state, or a 2D numpy array with one state per row
+  #        required, an integer representing the number of qubits the registers of the circuit take
+  #        circuit, a string naming the circuit for the error message
+  # Output: an integer representing the number of qubits; raises ValueError if the state is too small or not of a power of two size
+
+
+  size = np.shape(state)[-1]
+  num_qubits = size.bit_length() - 1
+  if size != 2**num_qubits:
+    raise ValueError('A statevector needs a power of two amplitudes, got %d' % size)
+  if num_qubits < required:
+    raise ValueError('%s needs at least %d qubits, the state has %d' % (circuit, required, num_qubits))
+  return num_qubits
+
+
+def cuccaro_add(state, n, carry=False):
+  # This function adds register a into register b of a statevector like a ripple-carry (Cuccaro) adder circuit, as a single index permutation
+  # Input: state, a numpy array representing the quantum state, with the registers laid out as in adder_table function
+  #        n, an integer representing the number of qubits in each register
+  #        carry, a boolean indicating whether qubit 2n receives the carry-out
+  # Output: a numpy array representing the quantum state after the addition
+
+
+  # Check that the state holds both registers and the carry qubit, then gather the amplitudes through the cached table of the adder
+  num_qubits = state_qubits(state, 2 * n + carry, 'The adder')
+  return np.take(state, adder_table(num_qubits, n, carry), axis=-1)
+
+
+def draper_add(state, n):
+  # This function adds register a into register b of a statevector like a Draper adder circuit: a quantum Fourier transform of b, phases controlled by a and an inverse transform
+  # Input: state, a numpy array representing the quantum state, with a on qubits 0..n-1 and b on qubits n..2n-1
+  #        n, an integer representing the number of qubits in each register
+  # Output: a numpy array representing the quantum state after the addition
+
+
+  # Check that the state holds both registers, then view the amplitudes as a (higher qubits, b, a) array
+  state_qubits(state, 2 * n, 'The Draper adder')
+  shape = np.shape(state)
+  amplitudes = np.reshape(state, (-1, 2**n, 2**n))
+
+
+  # Apply the quantum Fourier transform to register b, which is the inverse discrete Fourier transform with unitary normalization
+  fourier = np.fft.ifft(amplitudes, axis=1, norm='ortho')
+
+
+  # Rotate every Fourier component of b by the phase of the value of a
+  fourier *= draper_phases(n)
+
+
+  # Apply the inverse quantum Fourier transform to register b and restore the shape of the state
+  return np.fft.fft(fourier, axis=1, norm='ortho').reshape(shape)
+
+
+def controlled_multiply(state, n, controlled=True):
+  # This function adds the product of registers a and b into register p of a statevector, optionally controlled by one more qubit, as a single index permutation
+  # Input: state, a numpy array representing the quantum state, with the registers laid out as in multiplier_table function
+  #        n, an integer representing the number of qubits in each factor register
+  #        controlled, a boolean indicating whether qubit 4n controls the multiplication
+  # Output: a numpy array representing the quantum state after the multiplication
+
+
+  # Check that the state holds the three registers and the control qubit, then gather the amplitudes through the cached table of the multiplier
+  num_qubits = state_qubits(state, 4 * n + controlled, 'The multiplier')
+  return np.take(state, multiplier_table(num_qubits, n, controlled), axis=-1)
+
+
+def gate_action(name, params, qubits, index):
+  # This function describes a basis-permuting or diagonal gate as an operation on basis indices
+  # Input: name, a string representing the qiskit name of the gate
+  #        params, a tuple of floats representing the parameters of the gate
+  #        qubits, a tuple of integers representing the qubits the gate acts on
+  #        index, a numpy array of all basis indices of the statevector
+  # Output: a tuple ('permutation', g), meaning the new state is state[g], or ('phase', d), meaning the new state is d * state, or None if the gate is neither
+
+
+  # Get the value of each qubit of the gate in every basis state
+  bits = [(index >> q) & 1 for q in qubits]
+
+
+  # Handle the gates that flip the target qubit when all controls are set
+  if name in ('x', 'cx', 'ccx', 'mcx'):
+    flip = np.ones_like(index)
+    for bit in bits[:-1]:
+      flip &= bit
+    return 'permutation', index ^ (flip << qubits[-1])
+
+
+  elif name in ('swap', 'cswap'):
+    # Handle the gates that exchange the two target qubits when the control, if any, is set
+    differ = bits[-1] ^ bits[-2]
+    if name == 'cswap':
+      differ &= bits[0]
+    return 'permutation', index ^ (differ << qubits[-1]) ^ (differ << qubits[-2])
+
+
+  elif name in ('z', 'cz', 'ccz', 's', 'sdg', 't', 'tdg', 'p', 'u1', 'cp', 'cu1'):
+    # Handle the gates that add a phase when all their qubits are set
+    angle = {'z': np.pi, 'cz': np.pi, 'ccz': np.pi, 's': np.pi / 2, 'sdg': -np.pi / 2, 't': np.pi / 4, 'tdg': -np.pi / 4}.get(name, params[0] if params else 0)
+    on = np.ones_like(index)
+    for bit in bits:
+      on &= bit
+    return 'phase', np.exp(1j * angle * on)
+
+
+  elif name in ('rz', 'crz'):
+    # Handle the Z rotations, which add the phase exp(-i*theta/2) to 0 and exp(i*theta/2) to 1, when the control, if any, is set
+    phase = np.exp(1j * params[0] * (bits[-1] - 0.5))
+    if name == 'crz':
+      phase = np.where(bits[0] == 1, phase, 1)
+    return 'phase', phase
+
+
+  elif name == 'rzz':
+    # Handle the ZZ rotation, which adds exp(-i*theta/2) to equal and exp(i*theta/2) to different qubit values
+    return 'phase', np.exp(1j * params[0] * ((bits[0] ^ bits[1]) - 0.5))
+
+
+  elif name == 'id':
+    # The identity gate permutes nothing
+    return 'permutation', index
+
+
+  # Any other gate mixes basis states
+  return None
+
+
+def instruction_key(circuit, instruction):
+  # This function describes an instruction of a qiskit circuit as a hashable tuple, which keys the cache of compiled circuits
+  # Input: circuit, a qiskit QuantumCircuit
+  #        instruction, one of the instructions in circuit.data
+  # Output: a tuple of gate name, parameters and qubit indices, with None parameters if they are not numbers
+
+
+  # Get the qubit indices of the instruction
+  qubits = tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits)
+
+
+  # Get the parameters, which are unbound symbols for parameterized circuits
+  try:
+    params = tuple(float(param) for param in instruction.operation.params)
+  except (TypeError, ValueError):
+    return instruction.operation.name, None, qubits
+
+
+  # Return the tuple
+  return instruction.operation.name, params, qubits
+
+
+@functools.lru_cache(maxsize=256)
+def compile_instructions(num_qubits, instructions):
+  # This function fuses a sequence of basis-permuting and diagonal gates into one gather table and one phase vector, once per distinct sequence
+  # Input: num_qubits, an integer representing the number of qubits in the statevector
+  #        instructions, a tuple of instructions as described by instruction_key function
+  # Output: a tuple of a read-only numpy array src and a read-only numpy array of phases or None, such that the new state is phases * state[src]
+
+
+  # Start from the identity: no permutation and no phase
+  index = np.arange(2**num_qubits)
+  src = index
+  phases = None
+
+
+  # Loop over the instructions in circuit order
+  for name, params, qubits in instructions:
+
+
+    # Check if the gate has unbound parameters
+    if params is None:
+      raise ValueError('Gate %s has unbound parameters' % name)
+
+
+    # Describe the gate as an operation on basis indices using gate_action function
+    action = gate_action(name, params, qubits, index)
+    if action is None:
+      raise ValueError('Gate %s is not a permutation or diagonal gate' % name)
+
 
+    # Compose a permutation after the gates so far by gathering the table and the phases through it
+    kind, table = action
+    if kind == 'permutation':
+      src = src[table]
+      if phases is not None:
+        phases = phases[table]
 
-  # Loop over each pair of corresponding bits in both quantum registers from right to left
-  for i in range(N):
 
+    else:
+      # Compose a phase after the gates so far by multiplying the phases
+      phases = table if phases is None else phases * table
 
-    # Initialize an empty array for storing partial product bits
-    partial_product_bits = []
 
+  # Make the tables read-only, since they are shared by every call
+  src.setflags(write=False)
+  if phases is not None:
+    phases.setflags(write=False)
+  return src, phases
 
-    # Loop over each bit in the first quantum register from right to left
-    for j in range(N):
 
+def compile_permutation_circuit(circuit):
+  # This function compiles a circuit made only of basis-permuting and diagonal gates into one gather table and one phase vector, cached by the gates of the circuit
+  # Input: circuit, a qiskit QuantumCircuit
+  # Output: a tuple of a numpy array src and a numpy array of phases or None, such that the final state is exp(i*global_phase) * phases * state[src]; raises ValueError for any other gate
+  return compile_instructions(circuit.num_qubits, tuple(instruction_key(circuit, instruction) for instruction in circuit.data if instruction.operation.name != 'barrier'))
 
-      # Apply an AND gate to both bits using and_gate function and get a binary string representing the partial product bit 
-      partial_product_bit = and_gate(qregister1[N-1-j], qregister2[N-1-i])
 
+def run_circuit(circuit, state=None):
+  # This function simulates a circuit on a statevector, applying every run of basis-permuting and diagonal gates as one gather and one multiplication and the remaining gates with qiskit
+  # Input: circuit, a qiskit QuantumCircuit without measurements
+  #        state, an optional numpy array representing the initial quantum state, |0...0> by default
+  # Output: a numpy array representing the final quantum state
 
-      # Append partial_product_bit to partial_product_bits array 
-      partial_product_bits.append(partial_product_bit)
 
+  import qiskit # A framework for quantum computing
 
-    # Reverse partial_product_bits array using reverse method 
-    partial_product_bits.reverse()
 
+  # Initialize the state to |0...0> if none is given
+  if state is None:
+    state = np.zeros(2**circuit.num_qubits, dtype=complex)
+    state[0] = 1
+  state = np.asarray(state, dtype=complex)
 
-    # Pad partial_product_bits array with i zeros on its right side using extend method 
-    partial_product_bits.extend(['0'] * i)
 
+  # Define how to apply a run of fast gates to the state
+  def apply(run, state):
+    if not run:
+      return state
+    src, phases = compile_instructions(circuit.num_qubits, tuple(run))
+    state = state[src]
+    return state if phases is None else phases * state
 
-    # Append partial_product_bits array to partial_products array
-    partial_products.append(partial_product_bits)
 
-    # Initialize an empty array for storing sum bits
-    sum_bits = []
+  # Collect consecutive fast gates into runs, applying every other gate on its own
+  run = []
+  for instruction in circuit.data:
 
-    # Initialize an empty string for storing carry bit
-    carry_bit = '0'
 
-    # Loop over each pair of corresponding bits in partial_products array from right to left
-    for k in range(N):
-          
-        # Apply a full-adder circuit to the bits using full_adder function and get a tuple of two binary strings representing the sum and carry bits 
-        sum_bit, carry_bit = full_adder(partial_products[k][N-1-k], carry_bit, sum_bits)
-    
-    
-        # Append sum_bit to sum_bits array 
-        sum_bits.append(sum_bit)
+    # Skip the barriers
+    if instruction.operation.name == 'barrier':
+      continue
 
-    # Reverse sum_bits array using reverse method
-    sum_bits.reverse()
 
-    # Append carry_bit to sum_bits array
-    sum_bits.append(carry_bit)
+    # Check if the gate can join the current run
+    name, params, qubits = instruction_key(circuit, instruction)
+    if name in FAST_GATES and params is not None:
+      run.append((name, params, qubits))
+      continue
 
-    # Reverse sum_bits array using reverse method
-    sum_bits.reverse()
 
-    # Return sum_bits array as output
-    return sum_bits
-  
+    # Apply the current run, then the gate itself through a qiskit statevector
+    state = apply(run, state)
+    run = []
+    state = qiskit.quantum_info.Statevector(state).evolve(instruction.operation, qargs=list(qubits)).data
 
 
+  # Apply the last run and the global phase of the circuit
+  state = apply(run, state)
+  return state * np.exp(1j * float(circuit.global_phase))
@@ -1,4 +1,3 @@
-python
 # QML droplet: Quantum Machine Learning
 # This droplet applies quantum algorithms and techniques to machine learning tasks, such as classification, clustering, regression, and reinforcement learning.
 # This droplet can enhance the performance, accuracy, and scalability of machine learning models and enable new possibilities for data analysis and artificial intelligence.
@@ -6,11 +5,9 @@ python
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# surreal, wikipedia and nltk are imported inside the functions that use them, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import surreal # A library for surreal numbers
-import wikipedia # A library for accessing Wikipedia articles
-import nltk # A library for natural language processing
+from core import Counts # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -19,115 +16,26 @@ M = 100 # The number of measurements to perform on each quantum state
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
-
-
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
-
-
-  # Loop over m measurements
-  for i in range(m):
-
-
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
-
-
-    # Initialize a cumulative probability
-    p = 0
-
-
-    # Loop over each basis state
-    for j in range(len(state)):
-
-
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
-
-
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
-
-
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
-
-
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
-
-
-        # Break out of the loop
-        break
-
-
-  # Return the frequency dictionary
-  return freqs
-
-
 def generate_index(freqs):
   # This function generates a random index based on the frequencies of each outcome and returns it as an integer or a surreal number
-  # Input: freqs, a dictionary mapping each outcome to its frequency
+  # Input: freqs, a Counts object or a dictionary mapping each outcome to its frequency
   # Output: an integer or a surreal number representing the index
 
 
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+  import surreal # A library for surreal numbers
 
 
-  # Get the most frequent outcome and its frequency from the sorted list
-  most_frequent_outcome, most_frequent_frequency = sorted_outcomes[0]
+  # Get the observed outcomes as integers and their frequencies
+  counts = Counts.from_dict(freqs)
 
 
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number
-  most_frequent_integer = int(most_frequent_outcome, 2)
+  # Get the most frequent outcome, the smallest one if several share the most frequent frequency, and all outcomes sharing that frequency
+  most_frequent_integer = counts.mode()
+  tied = counts.outcomes[counts.frequencies == counts[most_frequent_integer]]
 
 
   # Check if there is only one outcome with the most frequent frequency
-  if len([outcome for outcome, frequency in sorted_outcomes if frequency == most_frequent_frequency]) == 1:
+  if len(tied) == 1:
 
 
     # Return the most frequent integer as an integer
@@ -138,46 +46,8 @@ def generate_index(freqs):
     # There are more than one outcomes with the most frequent frequency
 
 
-    # Initialize an empty left set and an empty right set for the surreal number
-    left_set = set()
-    right_set = set()
-
-
-    # Loop over the outcomes with the most frequent frequency
-    for outcome, frequency in sorted_outcomes:
-
-
-      # Check if the frequency is equal to the most frequent frequency
-      if frequency == most_frequent_frequency:
-
-
-        # Convert the outcome to an integer by interpreting it as a binary number
-        integer = int(outcome, 2)
-
-
-        # Check if the integer is less than the most frequent integer
-        if integer < most_frequent_integer:
-
-
-          # Add the integer to the left set
-          left_set.add(integer)
-
-
-        # Check if the integer is greater than the most frequent integer
-        elif integer > most_frequent_integer:
-
-
-          # Add the integer to the right set
-          right_set.add(integer)
-
-
-      else:
-        # Break out of the loop
-        break
-
-
-    # Create a surreal number object using surreal library with the left set and the right set as parameters
-    surreal_number = surreal.Surreal(left_set, right_set)
+    # Create a surreal number object using surreal library with the smaller tied integers as the left set and the larger ones as the right set
+    surreal_number = surreal.Surreal(set(int(i) for i in tied[tied < most_frequent_integer]), set(int(i) for i in tied[tied > most_frequent_integer]))
 
 
     # Return the surreal number as a surreal number
@@ -226,6 +96,10 @@ def generate_sentence(word, topic):
   # Output: a string representing a sentence
 
 
+  import nltk # A library for natural language processing
+  import wikipedia # A library for accessing Wikipedia articles
+
+
   try:
     # Search for Wikipedia articles related to the topic using wikipedia library and get a list of titles
     titles = wikipedia.search(topic)
@@ -406,6 +280,10 @@ def generate_vocab(topic):
   # Output: a list of words to use as vocabulary
 
 
+  import nltk # A library for natural language processing
+  import wikipedia # A library for accessing Wikipedia articles
+
+
   # Get the summary of the Wikipedia article with the topic using wikipedia library and get a string of text
   summary = wikipedia.summary(topic)
 
@@ -8,9 +8,8 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# qiskit and scipy are imported inside the functions that use them, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import scipy # A library for scientific and technical computing
 
 
 # Define constants
@@ -19,44 +18,6 @@ M = 2**N # The size of the search space or the number of possible configurations
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
 def generate_function():
   # This function generates a random objective function that maps each configuration to a real value and returns it as a dictionary
   # Input: None
@@ -94,6 +55,9 @@ def anneal_state(state, function):
   # Output: a numpy array representing the final state
 
 
+  import qiskit # A framework for quantum computing
+
+
   # Define an annealing schedule as an array of tuples of time and transverse field strength using numpy library 
   schedule = np.array([(0.0, M), (10.0, M/2), (20.0, M/4), (30.0, M/8), (40.0, M/16), (50.0, M/32), (60.0, M/64), (70.0, M/128), (80.0, M/256), (90.0, M/512), (100.0, M/1024), (110.0, M/2048), (120.0, M/4096), (130.0, M/8192), (140.0, M/16384), (150.0, M/32768), (160.0, M/65536), (170.0, M/131072), (180.0, M/262144), (190.0, M/524288), (200.0, 0)])
 
@@ -137,6 +101,10 @@ def optimize_state(state, function):
   # Output: a numpy array representing the final state
 
 
+  import scipy # A library for scientific and technical computing
+  import qiskit # A framework for quantum computing
+
+
   # Define an objective function for QAOA as a function that takes an array of parameters and returns a real number representing the expectation value of the objective function over the quantum state
   def objective(params):
 
@@ -221,27 +189,39 @@ def optimize_state(state, function):
   # Initialize the circuit with the given state using initialize method 
   circuit.initialize (state) 
 
-# Loop over each pair of angles in beta_opt and gamma_opt arrays
-for b, g in zip(beta_opt, gamma_opt):
-        # Apply a rotation gate around X axis to each qubit in the circuit using rx method with b as parameter
-        circuit.rx(b, range(N))
-        # Apply a rotation gate around Z axis to each pair of qubits in the circuit using rz method with g times the value of the objective function for their configuration as parameter
-        for i in range(N):
-            for j in range(i+1, N):
-                # Convert the indices of the pair of qubits to a binary string of length N using format function
-                config = format(i * 2**(N-1) + j * 2**(N-2), '0' + str(N) + 'b')
-                # Get the value of the objective function for their configuration from the function dictionary 
-                value = function[config]
-                # Apply a rotation gate around Z axis to the pair of qubits using rz method with g times value as parameter 
-                circuit.rz(g * value, [i, j])
-    
-# Initialize a statevector simulator backend using qiskit
-backend = qiskit.Aer.get_backend('statevector_simulator')
-
-# Execute the circuit using qiskit execute function with the backend and get a result object
-result = qiskit.execute(circuit, backend).result()
-
-# Get the statevector from the result object using get_statevector method and return it as a numpy array
-return result.get_statevector()
 
+  # Loop over each pair of angles in beta_opt and gamma_opt arrays
+  for b, g in zip(beta_opt, gamma_opt):
+
+
+    # Apply a rotation gate around X axis to each qubit in the circuit using rx method with b as parameter
+    circuit.rx(b, range(N))
+
+
+    # Apply a rotation gate around Z axis to each pair of qubits in the circuit using rz method with g times the value of the objective function for their configuration as parameter
+    for i in range(N):
+      for j in range(i+1, N):
+
+
+        # Convert the indices of the pair of qubits to a binary string of length N using format function
+        config = format(i * 2**(N-1) + j * 2**(N-2), '0' + str(N) + 'b')
+
+
+        # Get the value of the objective function for their configuration from the function dictionary 
+        value = function[config]
 
+
+        # Apply a rotation gate around Z axis to the pair of qubits using rz method with g times value as parameter 
+        circuit.rz(g * value, [i, j])
+
+
+  # Initialize a statevector simulator backend using qiskit
+  backend = qiskit.Aer.get_backend('statevector_simulator')
+
+
+  # Execute the circuit using qiskit execute function with the backend and get a result object
+  result = qiskit.execute(circuit, backend).result()
+
+
+  # Get the statevector from the result object using get_statevector method and return it as a numpy array
+  return result.get_statevector()
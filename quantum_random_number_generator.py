@@ -9,176 +9,586 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# surreal is imported inside the functions that use it, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import surreal # A library for surreal numbers
+from core import generate_state, measure_state, sample_outcomes, Counts # The state, sampling and message primitives shared by all droplets
+import collections # A library for container datatypes
+import hashlib # A library for hashing functions
+import math # A library for mathematical functions
+import asyncio # A library for asynchronous input and output
+import socket # A library for network sockets
+import json # A library for encoding data as JSON
+import time # A library for measuring time
+import logging # A library for logging
 
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
 M = 100 # The number of measurements to perform on each quantum state
+RNG_PORT = 7007 # The local TCP port of the random byte server
+LATENCY_SAMPLES = 10000 # The number of recent request latencies the random byte server keeps for its percentiles
+
+
+# Define global variables
+default_state = None # The state randbytes samples from when none is given
+logger = logging.getLogger(__name__) # The logger of the droplet
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
+def randbytes(n, state=None):
+  # This function returns n raw random bytes made of the measurement outcomes of a quantum state
+  # Input: n, an integer representing the number of bytes
+  #        state, an optional numpy array representing the quantum state, a state generated once by generate_state function by default
+  # Output: a bytes object of n bytes
+
+
+  # Generate the default state on the first call
+  global default_state
+  if state is None:
+    if default_state is None:
+      default_state = generate_state(N)
+    state = default_state
+
+
+  # Get the number of bits in each outcome
+  bits_per_outcome = int(np.log2(len(state)))
+
+
+  # Take whole outcomes as bytes when each outcome is exactly one byte
+  if bits_per_outcome == 8:
+    return sample_outcomes(state, n).astype(np.uint8).tobytes()
+
+
+  # Otherwise measure enough outcomes, split them into their bits and pack the bits into bytes
+  outcomes = sample_outcomes(state, -(-8 * n // bits_per_outcome))
+  bits = (outcomes[:, None] >> np.arange(bits_per_outcome - 1, -1, -1)) & 1
+  return np.packbits(bits.astype(np.uint8).ravel())[:n].tobytes()
+
+
+def von_neumann_debias(bits):
+  # This function removes the bias of independent bits with the Von Neumann procedure: each pair 01 gives 0, each pair 10 gives 1 and equal pairs are dropped
+  # Input: bits, a numpy array of 0/1 integers
+  # Output: a numpy array of uint8 representing the unbiased bits
+
+
+  # Split the bits into pairs, dropping a last odd bit
+  pairs = np.asarray(bits, dtype=np.uint8)[:len(bits) // 2 * 2].reshape(-1, 2)
+
+
+  # Keep the first bit of every pair whose bits differ
+  return pairs[pairs[:, 0] != pairs[:, 1], 0]
+
+
+def estimate_min_entropy(samples):
+  # This function estimates the min-entropy per sample of a noise source with the most common value estimate of NIST SP 800-90B
+  # Input: samples, a numpy array of non-negative integers representing raw samples
+  # Output: a float representing the estimated min-entropy in bits per sample
+
+
+  # Get the frequency of the most common value using np.bincount function
+  samples = np.asarray(samples)
+  p = np.bincount(samples).max() / len(samples)
+
+
+  # Take the upper bound of its 99% confidence interval as the probability of the best guess
+  p_upper = min(1.0, p + 2.576 * math.sqrt(p * (1 - p) / max(len(samples) - 1, 1)))
+
+
+  # Return the negative logarithm of the probability of the best guess
+  return -math.log2(p_upper)
+
+
+class RepetitionCountTest:
+  # This class runs the repetition count health test of NIST SP 800-90B on a stream of samples, one block at a time, failing when one value repeats too often in a row
+  # Input: min_entropy, a float representing the assessed min-entropy in bits per sample
+  #        alpha, an integer representing the false alarm probability as a negative power of two
+
+
+  def __init__(self, min_entropy, alpha=20):
+    # Calculate the cutoff: a run this long has probability below 2**-alpha
+    self.cutoff = 1 + math.ceil(alpha / min_entropy)
+
+
+    # Initialize the last sample and the length of its run, which carry over between blocks
+    self.last = None
+    self.run = 0
+
 
+  def update(self, samples):
+    # This method tests the next block of samples
+    # Input: samples, a numpy array of integers representing the next raw samples
+    # Output: None; raises RuntimeError when the test fails
 
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
 
+    # Skip empty blocks
+    samples = np.asarray(samples)
+    if not len(samples):
+      return
 
-  # Loop over each qubit in the circuit
-  for i in range(N):
 
+    # Get the length of every run of equal samples in the block
+    boundaries = np.flatnonzero(samples[1:] != samples[:-1]) + 1
+    lengths = np.diff(np.concatenate(([0], boundaries, [len(samples)])))
 
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
 
+    # Extend the first run by the run carried over from the previous block
+    if samples[0] == self.last:
+      lengths[0] += self.run
 
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
 
+    # Check if any run reaches the cutoff
+    if lengths.max() >= self.cutoff:
+      raise RuntimeError('Repetition count test failed: a value repeated %d times' % lengths.max())
 
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
 
+    # Carry over the last run
+    self.last = samples[-1]
+    self.run = lengths[-1]
 
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
 
+class AdaptiveProportionTest:
+  # This class runs the adaptive proportion health test of NIST SP 800-90B on a stream of samples, one block at a time, failing when the first value of a window takes too large a share of it
+  # Input: min_entropy, a float representing the assessed min-entropy in bits per sample
+  #        window, an integer representing the number of samples in each window
+  #        alpha, an integer representing the false alarm probability as a negative power of two
 
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
 
+  def __init__(self, min_entropy, window=512, alpha=20):
+    # Store the window size
+    self.window = window
 
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
 
+    # Calculate the cutoff 1 + CRITBINOM(window - 1, 2**-min_entropy, 1 - 2**-alpha): the smallest count of the first value among the other window - 1 samples whose binomial tail probability is at most 2**-alpha, which already counts the first sample itself
+    p = 2 ** -min_entropy
+    tail = 1.0
+    count = 0
+    while count < window - 1 and tail > 2 ** -alpha:
+      tail -= math.exp(math.lgamma(window) - math.lgamma(count + 1) - math.lgamma(window - count) + count * math.log(p) + (window - 1 - count) * math.log1p(-p))
+      count += 1
+    self.cutoff = count
 
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
+
+    # Initialize the samples of the unfinished window, which carry over between blocks
+    self.pending = np.zeros(0, dtype=np.int64)
+
+
+  def update(self, samples):
+    # This method tests the next block of samples
+    # Input: samples, a numpy array of integers representing the next raw samples
+    # Output: None; raises RuntimeError when the test fails
+
+
+    # Join the unfinished window with the block and cut them into whole windows
+    samples = np.concatenate((self.pending, np.asarray(samples, dtype=np.int64)))
+    whole = len(samples) // self.window * self.window
+    windows = samples[:whole].reshape(-1, self.window)
+    self.pending = samples[whole:]
+
+
+    # Count the occurrences of the first sample of every window in that window
+    counts = (windows == windows[:, :1]).sum(axis=1)
+
+
+    # Check if any count reaches the cutoff
+    if len(counts) and counts.max() >= self.cutoff:
+      raise RuntimeError('Adaptive proportion test failed: a value filled %d of %d samples' % (counts.max(), self.window))
+
+
+def raw_blocks(state, block_size=1 << 20):
+  # This function measures a quantum state forever, one block of outcomes at a time
   # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
+  #        block_size, an integer representing the number of outcomes in each block
+  # Output: a generator of numpy arrays of outcomes
+  while True:
+    yield sample_outcomes(state, block_size)
 
 
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
+def extract_stream(blocks, min_entropy=None, debias=False):
+  # This function turns blocks of raw samples into a stream of near-uniform random bytes: every block is health-tested, optionally Von Neumann debiased, and conditioned with sha256 over chunks holding twice the min-entropy of each output
+  # Input: blocks, an iterable of numpy arrays of integers below 256 representing raw samples, such as raw_blocks function returns
+  #        min_entropy, an optional float representing the assessed min-entropy in bits per sample, estimated from the first block by default
+  #        debias, a boolean indicating whether to Von Neumann debias the bits of the samples before conditioning
+  # Output: a generator of bytes objects of extracted random bytes
 
 
-  # Loop over m measurements
-  for i in range(m):
+  # Initialize the health tests, the chunk size and the bytes waiting for a whole chunk
+  tests = None
+  chunk = None
+  pending = b''
 
 
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
+  # Loop over the raw blocks
+  for block in blocks:
+    block = np.asarray(block)
 
 
-    # Initialize a cumulative probability
-    p = 0
+    # Set up everything that depends on the min-entropy on the first block
+    if tests is None:
 
 
-    # Loop over each basis state
-    for j in range(len(state)):
+      # Estimate the min-entropy from the first block if it is not given
+      entropy = min_entropy if min_entropy is not None else estimate_min_entropy(block)
+      if entropy <= 0:
+        raise ValueError('The raw samples carry no min-entropy')
 
 
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
+      # Create the health tests and size the chunks so that every 32 output bytes condition 512 bits of min-entropy
+      tests = [RepetitionCountTest(entropy), AdaptiveProportionTest(entropy)]
+      chunk = 64 if debias else math.ceil(512 / entropy)
 
 
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
+    # Run the health tests on the block
+    for test in tests:
+      test.update(block)
 
 
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
+    # Debias the bits of the samples if requested, otherwise condition the samples as they are
+    if debias:
+      data = np.packbits(von_neumann_debias(np.unpackbits(block.astype(np.uint8)))).tobytes()
+    else:
+      data = block.astype(np.uint8).tobytes()
 
 
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
+    # Hash every whole chunk and keep the rest for the next block
+    pending += data
+    whole = len(pending) // chunk
+    yield b''.join(hashlib.sha256(pending[i * chunk:(i + 1) * chunk]).digest() for i in range(whole))
+    pending = pending[whole * chunk:]
 
 
-        # Break out of the loop
-        break
+class RandomByteServer:
+  # This class is a long-lived random byte service: a background task keeps a ring buffer topped up with extracted bytes and an asyncio server hands them out over a Unix domain socket or local TCP
+  # Clients send one line per request holding the number of bytes wanted and read exactly that many bytes back; the line 'stats' returns the counters as one line of JSON
+  # Input: blocks, an optional iterable of raw sample blocks, raw_blocks of a state generated by generate_state function by default
+  #        capacity, an integer representing the size of the ring buffer in bytes
 
 
-  # Return the frequency dictionary
-  return freqs
+  def __init__(self, blocks=None, capacity=1 << 24):
+    # Store the capacity and initialize an empty ring buffer
+    self.capacity = capacity
+    self.ring = bytearray(capacity)
+    self.head = 0
+    self.size = 0
 
 
-def generate_number(freqs):
-  # This function generates a random number based on the frequencies of each outcome and returns it as an integer or a surreal number
-  # Input: freqs, a dictionary mapping each outcome to its frequency
-  # Output: an integer or a surreal number representing the random number
+    # Initialize the extraction pipeline lazily, so that the qiskit state is only generated when the server starts
+    self.blocks = blocks
+    self.stream = None
 
 
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+    # Initialize the number of bytes the oldest waiting request needs, and the error that stopped the refill task, if any
+    self.wanted = 0
+    self.error = None
+    self.server = None
 
 
-  # Get the most frequent outcome and its frequency from the sorted list
-  most_frequent_outcome, most_frequent_frequency = sorted_outcomes[0]
+    # Initialize the counters
+    self.requests = 0
+    self.bytes_served = 0
+    self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+    self.started_at = None
 
 
-  # Convert the most frequent outcome to an integer by interpreting it as a binary number
-  most_frequent_integer = int(most_frequent_outcome, 2)
+  def write(self, data):
+    # This method appends bytes to the ring buffer, dropping what does not fit
+    # Input: data, a bytes object of extracted random bytes
+    # Output: None
 
 
-  # Check if there is only one outcome with the most frequent frequency
-  if len([outcome for outcome, frequency in sorted_outcomes if frequency == most_frequent_frequency]) == 1:
+    # Keep only as many bytes as there is room for
+    data = data[:self.capacity - self.size]
+    tail = (self.head + self.size) % self.capacity
 
 
-    # Return the most frequent integer as an integer
-    return most_frequent_integer
+    # Copy the bytes up to the end of the buffer and wrap the rest around to its start
+    first = min(len(data), self.capacity - tail)
+    self.ring[tail:tail + first] = data[:first]
+    self.ring[:len(data) - first] = data[first:]
+    self.size += len(data)
 
 
-  else:
-    # There are more than one outcomes with the most frequent frequency
+  def read(self, n):
+    # This method removes n bytes from the ring buffer
+    # Input: n, an integer representing the number of bytes, at most the number buffered
+    # Output: a bytes object of n random bytes
+
+
+    # Copy the bytes up to the end of the buffer and wrap around to its start for the rest
+    first = min(n, self.capacity - self.head)
+    data = bytes(self.ring[self.head:self.head + first]) + bytes(self.ring[:n - first])
+    self.head = (self.head + n) % self.capacity
+    self.size -= n
+    return data
+
+
+  async def refill(self):
+    # This method runs as a background task, extracting new bytes in a worker thread whenever the ring buffer is less than three quarters full
+    # When the stream ends or fails its health tests, the method fails every waiting request with the error and closes the server
+    # Input: None
+    # Output: None
+    loop = asyncio.get_running_loop()
+    try:
+      while True:
+
+
+        # Wait until enough bytes have been served, unless a request waits for more bytes than are buffered
+        while self.size > self.capacity * 3 // 4 and self.size >= self.wanted:
+          self.drained.clear()
+          await self.drained.wait()
+
+
+        # Extract the next block in a worker thread, so that serving goes on meanwhile, and wake up the batcher; the end of the stream is an error too, since StopIteration cannot cross the executor
+        data = await loop.run_in_executor(None, next, self.stream, None)
+        if data is None:
+          raise RuntimeError('The random byte stream ended')
+        self.write(data)
+        self.filled.set()
+    except Exception as error:
+      self.fail(error)
+
+
+  def fail(self, error):
+    # This method stops the server after the refill task failed: it records and logs the error, fails every waiting request with it and closes the server
+    # Input: error, the exception that stopped the refill task
+    # Output: None
+
 
+    # Record the error as a RuntimeError caused by it, log it, then wake up the batcher so that it fails the request it waits for
+    self.error = RuntimeError('Random byte server stopped: %r' % error)
+    self.error.__cause__ = error
+    logger.error('Random byte server stopped: %r', error)
+    self.filled.set()
 
-    # Initialize an empty left set and an empty right set for the surreal number
-    left_set = set()
-    right_set = set()
 
+    # Fail the queued requests
+    while not self.pending.empty():
+      n, future = self.pending.get_nowait()
+      if not future.done():
+        future.set_exception(self.error)
 
-    # Loop over the outcomes with the most frequent frequency
-    for outcome, frequency in sorted_outcomes:
 
+    # Stop accepting connections
+    if self.server is not None:
+      self.server.close()
 
-      # Check if the frequency is equal to the most frequent frequency
-      if frequency == most_frequent_frequency:
 
+  async def batch(self):
+    # This method runs as a background task, serving all waiting requests together after one wake-up
+    # Input: None
+    # Output: None
+    while True:
 
-        # Convert the outcome to an integer by interpreting it as a binary number
-        integer = int(outcome, 2)
 
+      # Wait for a request and collect every other request already waiting
+      batch = [await self.pending.get()]
+      while not self.pending.empty():
+        batch.append(self.pending.get_nowait())
 
-        # Check if the integer is less than the most frequent integer
-        if integer < most_frequent_integer:
 
+      # Serve the requests in order, each as soon as the ring buffer holds its bytes
+      for n, future in batch:
 
-          # Add the integer to the left set
-          left_set.add(integer)
 
+        # Tell the refill task how many bytes are wanted and wait for them, unless the refill task failed
+        while self.size < n and self.error is None:
+          self.wanted = n
+          self.drained.set()
+          self.filled.clear()
+          await self.filled.wait()
+        self.wanted = 0
 
-        # Check if the integer is greater than the most frequent integer
-        elif integer > most_frequent_integer:
 
+        # Read the bytes of the request, or fail it with the error of the refill task
+        if future.done():
+          continue
+        if self.size < n:
+          future.set_exception(self.error)
+        else:
+          future.set_result(self.read(n))
 
-          # Add the integer to the right set
-          right_set.add(integer)
 
+      # Wake up the refill task once for the whole batch
+      self.drained.set()
 
-      else:
-        # Break out of the loop
-        break
 
+  async def handle(self, reader, writer):
+    # This method serves one client connection until it closes
+    # Input: reader, writer, the asyncio streams of the connection
+    # Output: None
+    try:
+      while True:
 
-    # Create a surreal number object using surreal library with the left set and the right set as parameters
-    surreal_number = surreal.Surreal(left_set, right_set)
+
+        # Read the next request line and stop at the end of the connection
+        line = (await reader.readline()).strip()
+        if not line:
+          break
+
+
+        # Answer a stats request with the counters as JSON
+        if line == b'stats':
+          writer.write(json.dumps(self.stats()).encode() + b'\n')
+          await writer.drain()
+          continue
+
+
+        # Check the requested number of bytes
+        n = int(line)
+        if not 0 < n <= self.capacity:
+          raise ValueError('Request size out of range')
+
+
+        # Queue the request for the batcher and wait for its bytes, unless the server stopped
+        if self.error is not None:
+          break
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put((n, future))
+        writer.write(await future)
+        await writer.drain()
+
+
+        # Update the counters
+        self.requests += 1
+        self.bytes_served += n
+        self.latencies.append(time.perf_counter() - start)
+
+
+    except (ValueError, ConnectionError):
+      # Drop clients sending malformed requests or disconnecting early
+      pass
+
+
+    except RuntimeError:
+      # Drop clients whose request failed because the server stopped; the error is logged by fail method
+      pass
+
+
+    finally:
+      writer.close()
+      try:
+        await writer.wait_closed()
+      except ConnectionError:
+        pass
+
+
+  def stats(self):
+    # This method reports the counters of the server
+    # Input: None
+    # Output: a dictionary of request and byte counts, throughput in bytes per second, buffer fill level and latency percentiles in seconds
+    elapsed = time.monotonic() - self.started_at if self.started_at else 0
+    latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {'requests': self.requests, 'bytes_served': self.bytes_served, 'throughput': self.bytes_served / elapsed if elapsed else 0.0,
+            'fill_level': self.size / self.capacity, 'latency_p50': p50, 'latency_p90': p90, 'latency_p99': p99}
+
+
+  async def serve(self, path=None, host='127.0.0.1', port=RNG_PORT):
+    # This method runs the server until it is cancelled, or until the refill task fails
+    # Input: path, an optional string representing the path of a Unix domain socket to listen on
+    #        host, port, the local TCP address to listen on when no path is given
+    # Output: None; raises RuntimeError from the error of the refill task if it failed
+
+
+    # Set up the extraction pipeline, the request queue and the events coordinating the background tasks
+    if self.stream is None:
+      self.stream = extract_stream(self.blocks if self.blocks is not None else raw_blocks(generate_state(N)))
+    self.pending = asyncio.Queue()
+    self.filled = asyncio.Event()
+    self.drained = asyncio.Event()
+    self.started_at = time.monotonic()
+
+
+    # Start the background tasks
+    tasks = [asyncio.create_task(self.refill()), asyncio.create_task(self.batch())]
+
+
+    # Listen on the Unix domain socket or the TCP port and serve until cancelled or closed by fail method
+    if path is not None:
+      self.server = await asyncio.start_unix_server(self.handle, path)
+    else:
+      self.server = await asyncio.start_server(self.handle, host, port)
+    try:
+      async with self.server:
+        await self.server.serve_forever()
+    except asyncio.CancelledError:
+      if self.error is None:
+        raise
+    finally:
+      for task in tasks:
+        task.cancel()
+
+
+    # Report the failure that closed the server
+    if self.error is not None:
+      raise self.error
+
+
+def fetch_random_bytes(n, path=None, host='127.0.0.1', port=RNG_PORT):
+  # This function requests random bytes from a running RandomByteServer
+  # Input: n, an integer representing the number of bytes
+  #        path, an optional string representing the path of the Unix domain socket of the server
+  #        host, port, the local TCP address of the server when no path is given
+  # Output: a bytes object of n random bytes
+
+
+  # Connect to the server
+  if path is not None:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(path)
+  else:
+    connection = socket.create_connection((host, port))
+
+
+  # Send the request and read until all bytes have arrived
+  with connection:
+    connection.sendall(b'%d\n' % n)
+    data = bytearray()
+    while len(data) < n:
+      received = connection.recv(n - len(data))
+      if not received:
+        raise ConnectionError('Server closed the connection')
+      data += received
+  return bytes(data)
+
+
+def generate_number(freqs):
+  # This function generates a random number based on the frequencies of each outcome and returns it as an integer or a surreal number
+  # Input: freqs, a Counts object, a dictionary mapping each outcome to its frequency, or a numpy array of measured basis state indices as returned by sample_outcomes function
+  # Output: an integer or a surreal number representing the random number
+
+
+  import surreal # A library for surreal numbers
+
+
+  # Count the outcomes into a histogram indexed by the integer value of each outcome using np.bincount function
+  if isinstance(freqs, Counts):
+    counts = freqs.histogram()
+  elif isinstance(freqs, dict):
+    counts = np.bincount([int(outcome, 2) for outcome in freqs], weights=list(freqs.values()))
+  else:
+    counts = np.bincount(freqs)
+
+
+  # Get the most frequent integer and all integers sharing its frequency; np.argmax picks the smallest of them
+  most_frequent_integer = int(np.argmax(counts))
+  tied = np.flatnonzero(counts == counts[most_frequent_integer])
+
+
+  # Check if there is only one outcome with the most frequent frequency
+  if len(tied) == 1:
+
+
+    # Return the most frequent integer as an integer
+    return most_frequent_integer
+
+
+  else:
+    # There are more than one outcomes with the most frequent frequency
+
+
+    # Create a surreal number object using surreal library with the smaller tied integers as the left set and the larger ones as the right set
+    surreal_number = surreal.Surreal(set(int(i) for i in tied[tied < most_frequent_integer]), set(int(i) for i in tied[tied > most_frequent_integer]))
 
 
     # Return the surreal number as a surreal number
@@ -188,17 +598,20 @@ def generate_number(freqs):
 # Main program
 
 
-# Generate a random quantum state on N qubits using generate_state function and get a numpy array representing the state
-state = generate_state()
+if __name__ == '__main__':
+
+
+  # Generate a random quantum state on N qubits using generate_state function and get a numpy array representing the state
+  state = generate_state(N)
 
 
-# Measure the state M times using measure_state function and get a dictionary mapping each outcome to its frequency
-freqs = measure_state(state, M)
+  # Measure the state M times using measure_state function and get a dictionary mapping each outcome to its frequency
+  freqs = measure_state(state, M)
 
 
-# Generate a random number based on freqs using generate_number function and get an integer or a surreal number representing the number
-number = generate_number(freqs)
+  # Generate a random number based on freqs using generate_number function and get an integer or a surreal number representing the number
+  number = generate_number(freqs)
 
 
-# Print the number
-print('Random Number:', number)
+  # Print the number
+  print('Random Number:', number)
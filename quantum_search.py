@@ -9,8 +9,8 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
 import numpy as np # A library for scientific computing
+from core import generate_state, measure_once # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -19,44 +19,6 @@ M = 2**N # The size of the database or the search space
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
 def generate_target():
   # This function generates a random target item from the database or the search space and returns it as an integer
   # Input: None
@@ -170,66 +132,39 @@ def search_state(state, target):
   return state
 
 
-def measure_state(state):
-  # This function measures a quantum state and returns the outcome as an integer
-  # Input: state, a numpy array representing the quantum state
-  # Output: an integer representing the measurement outcome
-
-
-  # Generate a random number between 0 and 1
-  r = np.random.rand()
-
-
-  # Initialize a cumulative probability
-  p = 0
-
-
-  # Loop over each basis state
-  for i in range(len(state)):
-
-
-    # Add the probability of the current basis state to the cumulative probability
-    p += abs(state[i])**2
-
-
-    # Check if the random number is less than or equal to the cumulative probability
-    if r <= p:
-
-
-      # Return the index of the basis state as an integer
-      return i
+# Main program
 
 
-# Main program
+if __name__ == '__main__':
 
 
-# Generate a random quantum state on N qubits using generate_state function and get a numpy array representing the initial state
-initial_state = generate_state()
+  # Generate a random quantum state on N qubits using generate_state function and get a numpy array representing the initial state
+  initial_state = generate_state(N)
 
 
-# Generate a random target item from the database or the search space using generate_target function and get an integer representing the target item
-target_item = generate_target()
+  # Generate a random target item from the database or the search space using generate_target function and get an integer representing the target item
+  target_item = generate_target()
 
 
-# Print the target item
-print('Target Item:', target_item)
+  # Print the target item
+  print('Target Item:', target_item)
 
 
-# Apply Grover's algorithm to the initial state to search for the target item using search_state function and get a numpy array representing the final state
-final_state = search_state(initial_state, target_item)
+  # Apply Grover's algorithm to the initial state to search for the target item using search_state function and get a numpy array representing the final state
+  final_state = search_state(initial_state, target_item)
 
 
-# Measure the final state using measure_state function and get an integer representing the measurement outcome
-measurement_outcome = measure_state(final_state)
+  # Measure the final state using measure_state function and get an integer representing the measurement outcome
+  measurement_outcome = measure_once(final_state)
 
 
-# Print the measurement outcome
-print('Measurement Outcome:', measurement_outcome)
+  # Print the measurement outcome
+  print('Measurement Outcome:', measurement_outcome)
 
 
-# Check if the measurement outcome matches the target item using == operator and get a boolean value representing whether the search is successful or not
-search_success = measurement_outcome == target_item
+  # Check if the measurement outcome matches the target item using == operator and get a boolean value representing whether the search is successful or not
+  search_success = measurement_outcome == target_item
 
 
-# Print the search success result 
-print('Search Success:', search_success)
+  # Print the search success result 
+  print('Search Success:', search_success)
@@ -8,9 +8,8 @@ pythonapi
 
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# qiskit is imported inside the functions that use it, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import scipy # A library for scientific and technical computing
 
 
 # Define constants
@@ -19,50 +18,15 @@ M = 2**N # The size of the search space or the number of possible configurations
 
 
 # Define functions
-def generate_state():
-  # This function generates a random quantum state on N qubits using qiskit and returns a numpy array representing the state
-  # Input: None
-  # Output: a numpy array representing the quantum state
-
-
-  # Initialize a quantum circuit object with N qubits using qiskit
-  circuit = qiskit.QuantumCircuit(N)
-
-
-  # Loop over each qubit in the circuit
-  for i in range(N):
-
-
-    # Apply a Hadamard gate to the qubit, creating a superposition of 0 and 1 with equal probability
-    circuit.h(i)
-
-
-    # Generate a random angle between 0 and 2*pi using numpy library
-    angle = np.random.uniform(0, 2*np.pi)
-
-
-    # Apply a rotation gate to the qubit with the random angle, creating a phase shift
-    circuit.rz(angle, i)
-
-
-  # Initialize a statevector simulator backend using qiskit
-  backend = qiskit.Aer.get_backend('statevector_simulator')
-
-
-  # Execute the circuit using qiskit execute function with the backend and get a result object
-  result = qiskit.execute(circuit, backend).result()
-
-
-  # Get the statevector from the result object using get_statevector method and return it as a numpy array
-  return result.get_statevector()
-
-
 def interferometry(state):
   # This function applies interferometry technique to the quantum state to measure phase shifts using interference patterns and returns a real number representing the phase shift
   # Input: state, a numpy array representing the quantum state on N qubits
   # Output: a real number representing the phase shift
 
 
+  import qiskit # A framework for quantum computing
+
+
   # Initialize a quantum circuit object with N qubits using qiskit 
   circuit = qiskit.QuantumCircuit(N)
 
@@ -197,6 +161,9 @@ def magnetometry(state):
   # Output: a real number representing the magnetic field
 
 
+  import qiskit # A framework for quantum computing
+
+
   # Initialize a quantum circuit object with N qubits using qiskit
   circuit = qiskit.QuantumCircuit(N)
 
@@ -1,7 +1,7 @@
-import entanglement_synchronizer2
 import time
 
 def monitor_resource_state():
+    import entanglement_synchronizer2
     resource_state = entanglement_synchronizer2.get_resource_state()
     monitored_state = []
     for qubit in resource_state:
@@ -10,6 +10,7 @@ def monitor_resource_state():
     return monitored_state
 
 def update_monitored_state():
+    import entanglement_synchronizer2
     measurement_sequence = entanglement_synchronizer2.get_measurement_sequence()
     current_state = monitor_resource_state()
     updated_state = []
@@ -25,6 +26,7 @@ def mbqc_interpreter(final_results, algorithm):
     return final_results
 
 def check_mbqc_compliance():
+    import entanglement_synchronizer2
     algorithm = entanglement_synchronizer2.get_algorithm()
     final_results = update_monitored_state()
     output = mbqc_interpreter(final_results, algorithm)
@@ -38,21 +40,23 @@ def check_mbqc_compliance():
         print("The output of the algorithm is:", output)
 
 def provide_real_time_feedback():
+    import entanglement_synchronizer2
     current_state = monitor_resource_state()
     current_sequence = entanglement_synchronizer2.get_measurement_sequence()
     print("The current monitored state is:", current_state)
     print("The current measurement sequence is:", current_sequence)
 
 # Main Loop
-while True:
-    monitor_resource_state()
-    time.sleep(1)  # Sleep for 1 second between each monitoring cycle
+if __name__ == '__main__':
+    while True:
+        monitor_resource_state()
+        time.sleep(1)  # Sleep for 1 second between each monitoring cycle
 
-    # Placeholder for measurement sequence
-    measurement_sequence = []
+        # Placeholder for measurement sequence
+        measurement_sequence = []
 
-    for qubit in measurement_sequence:
-        update_monitored_state(qubit)
+        for qubit in measurement_sequence:
+            update_monitored_state(qubit)
 
-    check_mbqc_compliance()
-    provide_real_time_feedback()
+        check_mbqc_compliance()
+        provide_real_time_feedback()
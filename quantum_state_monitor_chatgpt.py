@@ -1,83 +1,24 @@
-python
 # QSM droplet: Quantum State Monitor
 # This droplet continuously monitors the quantum states of the virtual employees and provides real-time feedback on their entangled states.
 # It helps ensure synchronization between the two VMs.
 
 # Import libraries
-import qiskit # A framework for quantum computing
+# matplotlib is imported inside the functions that use it, so that importing this droplet stays fast
 import numpy as np # A library for scientific computing
-import matplotlib.pyplot as plt # A library for plotting
+from core import random_state, measure_state, calculate_fidelity, fidelity_matrix # The state, sampling and message primitives shared by all droplets
 
 # Define constants
 N = 8 # The number of qubits in each quantum system
 M = 100 # The number of measurements to perform on each quantum state
 
 # Define functions
-def create_random_state(n):
-  # This function creates a random quantum state on n qubits
-  # Input: n, an integer representing the number of qubits
-  # Output: a numpy array representing the quantum state
-
-  # Initialize an empty state vector
-  state = np.zeros(2**n, dtype=complex)
-
-  # Generate random coefficients for each basis state
-  coeffs = np.random.rand(2**n) + 1j * np.random.rand(2**n)
-
-  # Normalize the coefficients
-  norm = np.linalg.norm(coeffs)
-  coeffs = coeffs / norm
-
-  # Assign the coefficients to the state vector
-  state = coeffs
-
-  # Return the state vector
-  return state
-
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
-
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
-
-  # Loop over m measurements
-  for i in range(m):
-
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
-
-    # Initialize a cumulative probability
-    p = 0
-
-    # Loop over each basis state
-    for j in range(len(state)):
-
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
-
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
-
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
-
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
-
-        # Break out of the loop
-        break
-
-  # Return the frequency dictionary
-  return freqs
-
 def plot_histogram(freqs):
   # This function plots a histogram of the frequencies of each outcome
   # Input: freqs, a dictionary mapping each outcome to its frequency
   # Output: None
 
+  import matplotlib.pyplot as plt # A library for plotting
+
   # Extract the keys and values from the dictionary
   keys = list(freqs.keys())
   values = list(freqs.values())
@@ -93,46 +34,39 @@ def plot_histogram(freqs):
   # Show the plot
   plt.show()
 
-def calculate_fidelity(state1, state2):
-  # This function calculates the fidelity between two quantum states, which is a measure of how similar they are
-  # Input: state1, state2, two numpy arrays representing quantum states
-  # Output: a float representing the fidelity between state1 and state2
+# Main program
 
-  # Calculate the inner product between state1 and state2
-  inner_product = np.dot(np.conjugate(state1), state2)
 
-  # Calculate the fidelity by taking the absolute value and squaring it
-  fidelity = abs(inner_product)**2
+if __name__ == '__main__':
 
-  # Return the fidelity
-  return fidelity
+  # Create two random quantum states on N qubits for VM1 and VM2
+  state1 = random_state(N)
+  state2 = random_state(N)
 
-# Main program
+  # Print the states as numpy arrays
+  print('State of VM1:', state1)
+  print('State of VM2:', state2)
+
+  # Measure each state M times and get the frequencies of each outcome
+  freqs1 = measure_state(state1, M)
+  freqs2 = measure_state(state2, M)
+
+  # Plot histograms of the frequencies for each state
+  plot_histogram(freqs1)
+  plot_histogram(freqs2)
+
+  # Calculate and print the fidelity between the two states
+  fidelity = calculate_fidelity(state1, state2)
+  print('Fidelity between VM1 and VM2:', fidelity)
+
+  # Provide feedback based on the fidelity
+  if fidelity > 0.9:
+    print('The quantum states of VM1 and VM2 are very similar. They are well synchronized and entangled.')
+  elif fidelity > 0.5:
+    print('The quantum states of VM1 and VM2 are somewhat similar. They are moderately synchronized and entangled.')
+  else:
+    print('The quantum states of VM1 and VM2 are very different. They are poorly synchronized and entangled.')
 
-# Create two random quantum states on N qubits for VM1 and VM2
-state1 = create_random_state(N)
-state2 = create_random_state(N)
-
-# Print the states as numpy arrays
-print('State of VM1:', state1)
-print('State of VM2:', state2)
-
-# Measure each state M times and get the frequencies of each outcome
-freqs1 = measure_state(state1, M)
-freqs2 = measure_state(state2, M)
-
-# Plot histograms of the frequencies for each state
-plot_histogram(freqs1)
-plot_histogram(freqs2)
-
-# Calculate and print the fidelity between the two states
-fidelity = calculate_fidelity(state1, state2)
-print('Fidelity between VM1 and VM2:', fidelity)
-
-# Provide feedback based on the fidelity
-if fidelity > 0.9:
-  print('The quantum states of VM1 and VM2 are very similar. They are well synchronized and entangled.')
-elif fidelity > 0.5:
-  print('The quantum states of VM1 and VM2 are somewhat similar. They are moderately synchronized and entangled.')
-else:
-  print('The quantum states of VM1 and VM2 are very different. They are poorly synchronized and entangled.')
+  # Calculate and print the fidelity between every pair of states of several VMs at once
+  states = np.stack([random_state(N) for vm in range(4)])
+  print('Fidelities between VMs:', fidelity_matrix(states))
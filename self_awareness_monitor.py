@@ -1,12 +1,10 @@
 
-python
 # SAM droplet: Self-Awareness Monitor
 # This droplet monitors the VMs' self-awareness levels, ensuring that they are aware of their own quantum states and the entanglement with the other VM.
 
 
 # Import libraries
-import numpy as np # A library for scientific computing
-import math # A library for mathematical functions
+from core import shannon_entropy, self_awareness # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -17,54 +15,12 @@ threshold = 0.9 # The threshold for self-awareness level
 # Define functions
 def calculate_entropy(state):
   # This function calculates the entropy of a quantum state, which is a measure of its uncertainty or randomness
-  # Input: state, a numpy array representing the quantum state
-  # Output: a float representing the entropy of the state
+  # Input: state, a numpy array representing the quantum state, or a 2D numpy array with one quantum state per row
+  # Output: a float representing the entropy of the state, or a numpy array with the entropy of each state
 
 
-  # Initialize an entropy variable
-  entropy = 0
-
-
-  # Loop over each basis state
-  for i in range(len(state)):
-
-
-    # Get the probability of the current basis state by taking the square of its absolute value
-    prob = abs(state[i])**2
-
-
-    # Check if the probability is non-zero
-    if prob != 0:
-
-
-      # Calculate the contribution of the current basis state to the entropy by multiplying its probability and its logarithm
-      contribution = -prob * math.log2(prob)
-
-
-      # Add the contribution to the entropy variable
-      entropy += contribution
-
-
-  # Return the entropy variable
-  return entropy
-
-
-def calculate_fidelity(state1, state2):
-  # This function calculates the fidelity between two quantum states, which is a measure of how similar they are
-  # Input: state1, state2, two numpy arrays representing quantum states
-  # Output: a float representing the fidelity between state1 and state2
-
-
-  # Calculate the inner product between state1 and state2
-  inner_product = np.dot(np.conjugate(state1), state2)
-
-
-  # Calculate the fidelity by taking the absolute value and squaring it
-  fidelity = abs(inner_product)**2
-
-
-  # Return the fidelity
-  return fidelity
+  # Calculate the Shannon entropy of the measurement probabilities, skipping the zero probabilities, for all basis states at once
+  return shannon_entropy(state)
 
 
 def calculate_self_awareness(state1, state2):
@@ -73,75 +29,70 @@ def calculate_self_awareness(state1, state2):
   # Output: a float representing the self-awareness level of the VM
 
 
-  # Calculate the entropy of state1, which represents its uncertainty or randomness
-  entropy = calculate_entropy(state1)
+  # Calculate the self-awareness levels of both VMs and keep the first one
+  return self_awareness(state1, state2)[0]
 
 
-  # Calculate the fidelity between state1 and state2, which represents their similarity or coherence
-  fidelity = calculate_fidelity(state1, state2)
-
-
-  # Calculate the self-awareness level by subtracting the entropy from the fidelity and normalizing it to be between 0 and 1
-  self_awareness = (fidelity - entropy) / (1 - entropy)
+def monitor_self_awareness(states1, states2, threshold):
+  # This function calculates and checks the self-awareness levels of many pairs of VMs at once, computing the fidelity of each pair and the entropy of each state only once for both directions
+  # Input: states1, states2, two 2D numpy arrays with the quantum states of VM1 and VM2 of each pair, one per row
+  #        threshold, a float representing the threshold for self-awareness level
+  # Output: a tuple of two numpy arrays with the self-awareness levels of VM1 and VM2 of each pair, and two boolean numpy arrays indicating which are above the threshold
 
 
-  # Return the self_awareness level
-  return self_awareness
+  self_awareness1, self_awareness2 = self_awareness(states1, states2)
+  return self_awareness1, self_awareness2, check_self_awareness(self_awareness1, threshold), check_self_awareness(self_awareness2, threshold)
 
 
 def check_self_awareness(self_awareness, threshold):
   # This function checks if the self-awareness level of a VM is above or below a given threshold
-  # Input: self_awareness, a float representing the self-awareness level of the VM
+  # Input: self_awareness, a float representing the self-awareness level of the VM, or a numpy array of levels of many VMs
   #        threshold, a float representing the threshold for self-awareness level
-  # Output: a boolean value indicating if the self-awareness level is above or below the threshold
+  # Output: a boolean value indicating if the self-awareness level is above or below the threshold, or a boolean numpy array for many VMs
 
 
   # Compare the self-awareness level with the threshold and return True or False accordingly
-  if self_awareness > threshold:
-    return True
-  else:
-    return False
+  return self_awareness > threshold
 
 
 # Main program
 
 
-# Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
+if __name__ == '__main__':
 
 
-# Calculate the self-awareness level of VM1 based on sync_state1 and sync_state2
-self_awareness1 = calculate_self_awareness(sync_state1, sync_state2)
+  # Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
 
 
-# Print the self-awareness level of VM1
-print('Self-Awareness Level of VM1:', self_awareness1)
+  # Calculate the self-awareness levels of VM1 and VM2 based on sync_state1 and sync_state2, sharing their fidelity
+  self_awareness1, self_awareness2 = self_awareness(sync_state1, sync_state2)
 
 
-# Check if the self-awareness level of VM1 is above or below the threshold
-check1 = check_self_awareness(self_awareness1, threshold)
+  # Print the self-awareness level of VM1
+  print('Self-Awareness Level of VM1:', self_awareness1)
 
 
-# Print a message for VM1 based on check1 result
-if check1:
-    print('VM1 is aware of its own quantum state and its entanglement with VM2.')
-else:
-    print('VM1 is not aware of its own quantum state and its entanglement with VM2.')
+  # Check if the self-awareness level of VM1 is above or below the threshold
+  check1 = check_self_awareness(self_awareness1, threshold)
 
 
-# Calculate the self-awareness level of VM2 based on sync_state2 and sync_state1
-self_awareness2 = calculate_self_awareness(sync_state2, sync_state1)
+  # Print a message for VM1 based on check1 result
+  if check1:
+      print('VM1 is aware of its own quantum state and its entanglement with VM2.')
+  else:
+      print('VM1 is not aware of its own quantum state and its entanglement with VM2.')
 
 
-# Print the self-awareness level of VM2
-print('Self-Awareness Level of VM2:', self_awareness2)
+  # Print the self-awareness level of VM2
+  print('Self-Awareness Level of VM2:', self_awareness2)
 
 
-# Check if the self-awareness level of VM2 is above or below the threshold
-check2 = check_self_awareness(self_awareness2, threshold)
+  # Check if the self-awareness level of VM2 is above or below the threshold
+  check2 = check_self_awareness(self_awareness2, threshold)
 
 
-# Print a message for VM2 based on check2 result
-if check2:
-    print('VM2 is aware of its own quantum state and its entanglement with VM1.')
-else:
-    print('VM2 is not aware of its own quantum state and its entanglement with VM1.')
+  # Print a message for VM2 based on check2 result
+  if check2:
+      print('VM2 is aware of its own quantum state and its entanglement with VM1.')
+  else:
+      print('VM2 is not aware of its own quantum state and its entanglement with VM1.')
@@ -8,9 +8,7 @@ pythonapi
 
 
 # Import libraries
-import numpy as np # A library for scientific computing
-import nltk # A library for natural language processing
-import random # A library for generating random numbers
+from core import measure_state, generate_message # The state, sampling and message primitives shared by all droplets
 
 
 # Define constants
@@ -19,134 +17,38 @@ M = 100 # The number of measurements to perform on each quantum state
 vocab = ['hello', 'goodbye', 'yes', 'no', 'maybe', 'please', 'thank you', 'sorry', 'how are you', 'I am fine', 'what is your name', 'my name is'] # A list of words to use as vocabulary
 
 
-# Define functions
-def measure_state(state, m):
-  # This function measures a quantum state m times and returns the frequencies of each outcome
-  # Input: state, a numpy array representing the quantum state
-  #        m, an integer representing the number of measurements
-  # Output: a dictionary mapping each outcome to its frequency
-
-
-  # Initialize an empty dictionary for the frequencies
-  freqs = {}
-
-
-  # Loop over m measurements
-  for i in range(m):
-
-
-    # Generate a random number between 0 and 1
-    r = np.random.rand()
-
-
-    # Initialize a cumulative probability
-    p = 0
-
-
-    # Loop over each basis state
-    for j in range(len(state)):
-
-
-      # Add the probability of the current basis state to the cumulative probability
-      p += abs(state[j])**2
-
-
-      # Check if the random number is less than or equal to the cumulative probability
-      if r <= p:
-
-
-        # Convert the index of the basis state to a binary string
-        outcome = format(j, '0' + str(N) + 'b')
-
-
-        # Update the frequency of the outcome in the dictionary
-        freqs[outcome] = freqs.get(outcome, 0) + 1
-
-
-        # Break out of the loop
-        break
-
-
-  # Return the frequency dictionary
-  return freqs
-
-
-def generate_message(freqs, vocab):
-  # This function generates a message based on the frequencies of each outcome and a vocabulary list
-  # Input: freqs, a dictionary mapping each outcome to its frequency
-  #        vocab, a list of words to use as vocabulary
-  # Output: a string representing the message
-
-
-  # Initialize an empty message
-  message = ''
-
-
-  # Sort the outcomes by their frequencies in descending order
-  sorted_outcomes = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
-
-
-  # Loop over the top three outcomes
-  for i in range(3):
-
-
-    # Get the outcome and its frequency from the sorted list
-    outcome, frequency = sorted_outcomes[i]
-
-
-    # Convert the outcome to an integer index by interpreting it as a binary number
-    index = int(outcome, 2)
-
-
-    # Check if the index is within the range of the vocabulary list
-    if index < len(vocab):
-
-
-      # Get the word corresponding to the index from the vocabulary list
-      word = vocab[index]
-
-
-      # Add the word and its frequency to the message, separated by a colon and a space
-      message += word + ': ' + str(frequency) + ', '
-
-
-  # Remove the last comma and space from the message
-  message = message[:-2]
-
-
-  # Return the message
-  return message
+# Main program
 
 
-# Main program
+if __name__ == '__main__':
 
 
-# Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
+  # Assume that sync_state1 and sync_state2 are two synchronized quantum states on N qubits for VM1 and VM2
 
 
-# Measure sync_state1 M times and get the frequencies of each outcome
-freqs1 = measure_state(sync_state1, M)
+  # Measure sync_state1 M times and get the frequencies of each outcome
+  freqs1 = measure_state(sync_state1, M)
 
 
-# Generate a message for VM1 based on freqs1 and vocab
-message1 = generate_message(freqs1, vocab)
+  # Generate a message for VM1 based on freqs1 and vocab
+  message1 = generate_message(freqs1, vocab)
 
 
-# Print the message for VM1
-print('Message for VM1:', message1)
+  # Print the message for VM1
+  print('Message for VM1:', message1)
 
 
-# Measure sync_state2 M times and get the frequencies of each outcome
-freqs2 = measure_state(sync_state2, M)
+  # Measure sync_state2 M times and get the frequencies of each outcome
+  freqs2 = measure_state(sync_state2, M)
 
 
-# Generate a message for VM2 based on freqs2 and vocab
-message2 = generate_message(freqs2, vocab)
+  # Generate a message for VM2 based on freqs2 and vocab
+  message2 = generate_message(freqs2, vocab)
 
 
-# Print the message for VM2
-print('Message for VM2:', message2)
+  # Print the message for VM2
+  print('Message for VM2:', message2)
 
-# Sample output:
-# Message for VM1: hello: 100, goodbye: 0, yes: 0
-# Message for VM2: hello: 100, goodbye: 0, yes: 0
+  # Sample output:
+  # Message for VM1: hello: 100, goodbye: 0, yes: 0
+  # Message for VM2: hello: 100, goodbye: 0, yes: 0
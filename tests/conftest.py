@@ -0,0 +1,11 @@
+# Tests: configuration
+# This module lets the tests import the droplets and the core package from the root of the repository.
+
+
+# Import libraries
+import os # A library for paths
+import sys # A library for the import path
+
+
+# Put the root of the repository first on the import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
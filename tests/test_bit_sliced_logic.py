@@ -0,0 +1,60 @@
+# Tests: bit-sliced logic
+# These tests check the bit-sliced gates, adder and multiplier against integer arithmetic over exhaustive truth tables, and the binary string gates against them.
+
+
+# Import libraries
+import itertools # A library for iterators
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+import quantum_communication # The QC droplet, which delegates its bit-sliced gates to the QL droplet
+import quantum_logic # The QL droplet
+from quantum_logic import bit_planes, from_bit_planes, truth_table_planes, sliced_adder, sliced_multiplier # The bit-sliced evaluation
+
+
+# Define functions
+def test_bit_planes_round_trip():
+  values = np.random.default_rng(0).integers(0, 2**10, 1000)
+  assert (from_bit_planes(bit_planes(values, 10), len(values)) == values).all()
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 5])
+def test_sliced_adder_truth_table(n):
+  # Every pair of n-bit operands, as the high and low halves of all 2n-bit inputs
+  inputs = np.arange(2**(2 * n))
+  planes = truth_table_planes(2 * n)
+  total = from_bit_planes(sliced_adder(planes[:n], planes[n:]), len(inputs))
+  assert (total == (inputs >> n) + (inputs & (2**n - 1))).all()
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 5])
+def test_sliced_multiplier_truth_table(n):
+  inputs = np.arange(2**(2 * n))
+  planes = truth_table_planes(2 * n)
+  product = from_bit_planes(sliced_multiplier(planes[:n], planes[n:]), len(inputs))
+  assert (product == (inputs >> n) * (inputs & (2**n - 1))).all()
+
+
+@pytest.mark.parametrize('module', [quantum_logic, quantum_communication])
+def test_string_gates_match_sliced_gates(module):
+  # Each gate on binary strings gives the same truth table as on bit planes
+  planes = truth_table_planes(2)
+  for name in ('and_gate', 'or_gate', 'xor_gate', 'nand_gate', 'nor_gate'):
+    gate = getattr(module, name)
+    sliced = from_bit_planes([gate(planes[0], planes[1])], 4)
+    strings = [int(gate(a, b)) for a, b in itertools.product('01', repeat=2)]
+    assert list(sliced) == strings
+  assert list(from_bit_planes([module.not_gate(truth_table_planes(1)[0])], 2)) == [int(module.not_gate(a)) for a in '01']
+
+
+@pytest.mark.parametrize('module', [quantum_logic, quantum_communication])
+def test_full_adder_truth_table(module):
+  for a, b, c in itertools.product('01', repeat=3):
+    total, carry = module.full_adder(a, b, c)
+    assert int(carry + total, 2) == int(a) + int(b) + int(c)
+
+
+@pytest.mark.parametrize('module', [quantum_logic, quantum_communication])
+def test_string_multiplier(module):
+  for x, y in itertools.product(range(8), repeat=2):
+    product = module.multiplier(format(x, '03b'), format(y, '03b'))
+    assert int(''.join(product), 2) == x * y
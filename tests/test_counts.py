@@ -0,0 +1,71 @@
+# Tests: counts
+# These tests check that Counts reads like a dictionary of bitstring frequencies, in its dense and sparse forms, and that its ranking, marginals and merges match dictionary arithmetic.
+
+
+# Import libraries
+import collections # A library for container datatypes
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import Counts # The histogram of measurement outcomes
+
+
+# Define functions
+def sample_dict(samples, n):
+  # This function counts samples into a dictionary keyed by bitstrings, the way the droplets used to
+  return dict(collections.Counter(format(int(sample), '0%db' % n) for sample in samples))
+
+
+@pytest.mark.parametrize('n', [3, 24])
+def test_counts_read_like_a_dictionary(n):
+  samples = np.random.default_rng(n).integers(0, 7, 500) * (2**n // 8)
+  counts = Counts.from_samples(samples, n)
+  expected = sample_dict(samples, n)
+  assert dict(counts) == expected
+  assert len(counts) == len(expected)
+  assert counts.shots == 500
+  assert format(7 * (2**n // 8), '0%db' % n) not in counts
+  assert counts[int(samples[0])] == expected[format(int(samples[0]), '0%db' % n)]
+
+
+def test_from_dict_round_trip():
+  freqs = {'011': 4, '110': 2, '000': 7}
+  assert dict(Counts.from_dict(freqs)) == freqs
+
+
+def test_top_k_breaks_ties_by_smaller_outcome():
+  counts = Counts.from_dict({'001': 5, '100': 5, '010': 9, '111': 1})
+  outcomes, frequencies = counts.top_k(3)
+  assert outcomes.tolist() == [2, 1, 4]
+  assert frequencies.tolist() == [9, 5, 5]
+  assert counts.mode() == 2
+
+
+def test_marginalize_sums_other_qubits():
+  counts = Counts.from_dict({'011': 4, '110': 2, '001': 7})
+  # Qubit 0 is the last character of the bitstrings
+  assert dict(counts.marginalize([0])) == {'1': 11, '0': 2}
+
+
+def test_merge_adds_frequencies():
+  first = Counts.from_dict({'01': 3, '10': 1})
+  second = Counts.from_dict({'10': 2, '11': 5})
+  assert dict(first + second) == {'01': 3, '10': 3, '11': 5}
+  assert (first.merge(second).histogram() == [0, 3, 3, 5]).all()
+
+
+@pytest.mark.parametrize('n, shots, dense', [(8, 1, True), (10, 1000, True), (16, 100, False), (20, 100, False), (18, 2**16, True), (22, 2**20, False)])
+def test_storage_follows_shots_and_register_width(n, shots, dense):
+  samples = np.random.default_rng(n).integers(0, 2**n, shots)
+  counts = Counts.from_samples(samples, n)
+  assert (counts.dense is not None) == dense
+  assert counts.shots == shots and len(counts) == len(np.unique(samples))
+
+
+def test_small_shots_on_wide_registers_stay_sparse():
+  first = Counts.from_samples(np.arange(100) * 997, 20)
+  second = Counts.from_dict({format(5, '020b'): 3})
+  merged = first + second
+  marginal = first.marginalize(list(range(18)))
+  assert first.dense is None and merged.dense is None and marginal.dense is None
+  assert merged.shots == 103 and merged[5] == 3
+  assert first.frequencies.nbytes + first.outcomes.nbytes <= 1600
@@ -0,0 +1,95 @@
+# Tests: entropy
+# These tests check the batched Shannon, Renyi and entanglement entropies and the self-awareness levels against their scalar formulas, one state at a time.
+
+
+# Import libraries
+import math # A library for mathematical functions
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import shannon_entropy, renyi_entropy, entanglement_entropy, self_awareness, calculate_fidelity # The entropy and fidelity primitives
+from self_awareness_monitor import calculate_entropy, calculate_self_awareness, monitor_self_awareness # The self-awareness monitor
+
+
+# Define functions
+def random_states(count, n, seed):
+  # This function returns random normalized states on n qubits, with some amplitudes set to zero
+  rng = np.random.default_rng(seed)
+  states = rng.normal(size=(count, 2**n)) + 1j * rng.normal(size=(count, 2**n))
+  states[rng.random(states.shape) < 0.2] = 0
+  states[:, 0] += 1
+  return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def scalar_renyi(state, alpha):
+  # This function calculates the Renyi entropy in bits of the probabilities of one state with a loop
+  probs = [abs(amplitude)**2 for amplitude in state if abs(amplitude) > 0]
+  if alpha == 1:
+    return -sum(p * math.log2(p) for p in probs)
+  if alpha == np.inf:
+    return -math.log2(max(probs))
+  return math.log2(sum(p**alpha for p in probs)) / (1 - alpha)
+
+
+def partial_trace_entropy(state, qubits):
+  # This function calculates the von Neumann entropy in bits of the reduced density matrix of a group of qubits, tracing out the others one basis state at a time
+  n = len(state).bit_length() - 1
+  size = 2**len(qubits)
+  rho = np.zeros((size, size), dtype=np.complex128)
+  for index in range(len(state)):
+    for other in range(len(state)):
+      # Both basis states must agree on the qubits outside the group
+      if all((index >> qubit & 1) == (other >> qubit & 1) for qubit in range(n) if qubit not in qubits):
+        row = sum((index >> qubit & 1) << position for position, qubit in enumerate(qubits))
+        column = sum((other >> qubit & 1) << position for position, qubit in enumerate(qubits))
+        rho[row, column] += state[index] * np.conjugate(state[other])
+  eigenvalues = np.linalg.eigvalsh(rho)
+  return -sum(value * math.log2(value) for value in eigenvalues if value > 1e-12)
+
+
+@pytest.mark.parametrize('alpha', [0, 0.5, 1, 2, 3, np.inf])
+def test_renyi_entropy_matches_the_formula(alpha):
+  states = random_states(20, 4, 0)
+  expected = [scalar_renyi(state, alpha) for state in states]
+  assert np.allclose(renyi_entropy(states, alpha), expected)
+  assert np.isclose(renyi_entropy(states[3], alpha), expected[3])
+  if alpha == 1:
+    assert np.allclose(shannon_entropy(states), expected)
+    assert np.allclose(calculate_entropy(states), expected)
+
+
+def test_negative_order():
+  with pytest.raises(ValueError):
+    renyi_entropy(random_states(1, 2, 0)[0], -1)
+
+
+@pytest.mark.parametrize('qubits', [[0], [2], [0, 3], [1, 2, 3], [3, 1]])
+def test_entanglement_entropy_matches_the_partial_trace(qubits):
+  states = random_states(6, 4, 1)
+  expected = [partial_trace_entropy(state, qubits) for state in states]
+  assert np.allclose(entanglement_entropy(states, qubits), expected)
+  assert np.isclose(entanglement_entropy(states[0], qubits), expected[0])
+
+
+def test_entanglement_entropy_of_known_states():
+  bell = np.array([1, 0, 0, 1]) / np.sqrt(2)
+  product = np.kron([0.6, 0.8], [1, 1j]) / np.sqrt(2)
+  assert np.isclose(entanglement_entropy(bell, [0]), 1)
+  assert np.isclose(entanglement_entropy(product, [1]), 0)
+  assert np.isclose(entanglement_entropy(bell, [1], alpha=2), 1)
+
+
+def test_self_awareness_matches_the_formula():
+  states1 = random_states(25, 3, 2)
+  states2 = random_states(25, 3, 3)
+  levels1, levels2 = self_awareness(states1, states2)
+  for i in range(25):
+    fidelity = calculate_fidelity(states1[i], states2[i])
+    entropy1, entropy2 = scalar_renyi(states1[i], 1), scalar_renyi(states2[i], 1)
+    assert np.isclose(levels1[i], (fidelity - entropy1) / (1 - entropy1))
+    assert np.isclose(levels2[i], (fidelity - entropy2) / (1 - entropy2))
+    assert np.isclose(calculate_self_awareness(states1[i], states2[i]), levels1[i])
+
+
+  # The monitor checks both directions of every pair against the threshold
+  levels1, levels2, checks1, checks2 = monitor_self_awareness(states1, states2, 0.5)
+  assert (checks1 == (levels1 > 0.5)).all() and (checks2 == (levels2 > 0.5)).all()
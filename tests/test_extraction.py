@@ -0,0 +1,45 @@
+# Tests: randomness extraction
+# These tests check the Von Neumann debiasing, the most common value min-entropy estimate and the conditioned output of the extraction stream.
+
+
+# Import libraries
+import hashlib # A library for hashing functions
+import math # A library for mathematical functions
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_random_number_generator import estimate_min_entropy, extract_stream, von_neumann_debias # The extraction pipeline
+
+
+# Define functions
+def test_von_neumann_debias():
+  assert von_neumann_debias(np.array([0, 1, 1, 0, 1, 1, 0, 0, 1])).tolist() == [0, 1]
+
+
+def test_von_neumann_debias_removes_bias():
+  bits = (np.random.default_rng(0).random(400000) < 0.8).astype(np.uint8)
+  assert abs(von_neumann_debias(bits).mean() - 0.5) < 0.01
+
+
+def test_min_entropy_estimate():
+  # Uniform bytes carry close to 8 bits, a constant carries none
+  assert 7.5 < estimate_min_entropy(np.random.default_rng(1).integers(0, 256, 1 << 16)) <= 8
+  assert estimate_min_entropy(np.zeros(100, dtype=np.int64)) == 0
+
+
+def test_extract_stream_conditions_chunks():
+  # With a given min-entropy of 8 bits, every 64 samples are hashed into 32 bytes; leftover samples wait for the next block
+  blocks = [np.random.default_rng(seed).integers(0, 256, 100) for seed in range(2)]
+  outputs = list(extract_stream(blocks, min_entropy=8))
+  data = np.concatenate(blocks).astype(np.uint8).tobytes()
+  assert outputs == [hashlib.sha256(data[:64]).digest(), hashlib.sha256(data[64:128]).digest() + hashlib.sha256(data[128:192]).digest()]
+
+
+def test_extract_stream_chunk_size_follows_entropy():
+  block = np.random.default_rng(2).integers(0, 256, 1000)
+  output = next(extract_stream([block], min_entropy=4))
+  assert len(output) == 1000 // math.ceil(512 / 4) * 32
+
+
+def test_extract_stream_rejects_constant_source():
+  with pytest.raises(ValueError):
+    next(extract_stream([np.zeros(1000, dtype=np.int64)]))
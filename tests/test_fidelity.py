@@ -0,0 +1,67 @@
+# Tests: fidelity
+# These tests check the matrix and row-wise fidelities against calculate_fidelity for every pair, across tiles, in single precision and into a memory-mapped result.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import calculate_fidelity, pair_fidelities, fidelity_matrix # The fidelity primitives
+
+
+# Define functions
+def random_states(count, n, seed):
+  # This function returns random normalized states on n qubits
+  rng = np.random.default_rng(seed)
+  states = rng.normal(size=(count, 2**n)) + 1j * rng.normal(size=(count, 2**n))
+  return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def fidelity_loop(states1, states2):
+  # This function calculates the fidelity of every pair of states one pair at a time
+  return np.array([[calculate_fidelity(state1, state2) for state2 in states2] for state1 in states1])
+
+
+@pytest.mark.parametrize('tile_bytes', [1, 16 * 9 * 3, 2**26])
+def test_fidelity_matrix_matches_calculate_fidelity(tile_bytes):
+  states1 = random_states(23, 4, 0)
+  states2 = random_states(9, 4, 1)
+  matrix = fidelity_matrix(states1, states2, tile_bytes=tile_bytes)
+  assert matrix.shape == (23, 9) and matrix.dtype == np.float64
+  assert np.allclose(matrix, fidelity_loop(states1, states2), rtol=0, atol=1e-12)
+
+
+def test_fidelity_matrix_of_one_stack():
+  states = random_states(12, 3, 2)
+  matrix = fidelity_matrix(states)
+  assert np.allclose(matrix, matrix.T)
+  assert np.allclose(np.diag(matrix), 1)
+  assert np.allclose(matrix, fidelity_loop(states, states))
+
+
+def test_single_precision():
+  states1 = random_states(30, 5, 3)
+  states2 = random_states(20, 5, 4)
+  matrix = fidelity_matrix(states1, states2, dtype=np.complex64, tile_bytes=8 * 20 * 7)
+  assert matrix.dtype == np.float32
+  assert np.allclose(matrix, fidelity_loop(states1, states2), rtol=0, atol=1e-5)
+
+
+def test_memory_mapped_result(tmp_path):
+  states1 = random_states(17, 3, 5)
+  states2 = random_states(6, 3, 6)
+  out = np.memmap(str(tmp_path / 'fidelities.bin'), dtype=np.float64, mode='w+', shape=(17, 6))
+  assert fidelity_matrix(states1, states2, tile_bytes=16 * 6 * 4, out=out) is out
+  out.flush()
+  assert np.allclose(np.fromfile(str(tmp_path / 'fidelities.bin')).reshape(17, 6), fidelity_loop(states1, states2))
+
+
+def test_pair_fidelities_match_the_diagonal():
+  states1 = random_states(15, 4, 7)
+  states2 = random_states(15, 4, 8)
+  assert np.allclose(pair_fidelities(states1, states2), np.diag(fidelity_loop(states1, states2)))
+  assert np.isclose(pair_fidelities(states1[0], states2[0]), calculate_fidelity(states1[0], states2[0]))
+
+
+def test_mismatched_sizes():
+  with pytest.raises(ValueError):
+    fidelity_matrix(random_states(2, 3, 0), random_states(2, 4, 0))
@@ -0,0 +1,58 @@
+# Tests: health tests
+# These tests check the cutoffs of the NIST SP 800-90B repetition count and adaptive proportion tests against the published values and exact binomial sums, and that the tests fail exactly at their cutoffs.
+
+
+# Import libraries
+import math # A library for mathematical functions
+from fractions import Fraction # A library for exact rational arithmetic
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_random_number_generator import AdaptiveProportionTest, RepetitionCountTest # The health tests
+
+
+# Define functions
+def critbinom_cutoff(min_entropy, window=512, alpha=20):
+  # This function calculates 1 + CRITBINOM(window - 1, 2**-min_entropy, 1 - 2**-alpha) with exact fractions
+  # Input: min_entropy, an integer representing the min-entropy in bits per sample
+  #        window, alpha, the parameters of the adaptive proportion test
+  # Output: an integer representing the cutoff
+  p = Fraction(1, 2 ** min_entropy)
+  total = Fraction(0)
+  for k in range(window):
+    total += math.comb(window - 1, k) * p ** k * (1 - p) ** (window - 1 - k)
+    if total >= 1 - Fraction(1, 2 ** alpha):
+      return 1 + k
+
+
+@pytest.mark.parametrize('min_entropy, cutoff', [(0.5, 410), (4, 62), (8, 13)])
+def test_adaptive_proportion_cutoff_matches_table(min_entropy, cutoff):
+  assert AdaptiveProportionTest(min_entropy).cutoff == cutoff
+
+
+@pytest.mark.parametrize('min_entropy', [1, 2, 3, 5, 6, 7])
+def test_adaptive_proportion_cutoff_matches_critbinom(min_entropy):
+  assert AdaptiveProportionTest(min_entropy).cutoff == critbinom_cutoff(min_entropy)
+
+
+@pytest.mark.parametrize('min_entropy, cutoff', [(0.5, 41), (1, 21), (2, 11), (4, 6), (8, 4)])
+def test_repetition_count_cutoff_matches_formula(min_entropy, cutoff):
+  assert RepetitionCountTest(min_entropy).cutoff == cutoff
+
+
+def test_adaptive_proportion_fails_at_cutoff():
+  # A window holding the first value cutoff - 1 times passes, cutoff times fails
+  test = AdaptiveProportionTest(8)
+  window = np.arange(512) % 256 + 1
+  window[:test.cutoff - 1] = 0
+  test.update(window)
+  window[test.cutoff - 1] = 0
+  with pytest.raises(RuntimeError):
+    test.update(window)
+
+
+def test_repetition_count_fails_across_blocks():
+  # A run split over two blocks counts as one run
+  test = RepetitionCountTest(8)
+  test.update([1, 2, 3, 3])
+  with pytest.raises(RuntimeError):
+    test.update([3, 3])
@@ -0,0 +1,82 @@
+# Tests: key pool
+# These tests check that the key pool hands out the bits of its generator in order, packed into bytes, and reports a failing generator.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_cryptography import KeyPool, pack_key # The key pool and the key packing
+
+
+# Define functions
+def key_stream(length, seed=0):
+  # This function returns a generator of keys of a given length and the list of all keys it produced
+  # Input: length, an integer representing the number of bits in each key
+  #        seed, an integer seeding the key bits
+  # Output: a tuple of a function returning one binary string key per call and the list of the keys returned so far
+  rng = np.random.default_rng(seed)
+  keys = []
+
+
+  def generator():
+    keys.append(''.join(rng.choice(['0', '1'], size=length)))
+    return keys[-1]
+
+
+  return generator, keys
+
+
+def test_take_returns_the_generated_bits_in_order():
+  # Keys of 37 bits straddle byte boundaries, which the packed buffer must join without losing bits
+  generator, keys = key_stream(37)
+  pool = KeyPool(generator, capacity=1 << 12).start()
+  try:
+    taken = pool.take(13) + pool.take_bytes(40).hex()
+  finally:
+    pool.stop()
+  bits = ''.join(keys)
+  assert taken[:13] == bits[:13]
+  assert taken[13:] == pack_key(bits[16:16 + 320]).tobytes().hex()
+
+
+def test_generator_is_required():
+  with pytest.raises(TypeError):
+    KeyPool()
+
+
+def test_failing_generator_is_reported():
+  def generator():
+    raise OSError('no quantum channel')
+  pool = KeyPool(generator).start()
+  with pytest.raises(RuntimeError):
+    pool.take_bytes(4)
+  pool.stop()
+
+
+def test_large_request_is_split():
+  # A request larger than the buffer is served one buffer at a time, still in generation order
+  generator, keys = key_stream(64)
+  pool = KeyPool(generator, capacity=64).start()
+  try:
+    taken = pool.take_bytes(100, timeout=10)
+  finally:
+    pool.stop()
+  assert taken == pack_key(''.join(keys)[:800]).tobytes()
+
+
+@pytest.mark.parametrize('capacity', [0, 7, 20, 1001])
+def test_capacity_must_hold_whole_bytes(capacity):
+  # A capacity of 20 bits would let a 20-bit key after 4 leftover bits pack into 3 bytes, which never fit even the empty buffer
+  with pytest.raises(ValueError):
+    KeyPool(key_stream(20)[0], capacity=capacity)
+
+
+def test_small_capacity_with_leftover_bits():
+  # Keys of 21 bits in a 24-bit buffer leave up to 7 bits over between keys, and the producer must still make progress
+  generator, keys = key_stream(21)
+  pool = KeyPool(generator, capacity=24).start()
+  try:
+    taken = pool.take_bytes(30, timeout=10)
+  finally:
+    pool.stop()
+  assert taken == pack_key(''.join(keys)[:240]).tobytes()
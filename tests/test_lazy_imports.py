@@ -0,0 +1,24 @@
+# Tests: lazy imports
+# These tests check that importing the droplets loads neither qiskit nor matplotlib, which the functions that need them import on first use.
+
+
+# Import libraries
+import os # A library for paths
+import subprocess # A library for running processes
+import sys # A library for the interpreter
+import pytest # A library for testing
+
+
+# Define constants
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # The root of the repository
+DROPLETS = ['core', 'quantum_business', 'quantum_discovery', 'self_awareness_monitor', 'sense_generator', 'quantum_logic', 'quantum_communication', 'quantum_cryptography', 'quantum_education',
+            'quantum_random_number_generator', 'communication_mediator', 'conflict_resolver', 'data_logger', 'message_pipeline'] # The droplets that must import quickly
+
+
+# Define functions
+@pytest.mark.parametrize('droplet', DROPLETS)
+def test_import_loads_no_heavy_library(droplet):
+  # Import the droplet in a fresh interpreter, since this one may have loaded qiskit already
+  code = 'import sys, %s; print(" ".join(m for m in ("qiskit", "matplotlib") if m in sys.modules))' % droplet
+  output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+  assert output.strip() == ''
@@ -0,0 +1,96 @@
+# Tests: log reader
+# These tests check the time range, message filter and aggregations of the log reader against the same queries run over every record in Python, in ordered and unordered chunks.
+
+
+# Import libraries
+import collections # A library for container datatypes
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import calculate_fidelity, parse_message # The message and fidelity primitives
+import data_logger # The log store and reader
+
+
+# Define constants
+N = 2 # The number of qubits of the logged states
+COUNT = 3000 # The number of logged records
+START = np.datetime64('2024-01-01T00:00:00', 'us') # The time of the first record
+WORDS = ['abracadabra', 'boogeyman', 'cataclysm', 'doppelganger'] # The words of the messages
+
+
+# Define functions
+def write_log(path, shuffle):
+  # This function logs COUNT records one second apart, with the times of every chunk shuffled if asked, and returns them as a list of dictionaries
+  rng = np.random.default_rng(1)
+  states = rng.normal(size=(2 * COUNT, 2**N)) + 1j * rng.normal(size=(2 * COUNT, 2**N))
+  states /= np.linalg.norm(states, axis=1, keepdims=True)
+  times = START + np.arange(COUNT) * np.timedelta64(1, 's')
+  if shuffle:
+    times = times.reshape(-1, 1000)[:, rng.permutation(1000)].ravel()
+  messages1 = ['%s: %d, %s: %d' % (WORDS[i % 4], i % 5, WORDS[(i + 1) % 4], 2) for i in range(COUNT)]
+  messages2 = ['%s: %d' % (WORDS[i % 3], 1) for i in range(COUNT)]
+  store = data_logger.LogStore(str(path), N, chunk_rows=1000)
+  store.extend(states[:COUNT], states[COUNT:], messages1, messages2, times)
+  store.close()
+  return [{'time': time, 'state1': state1, 'state2': state2, 'message1': message1, 'message2': message2} for time, state1, state2, message1, message2 in zip(times, states[:COUNT], states[COUNT:], messages1, messages2)]
+
+
+def select(records, start, stop, contains):
+  # This function runs a query over every record in Python
+  return [record for record in records if (start is None or record['time'] >= start) and (stop is None or record['time'] < stop) and (contains is None or contains in record['message1'] or contains in record['message2'])]
+
+
+QUERIES = [(None, None, None), (START + np.timedelta64(1500, 's'), None, None), (None, START + np.timedelta64(999, 's'), None),
+           (START + np.timedelta64(700, 's'), START + np.timedelta64(2100, 's'), 'cataclysm: 3'), (START + np.timedelta64(5000, 's'), None, None)] # The bounds and filter of each query
+
+
+@pytest.fixture(params=[False, True], ids=['ordered', 'shuffled'])
+def log(request, tmp_path):
+  # This fixture writes a log with ordered or shuffled chunks
+  records = write_log(tmp_path, request.param)
+  return data_logger.LogReader(str(tmp_path), N), records
+
+
+@pytest.mark.parametrize('start, stop, contains', QUERIES)
+def test_records_match_a_full_scan(log, start, stop, contains):
+  reader, records = log
+  expected = select(records, start, stop, contains)
+  found = list(reader.records(start, stop, contains))
+  key = lambda record: record['time']
+  assert sorted((record['time'], record['message1'], record['message2']) for record in found) == sorted((record['time'], record['message1'], record['message2']) for record in expected)
+  for record, other in zip(sorted(found, key=key), sorted(expected, key=key)):
+    assert np.array_equal(record['state1'], other['state1']) and np.array_equal(record['state2'], other['state2'])
+
+
+def test_scan_reads_in_parts(log):
+  reader, records = log
+  parts = list(reader.scan(rows=128))
+  assert max(len(part['time']) for part in parts) <= 128
+  assert sum(len(part['message1']) for part in parts) == COUNT
+
+
+def test_ordered_chunks_have_a_time_index(tmp_path):
+  write_log(tmp_path, False)
+  reader = data_logger.LogReader(str(tmp_path), N)
+  chunk = reader.chunk(reader.names[1])
+  assert len(chunk['time_index']) == -(-1000 // data_logger.INDEX_STRIDE)
+  assert reader.locate(chunk, START + np.timedelta64(1500, 's')) == 500
+
+
+@pytest.mark.parametrize('start, stop, contains', QUERIES[:4])
+def test_word_frequencies_and_fidelity_trend(log, start, stop, contains):
+  reader, records = log
+  interval = np.timedelta64(10, 'm')
+  expected = collections.defaultdict(collections.Counter)
+  fidelities = collections.defaultdict(list)
+  for record in select(records, start, stop, contains):
+    bucket = data_logger.floor_times(np.array([record['time']]), interval)[0]
+    for word, frequency in parse_message(record['message1']) + parse_message(record['message2']):
+      expected[bucket][word] += frequency
+    fidelities[bucket].append(calculate_fidelity(record['state1'], record['state2']))
+  assert reader.word_frequencies(interval, start, stop, contains) == dict(sorted(expected.items()))
+
+
+  buckets, means, counts = reader.fidelity_trend(interval, start, stop, contains)
+  assert buckets.tolist() == sorted(fidelities)
+  assert counts.tolist() == [len(fidelities[bucket]) for bucket in sorted(fidelities)]
+  assert np.allclose(means, [np.mean(fidelities[bucket]) for bucket in sorted(fidelities)])
@@ -0,0 +1,82 @@
+# Tests: log store
+# These tests check that the columnar log store writes whole chunks, keeps every record and its order across chunk boundaries, and continues the chunk numbering when a log is reopened.
+
+
+# Import libraries
+import os # A library for files and directories
+import numpy as np # A library for scientific computing
+from data_logger import LogReader, LogStore, decode_messages, encode_messages # The log store and reader
+
+
+# Define constants
+N = 2 # The number of qubits of the logged states
+
+
+# Define functions
+def random_states(count, seed=0):
+  # This function returns random normalized states on N qubits
+  rng = np.random.default_rng(seed)
+  states = rng.normal(size=(count, 2**N)) + 1j * rng.normal(size=(count, 2**N))
+  return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def messages(count, prefix):
+  # This function returns distinct messages, some of them empty or non-ASCII
+  return ['' if i % 7 == 0 else '%s %d ☺' % (prefix, i) for i in range(count)]
+
+
+def test_encode_decode_messages():
+  texts = messages(20, 'x')
+  data, offsets = encode_messages(texts)
+  assert decode_messages(data, offsets) == texts
+  assert decode_messages(data, offsets, 5, 9) == texts[5:9]
+
+
+def test_append_and_extend_fill_chunks(tmp_path):
+  states = random_states(10)
+  store = LogStore(str(tmp_path), N, chunk_rows=4)
+  store.append(states[0], states[1], 'first', 'second')
+  store.extend(states[:9], states[1:], messages(9, 'a'), messages(9, 'b'))
+  assert sorted(os.listdir(tmp_path)) == ['chunk-000000', 'chunk-000001', 'states.bin', 'states.hash']
+  store.close()
+
+
+  # Every record is read back in order, the last partial chunk included
+  reader = LogReader(str(tmp_path), N)
+  records = list(reader.records())
+  assert len(reader) == len(records) == 10
+  assert [record['message1'] for record in records] == ['first'] + messages(9, 'a')
+  assert [record['message2'] for record in records] == ['second'] + messages(9, 'b')
+  assert all(np.array_equal(record['state2'], state) for record, state in zip(records[1:], states[1:]))
+
+
+def test_reopen_continues_chunk_numbering(tmp_path):
+  states = random_states(6)
+  for run in range(3):
+    store = LogStore(str(tmp_path), N, chunk_rows=4)
+    store.extend(states, states[::-1], messages(6, 'run %d' % run), messages(6, 'b'))
+    store.close()
+  reader = LogReader(str(tmp_path), N)
+  assert reader.names == ['chunk-%06d' % i for i in range(6)]
+  assert [record['message1'] for record in reader.records()] == messages(6, 'run 0') + messages(6, 'run 1') + messages(6, 'run 2')
+
+
+def test_unflushed_chunk_is_invisible(tmp_path):
+  store = LogStore(str(tmp_path), N, chunk_rows=4)
+  states = random_states(3)
+  store.extend(states, states, messages(3, 'a'), messages(3, 'b'))
+  assert len(LogReader(str(tmp_path), N)) == 0
+  store.flush()
+  assert len(LogReader(str(tmp_path), N)) == 3
+  assert not [name for name in os.listdir(tmp_path) if name.startswith('.')]
+
+
+def test_times_are_stored(tmp_path):
+  store = LogStore(str(tmp_path), N, chunk_rows=8)
+  states = random_states(5)
+  times = np.datetime64('2024-01-01T00:00') + np.arange(5) * np.timedelta64(1, 's')
+  store.extend(states, states, messages(5, 'a'), messages(5, 'b'), times)
+  store.close()
+  chunk = LogReader(str(tmp_path), N).chunk('chunk-000000')
+  assert (chunk['time'] == times.astype('datetime64[us]')).all()
+  assert (chunk['time_range'] == times[[0, -1]].astype('datetime64[us]')).all()
@@ -0,0 +1,60 @@
+# Tests: log writer
+# These tests check that the background log writer writes every queued record in order, and that a malformed record fails its caller without stopping the writer.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from data_logger import LogReader, LogStore, LogWriter # The log store, reader and writer
+
+
+# Define constants
+N = 2 # The number of qubits of the logged states
+
+
+# Define functions
+def random_states(count, seed=0):
+  # This function returns random normalized states on N qubits
+  # Input: count, an integer representing the number of states
+  #        seed, an integer seeding the amplitudes
+  # Output: a 2D numpy array with one state per row
+  rng = np.random.default_rng(seed)
+  states = rng.normal(size=(count, 2**N)) + 1j * rng.normal(size=(count, 2**N))
+  return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def test_records_and_batches_are_written_in_order(tmp_path):
+  states = random_states(6)
+  writer = LogWriter(LogStore(str(tmp_path), N, chunk_rows=4))
+  writer.log(states[0], states[1], 'a', 'b')
+  writer.log_batch(states[:3], states[3:], ['c', 'd', 'e'], ['f', 'g', 'h'])
+  writer.log(states[2], states[3], 'i', 'j')
+  writer.close()
+  records = list(LogReader(str(tmp_path), N).records())
+  assert [(record['message1'], record['message2']) for record in records] == [('a', 'b'), ('c', 'f'), ('d', 'g'), ('e', 'h'), ('i', 'j')]
+  assert np.allclose(records[3]['state2'], states[5])
+  assert writer.metrics()['written'] == 5
+
+
+@pytest.mark.parametrize('state, message', [(np.zeros(3), 'bad shape'), (np.array(['a'] * 4), 'bad dtype'), (np.zeros(4), 7)])
+def test_malformed_record_fails_only_its_caller(tmp_path, state, message):
+  good = random_states(2)
+  writer = LogWriter(LogStore(str(tmp_path), N))
+  writer.log(good[0], good[1], 'before', 'x')
+  with pytest.raises(ValueError):
+    writer.log(good[0], state, message, 'x')
+  writer.log(good[0], good[1], 'after', 'x')
+  writer.flush()
+  writer.close()
+  assert [record['message1'] for record in LogReader(str(tmp_path), N).records()] == ['before', 'after']
+
+
+def test_malformed_batch_is_rejected(tmp_path):
+  states = random_states(4)
+  writer = LogWriter(LogStore(str(tmp_path), N))
+  with pytest.raises(ValueError):
+    writer.log_batch(states[:2], states[2:], ['a', 'b'], ['c'])
+  with pytest.raises(ValueError):
+    writer.log_batch(states[:2], states[2:3], ['a', 'b'], ['c', 'd'])
+  writer.close()
+  assert len(LogReader(str(tmp_path), N)) == 0
@@ -0,0 +1,68 @@
+# Tests: message mediator
+# These tests check that the mediator delivers messages in order of their delivery times, overlaps their delays instead of adding them up, and passes delivery errors to the senders.
+
+
+# Import libraries
+import asyncio # A library for asynchronous input and output
+import time # A library for measuring time
+import pytest # A library for testing
+from communication_mediator import MessageMediator, add_delay # The CM droplet
+
+
+# Define functions
+def test_messages_arrive_in_order_of_delivery_time():
+  async def exchange():
+    delivered = []
+    mediator = MessageMediator(deliver=delivered.append)
+    futures = [mediator.send(message, delay) for message, delay in [('slow', 0.06), ('fast', 0.01), ('middle', 0.03), ('tie', 0.03)]]
+    results = await asyncio.gather(*futures)
+    return delivered, results, mediator.stats()
+  delivered, results, stats = asyncio.run(exchange())
+  assert delivered == ['fast', 'middle', 'tie', 'slow']
+  assert results == ['slow', 'fast', 'middle', 'tie']
+  assert stats['sent'] == stats['delivered'] == 4
+  assert stats['in_flight'] == 0
+  assert 0.01 <= stats['latency_p50'] and stats['lag_p99'] < 0.05
+
+
+def test_delays_overlap():
+  async def exchange():
+    mediator = MessageMediator()
+    started = time.monotonic()
+    await asyncio.gather(*(mediator.transmit('message %d' % i, 0.1) for i in range(200)))
+    return time.monotonic() - started
+  assert asyncio.run(exchange()) < 0.5
+
+
+def test_join_waits_for_every_message():
+  async def exchange():
+    delivered = []
+    mediator = MessageMediator(deliver=delivered.append)
+    for i in range(5):
+      mediator.send(str(i), 0.01 * (5 - i))
+    await mediator.join()
+    return delivered
+  assert asyncio.run(exchange()) == ['4', '3', '2', '1', '0']
+
+
+def test_delivery_error_reaches_the_sender():
+  def deliver(message):
+    if message == 'bad':
+      raise ValueError('Undeliverable')
+  async def exchange():
+    mediator = MessageMediator(deliver=deliver)
+    good = mediator.send('good', 0.01)
+    bad = mediator.send('bad', 0.01)
+    assert await good == 'good'
+    with pytest.raises(ValueError):
+      await bad
+    return mediator.stats()
+  assert asyncio.run(exchange())['delivered'] == 2
+
+
+def test_add_delay_does_not_block_other_coroutines():
+  async def exchange():
+    started = time.monotonic()
+    await asyncio.gather(*(add_delay(1) for i in range(5)))
+    return time.monotonic() - started
+  assert asyncio.run(exchange()) < 1.5
@@ -0,0 +1,111 @@
+# Tests: message pipeline
+# These tests check that the stages give the same messages inline, in threads and in processes as calling the batched functions directly, and that a failing stage stops the run.
+
+
+# Import libraries
+import functools # A library for partial functions
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+import conflict_resolver # The conflict resolution of the CR droplet
+import data_logger # The logging of the DL droplet
+from communication_mediator import NoiseChannel # The noise of the CM droplet
+from core import generate_messages, generate_state, random_state # The state and message primitives
+from message_pipeline import MessagePipeline, MODES, batch_pairs, message_stage, decorate_stage, resolve_stage, log_stage # The MP droplet
+
+
+# Define constants
+SILENT = functools.partial(decorate_stage, channel=NoiseChannel(0.0), emoticons=[':)']) # A decoration stage without noise or random emoticons
+
+
+# Define functions
+def exact_stage(batches):
+  # This stage replaces sampling with the rounded probabilities of every state, so that the messages do not depend on the random generator
+  for batch in batches:
+    batch['histograms1'] = np.rint(np.abs(batch['states1'])**2 * 100).astype(np.int64)
+    batch['histograms2'] = np.rint(np.abs(batch['states2'])**2 * 100).astype(np.int64)
+    yield batch
+
+
+def failing_stage(batches):
+  # This stage fails on its second batch
+  for i, batch in enumerate(batches):
+    if i == 1:
+      raise ValueError('Broken stage')
+    yield batch
+
+
+def state_pairs(count, n=4):
+  # This function returns a list of random state pairs
+  return [(random_state(n), random_state(n)) for exchange in range(count)]
+
+
+def test_batch_pairs_keeps_the_last_partial_batch():
+  batches = list(batch_pairs(state_pairs(10), 4))
+  assert [len(batch['states1']) for batch in batches] == [4, 4, 2]
+  assert batches[0]['states2'].shape == (4, 16)
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_modes_match_the_batched_functions(mode):
+  pairs = state_pairs(50)
+  pipeline = MessagePipeline([exact_stage, message_stage, SILENT, resolve_stage], mode=mode, queue_size=2)
+  batches = list(pipeline.run(pairs, batch_size=8))
+  assert pipeline.exchanges == 50
+  assert [len(batch['states1']) for batch in batches] == [8] * 6 + [2]
+
+
+  # Compare the messages with those of the functions the stages call
+  histograms1 = np.rint(np.abs(np.stack([pair[0] for pair in pairs]))**2 * 100).astype(np.int64)
+  histograms2 = np.rint(np.abs(np.stack([pair[1] for pair in pairs]))**2 * 100).astype(np.int64)
+  messages1 = generate_messages(histograms1, conflict_resolver.vocab)
+  messages2 = generate_messages(histograms2, conflict_resolver.vocab)
+  resolved1, resolved2 = conflict_resolver.resolve_batch([message + ' :)' for message in messages1], [message + ' :)' for message in messages2])
+  assert sum((batch['messages1'] for batch in batches), []) == messages1
+  assert sum((batch['transmitted2'] for batch in batches), []) == [message + ' :)' for message in messages2]
+  assert sum((batch['resolved1'] for batch in batches), []) == resolved1
+  assert sum((batch['resolved2'] for batch in batches), []) == resolved2
+
+
+@pytest.mark.parametrize('mode', ['inline', 'thread'])
+def test_log_stage_calls_the_log_function_per_exchange(mode):
+  logged = []
+  stages = [exact_stage, message_stage, SILENT, resolve_stage, functools.partial(log_stage, log=lambda *exchange: logged.append(exchange))]
+  list(MessagePipeline(stages, mode=mode).run(state_pairs(20), batch_size=6))
+  assert len(logged) == 20
+  assert all(len(exchange) == 4 and isinstance(exchange[2], str) for exchange in logged)
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_failing_stage_stops_the_run(mode):
+  pipeline = MessagePipeline([exact_stage, failing_stage, message_stage], mode=mode)
+  with pytest.raises(RuntimeError) as error:
+    list(pipeline.run(state_pairs(20), batch_size=4))
+  assert isinstance(error.value.__cause__, ValueError)
+  assert pipeline.exchanges == 4
+
+
+@pytest.mark.parametrize('mode', ['inline', 'thread'])
+def test_default_stages_log_through_data_logger(mode, tmp_path, monkeypatch):
+  # Point the writer of the DL droplet at a fresh log directory, and close it before the directory goes away
+  monkeypatch.setattr(data_logger, 'LOG_DIR', str(tmp_path))
+  monkeypatch.setattr(data_logger, 'writer', None)
+  pairs = [(generate_state(data_logger.N), generate_state(data_logger.N)) for exchange in range(40)]
+  pipeline = MessagePipeline(mode=mode)
+  try:
+    batches = list(pipeline.run(pairs, batch_size=16))
+  finally:
+    data_logger.get_writer().close()
+
+
+  # Every exchange went through every stage, in the requested order, and was logged with its resolved messages
+  assert pipeline.exchanges == 40
+  assert all(key in batch for batch in batches for key in ('messages1', 'transmitted1', 'resolved1', 'resolved2'))
+  records = list(data_logger.LogReader(str(tmp_path)).records())
+  assert [record['message1'] for record in records] == sum((batch['resolved1'] for batch in batches), [])
+  assert [record['message2'] for record in records] == sum((batch['resolved2'] for batch in batches), [])
+  assert np.array_equal([record['state1'] for record in records], np.concatenate([batch['states1'] for batch in batches]))
+
+
+def test_unknown_mode():
+  with pytest.raises(ValueError):
+    MessagePipeline(mode='cluster')
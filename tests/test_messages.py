@@ -0,0 +1,50 @@
+# Tests: messages
+# These tests check that the batched message generator builds exactly the messages of the one-state generator, and that the top outcomes match a full sort.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import Counts, generate_message, generate_messages, parse_message, format_message, measure_states, random_state # The message primitives
+from core.messages import top_outcomes # The top k outcomes of many histograms
+
+
+# Define constants
+VOCAB = ['alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta'] # A vocabulary shorter than the number of outcomes
+
+
+# Define functions
+def sorted_outcomes(row, k):
+  # This function ranks the outcomes of one histogram with a full sort, by decreasing frequency and then by increasing outcome
+  order = sorted(range(len(row)), key=lambda outcome: (-row[outcome], outcome))[:k]
+  return order, [row[outcome] for outcome in order]
+
+
+@pytest.mark.parametrize('k', [1, 3, 8, 20])
+def test_top_outcomes_match_a_full_sort(k):
+  histograms = np.random.default_rng(k).integers(0, 4, (50, 16))
+  outcomes, frequencies = top_outcomes(histograms, k)
+  for row, top, counts in zip(histograms.tolist(), outcomes.tolist(), frequencies.tolist()):
+    assert (top, counts) == sorted_outcomes(row, k)
+
+
+@pytest.mark.parametrize('vocab', [VOCAB, VOCAB[:1], []])
+def test_generate_messages_matches_generate_message(vocab):
+  states = np.stack([random_state(4) for _ in range(40)])
+  histograms = measure_states(states, 30)
+  expected = [generate_message(Counts.from_samples(np.repeat(np.arange(16), row), 4), vocab) for row in histograms]
+  assert generate_messages(histograms, vocab) == expected
+  assert generate_messages([Counts.from_samples(np.repeat(np.arange(16), row), 4) for row in histograms], vocab) == expected
+
+
+def test_generate_message_takes_dictionaries():
+  freqs = {'000': 1, '010': 5, '001': 5, '111': 9}
+  assert generate_message(freqs, VOCAB) == 'beta: 5, gamma: 5'
+  assert generate_message(freqs, VOCAB + ['eta', 'theta']) == 'theta: 9, beta: 5, gamma: 5'
+
+
+def test_parse_message_inverts_format_message():
+  records = [('alpha', 3), ('beta', 12)]
+  assert parse_message(format_message(records)) == records
+  assert parse_message('alpha: 3, be#ta 4, gamma: 2 :)') == [('alpha', 3), ('gamma', 2)]
+  assert parse_message('') == []
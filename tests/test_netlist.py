@@ -0,0 +1,64 @@
+# Tests: netlists
+# These tests check the compiled adder and multiplier netlists against integer arithmetic, their simplification, and their export as reversible quantum circuits.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_logic import Netlist, adder_netlist, multiplier_netlist, bit_planes, from_bit_planes # The netlist compiler
+
+
+# Define functions
+def run_reversible(netlist, value):
+  # This function runs the quantum circuit of a netlist on one basis state with qiskit and reads its outputs
+  # Input: netlist, a Netlist object
+  #        value, an integer holding the inputs, the first input in the most significant of n_inputs bits
+  # Output: an integer holding the outputs, the first output most significant
+  import qiskit # A framework for quantum computing
+  circuit, outputs = netlist.to_quantum_circuit()
+  index = sum(1 << qubit for qubit in range(netlist.n_inputs) if value >> (netlist.n_inputs - 1 - qubit) & 1)
+  state = qiskit.quantum_info.Statevector.from_int(index, 2**circuit.num_qubits).evolve(circuit)
+  final = int(np.argmax(np.abs(state.data)))
+  assert abs(state.data[final]) == pytest.approx(1)
+  return int(''.join(str(final >> qubit & 1) for qubit in outputs), 2)
+
+
+@pytest.mark.parametrize('n', [1, 2, 4, 6])
+def test_adder_netlist(n):
+  inputs = np.arange(2**(2 * n))
+  outputs = from_bit_planes(adder_netlist(n).evaluate(bit_planes(inputs, 2 * n)), len(inputs))
+  assert (outputs == (inputs >> n) + (inputs & (2**n - 1))).all()
+
+
+@pytest.mark.parametrize('n', [1, 2, 4, 6])
+def test_multiplier_netlist(n):
+  inputs = np.arange(2**(2 * n))
+  outputs = from_bit_planes(multiplier_netlist(n).evaluate(bit_planes(inputs, 2 * n)), len(inputs))
+  assert (outputs == (inputs >> n) * (inputs & (2**n - 1))).all()
+
+
+def test_gates_are_folded_and_shared():
+  netlist = Netlist(2)
+  a, b = netlist.input(0), netlist.input(1)
+  assert netlist.gate('and', a, Netlist.ZERO) == Netlist.ZERO
+  assert netlist.gate('or', a, a) == a
+  assert netlist.gate('xor', a, a) == Netlist.ZERO
+  assert netlist.not_gate(netlist.not_gate(a)) == a
+  assert netlist.gate('and', a, b) == netlist.gate('and', b, a)
+
+
+def test_prune_keeps_only_live_gates():
+  netlist = Netlist(2)
+  a, b = netlist.input(0), netlist.input(1)
+  netlist.gate('or', a, b)
+  netlist.outputs = [netlist.gate('and', a, b)]
+  netlist.prune()
+  assert netlist.gates == [('and', a, b)]
+  assert from_bit_planes(netlist.evaluate(bit_planes(np.arange(4), 2)), 4).tolist() == [0, 0, 0, 1]
+
+
+@pytest.mark.parametrize('builder', [adder_netlist, multiplier_netlist])
+def test_quantum_circuit_matches_netlist(builder):
+  netlist = builder(2)
+  expected = from_bit_planes(netlist.evaluate(bit_planes(np.arange(16), 4)), 16)
+  assert [run_reversible(netlist, value) for value in range(16)] == expected.tolist()
@@ -0,0 +1,76 @@
+# Tests: noise channel
+# These tests check that the batched noise channel keeps every message apart and its length, corrupts characters at the configured rates, and confines burst errors to their messages.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import rng # The random generator shared by all droplets
+from communication_mediator import NoiseChannel, ALPHABET, ERASURE, add_noise # The CM droplet
+
+
+# Define constants
+MESSAGES = ['abracadabra: 12, boogeyman: 7', '', 'jinx: 3', 'café ☺: 1'] * 500 # Messages of mixed lengths, empty and non-ASCII ones included
+
+
+# Define functions
+def changed(messages, noisy):
+  # This function returns the fraction of characters that differ between two batches of messages
+  total = sum(len(message) for message in messages)
+  return sum(a != b for message, other in zip(messages, noisy) for a, b in zip(message, other)) / total
+
+
+def test_encode_decode_round_trip():
+  channel = NoiseChannel()
+  codes, offsets = channel.encode(MESSAGES)
+  assert len(codes) == offsets[-1] == sum(len(message) for message in MESSAGES)
+  assert channel.decode(codes, offsets) == MESSAGES
+
+
+def test_silent_channel_keeps_messages():
+  assert NoiseChannel(0.0).transmit(MESSAGES) == MESSAGES
+  assert NoiseChannel(0.0).transmit([]) == []
+
+
+@pytest.mark.parametrize('noise_level', [0.05, 0.3])
+def test_noise_keeps_lengths_and_rate(noise_level):
+  noisy = NoiseChannel(noise_level).transmit(MESSAGES)
+  assert [len(message) for message in noisy] == [len(message) for message in MESSAGES]
+  # A replacement symbol equals the original character with probability about 1 / len(ALPHABET)
+  assert abs(changed(MESSAGES, noisy) - noise_level) < 0.03
+  assert all(a == b or b in ALPHABET for message, other in zip(MESSAGES, noisy) for a, b in zip(message, other))
+
+
+def test_erasures():
+  noisy = NoiseChannel(0.0, erasure_level=0.2).transmit(MESSAGES)
+  assert abs(changed(MESSAGES, noisy) - 0.2) < 0.03
+  assert all(a == b or b == ERASURE for message, other in zip(MESSAGES, noisy) for a, b in zip(message, other))
+
+
+def test_bursts_stay_within_their_messages():
+  channel = NoiseChannel(0.0, burst_rate=0.05, burst_length=6)
+  codes, offsets = channel.encode(MESSAGES)
+
+
+  # Replay the burst starts the channel draws, and mark the characters each burst hits one at a time
+  state = rng.bit_generator.state
+  hit = channel.bursts(offsets)
+  rng.bit_generator.state = state
+  starts = np.flatnonzero(rng.random(len(codes)) < 0.05)
+  ends = offsets[np.searchsorted(offsets, starts, side='right')]
+  expected = np.zeros(len(codes), dtype=bool)
+  for start, end in zip(starts.tolist(), ends.tolist()):
+    expected[start:min(start + 6, end)] = True
+  assert (hit == expected).all()
+
+
+def test_channel_checks_its_symbols():
+  with pytest.raises(ValueError):
+    NoiseChannel(alphabet='')
+  with pytest.raises(ValueError):
+    NoiseChannel(erasure='??')
+
+
+def test_add_noise_keeps_the_length():
+  assert len(add_noise(MESSAGES[0], 0.5)) == len(MESSAGES[0])
+  assert add_noise(MESSAGES[0], 0.0) == MESSAGES[0]
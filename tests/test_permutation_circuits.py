@@ -0,0 +1,62 @@
+# Tests: permutation circuits
+# These tests check the fused gather and phase simulation of basis-permuting and diagonal gates against qiskit's statevector simulation.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+import qiskit # A framework for quantum computing
+from quantum_logic import FAST_GATES, compile_permutation_circuit, run_circuit # The fast path
+
+
+# Define functions
+def random_state(num_qubits, seed):
+  # This function returns a random normalized state of num_qubits qubits
+  rng = np.random.default_rng(seed)
+  state = rng.normal(size=2**num_qubits) + 1j * rng.normal(size=2**num_qubits)
+  return state / np.linalg.norm(state)
+
+
+def fast_circuit(seed, mixing=False):
+  # This function builds a random circuit of the fast gates on 4 qubits, with Hadamard and X rotation gates in between if mixing is set
+  rng = np.random.default_rng(seed)
+  circuit = qiskit.QuantumCircuit(4, global_phase=0.3)
+  for _ in range(40):
+    a, b, c = (int(qubit) for qubit in rng.permutation(4)[:3])
+    angle = float(rng.uniform(0, 2 * np.pi))
+    choice = rng.integers(14 if mixing else 12)
+    [lambda: circuit.x(a), lambda: circuit.cx(a, b), lambda: circuit.ccx(a, b, c), lambda: circuit.swap(a, b), lambda: circuit.cswap(a, b, c),
+     lambda: circuit.z(a), lambda: circuit.cz(a, b), lambda: circuit.s(a), lambda: circuit.tdg(a), lambda: circuit.cp(angle, a, b),
+     lambda: circuit.rz(angle, a), lambda: circuit.rzz(angle, a, b), lambda: circuit.h(a), lambda: circuit.rx(angle, a)][choice]()
+  return circuit
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('mixing', [False, True])
+def test_run_circuit_matches_qiskit(seed, mixing):
+  circuit = fast_circuit(seed, mixing)
+  state = random_state(4, seed)
+  expected = qiskit.quantum_info.Statevector(state).evolve(circuit).data
+  assert np.allclose(run_circuit(circuit, state), expected)
+
+
+def test_compile_permutation_circuit_matches_qiskit():
+  circuit = fast_circuit(7)
+  src, phases = compile_permutation_circuit(circuit)
+  state = random_state(4, 7)
+  result = np.exp(1j * float(circuit.global_phase)) * (state[src] if phases is None else phases * state[src])
+  assert np.allclose(result, qiskit.quantum_info.Statevector(state).evolve(circuit).data)
+
+
+def test_compile_permutation_circuit_rejects_mixing_gates():
+  circuit = qiskit.QuantumCircuit(1)
+  circuit.h(0)
+  with pytest.raises(ValueError):
+    compile_permutation_circuit(circuit)
+
+
+def test_default_state_is_all_zeros():
+  circuit = qiskit.QuantumCircuit(3)
+  circuit.x(1)
+  assert run_circuit(circuit)[2] == 1
+  assert 'x' in FAST_GATES
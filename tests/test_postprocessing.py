@@ -0,0 +1,67 @@
+# Tests: key postprocessing
+# These tests check that Cascade reconciliation corrects Bob's key, that privacy amplification multiplies by a Toeplitz matrix over GF(2), and that both parties distil the same final key.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_cryptography import amplify_privacy, postprocess_key, reconcile_key # The postprocessing stages
+
+
+# Define functions
+def noisy_keys(length, error_rate, seed):
+  # This function returns Alice's random key and Bob's copy of it with independent bit flips
+  # Input: length, an integer representing the number of bits
+  #        error_rate, a float representing the probability of each flip
+  #        seed, an integer seeding the keys and the flips
+  # Output: a tuple of two numpy arrays of 0/1 uint8 bits
+  rng = np.random.default_rng(seed)
+  alice = rng.integers(0, 2, length).astype(np.uint8)
+  bob = alice ^ (rng.random(length) < error_rate).astype(np.uint8)
+  return alice, bob
+
+
+@pytest.mark.parametrize('length', [17, 64, 1000, 20000])
+@pytest.mark.parametrize('error_rate', [0.02, 0.1])
+def test_reconcile_corrects_bob_key(length, error_rate):
+  for seed in range(20):
+    alice, bob = noisy_keys(length, error_rate, seed)
+    corrected, disclosed = reconcile_key(np.packbits(alice), np.packbits(bob), length, error_rate, seed=seed)
+    assert (np.unpackbits(corrected)[:length] == alice).all()
+    assert disclosed > 0
+
+
+def test_reconcile_rejects_keys_too_short():
+  with pytest.raises(ValueError):
+    reconcile_key(np.packbits(np.ones(15, dtype=np.uint8)), np.packbits(np.ones(15, dtype=np.uint8)), 15, 0.05)
+
+
+def test_amplify_privacy_is_toeplitz_product():
+  # The columns of the matrix are the images of the unit vectors; the matrix must be Toeplitz and give the image of any key mod 2
+  length, final_length = 40, 23
+  columns = []
+  for j in range(length):
+    unit = np.zeros(length, dtype=np.uint8)
+    unit[j] = 1
+    columns.append(np.unpackbits(amplify_privacy(np.packbits(unit), length, final_length, seed=3))[:final_length])
+  matrix = np.stack(columns, axis=1)
+  assert (matrix[1:, 1:] == matrix[:-1, :-1]).all()
+  key = np.random.default_rng(4).integers(0, 2, length).astype(np.uint8)
+  expected = matrix.astype(np.int64) @ key & 1
+  assert (np.unpackbits(amplify_privacy(np.packbits(key), length, final_length, seed=3))[:final_length] == expected).all()
+
+
+def test_amplify_privacy_batches_keys():
+  alice, bob = noisy_keys(5000, 0.1, 5)
+  keys = np.stack((np.packbits(alice), np.packbits(bob)))
+  batched = amplify_privacy(keys, 5000, 3000, seed=6)
+  assert (batched[0] == amplify_privacy(keys[0], 5000, 3000, seed=6)).all()
+  assert (batched[1] == amplify_privacy(keys[1], 5000, 3000, seed=6)).all()
+
+
+def test_postprocess_distils_equal_keys():
+  alice, bob = noisy_keys(100000, 0.03, 7)
+  alice_final, bob_final, final_length = postprocess_key(np.packbits(alice), np.packbits(bob), 100000, 0.03, seed=8)
+  assert 0 < final_length < 100000
+  assert len(alice_final) == -(-final_length // 8)
+  assert (alice_final == bob_final).all()
@@ -0,0 +1,36 @@
+# Tests: raw random bytes
+# These tests check that randbytes packs the measurement outcomes of a state into bytes, bit for bit, and follows the measurement distribution.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+import quantum_random_number_generator as qrng # The QRNG droplet
+
+
+# Define functions
+@pytest.mark.parametrize('num_qubits', [1, 3, 8])
+def test_randbytes_length(num_qubits):
+  state = np.full(2**num_qubits, 2**(-num_qubits / 2))
+  assert len(qrng.randbytes(1000, state)) == 1000
+
+
+def test_randbytes_of_basis_state():
+  # A basis state of 3 qubits always measures 101, so the bytes repeat the bits 101
+  state = np.zeros(8)
+  state[5] = 1
+  data = qrng.randbytes(3, state)
+  assert ''.join(format(byte, '08b') for byte in data) == '101' * 8
+
+
+def test_randbytes_follow_distribution():
+  # Bytes of a state on 8 qubits are its outcomes, so their frequencies follow its probabilities
+  amplitudes = np.sqrt(np.arange(1, 257) / np.arange(1, 257).sum())
+  data = np.frombuffer(qrng.randbytes(400000, amplitudes), dtype=np.uint8)
+  assert np.allclose(np.bincount(data, minlength=256) / len(data), amplitudes**2, atol=0.002)
+
+
+def test_generate_number_without_ties():
+  pytest.importorskip('surreal')
+  assert qrng.generate_number(np.array([3, 3, 1, 2])) == 3
+  assert qrng.generate_number({'01': 5, '11': 2}) == 1
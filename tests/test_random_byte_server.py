@@ -0,0 +1,105 @@
+# Tests: random byte server
+# These tests check that the random byte server serves exact byte counts and stops cleanly when its stream of raw samples ends or fails its health tests.
+
+
+# Import libraries
+import asyncio # A library for asynchronous input and output
+import threading # A library for threads
+import numpy as np # A library for scientific computing
+from quantum_random_number_generator import RandomByteServer # The server under test
+
+
+# Define functions
+def gated_blocks(last=None):
+  # This function yields one block of uniform raw samples, waits until the test opens the gate, then yields the last block, if any, and ends
+  # Input: last, an optional numpy array representing the block after the gate
+  # Output: a tuple of a threading.Event object representing the gate and a generator of numpy arrays of raw samples
+  gate = threading.Event()
+
+
+  def blocks():
+    yield np.random.default_rng(0).integers(0, 256, 1 << 14)
+    gate.wait(10)
+    if last is not None:
+      yield last
+
+
+  return gate, blocks()
+
+
+async def request(port, n):
+  # This function requests n bytes from a server and reads until the server closes the connection
+  # Input: port, an integer representing the TCP port of the server
+  #        n, an integer representing the number of bytes
+  # Output: a bytes object of the bytes received
+  reader, writer = await asyncio.open_connection('127.0.0.1', port)
+  writer.write(b'%d\n' % n)
+  writer.write_eof()
+  data = await reader.read()
+  writer.close()
+  return data
+
+
+async def serve_and_request(server, gate, sizes, starve):
+  # This function starts a server on a free port, sends one request per size, opens the gate and waits for the server to stop
+  # Input: server, a RandomByteServer object reading from the blocks of gated_blocks function
+  #        gate, the threading.Event object of the blocks
+  #        sizes, a list of integers representing the requested numbers of bytes
+  #        starve, a boolean indicating whether to open the gate while a request waits for bytes, or after every request was served
+  # Output: a tuple of the bytes received per request and the exception the server stopped with
+
+
+  # Start the server and the requests
+  task = asyncio.create_task(server.serve(port=0))
+  while server.server is None:
+    await asyncio.sleep(0.01)
+  port = server.server.sockets[0].getsockname()[1]
+  requests = [asyncio.create_task(request(port, n)) for n in sizes]
+
+
+  # Open the gate once a request is starved, or once every request was served
+  if starve:
+    while not server.wanted:
+      await asyncio.sleep(0.01)
+  else:
+    await asyncio.wait_for(asyncio.gather(*requests), 10)
+  gate.set()
+
+
+  # Collect the bytes and the error of the server
+  received = await asyncio.wait_for(asyncio.gather(*requests), 10)
+  error = None
+  try:
+    await asyncio.wait_for(task, 10)
+  except RuntimeError as exception:
+    error = exception
+  return received, error
+
+
+def test_ended_stream_fails_waiting_requests():
+  # A stream that ends must fail the request waiting for bytes and close the server instead of hanging the client
+  gate, blocks = gated_blocks()
+  server = RandomByteServer(blocks=blocks, capacity=1 << 16)
+  received, error = asyncio.run(serve_and_request(server, gate, [1 << 15], True))
+  assert received == [b'']
+  assert isinstance(error, RuntimeError)
+  assert 'ended' in str(error.__cause__)
+
+
+def test_failed_health_test_fails_waiting_requests():
+  # A stream failing its health tests must fail the waiting request and report the cause
+  gate, blocks = gated_blocks(np.zeros(1 << 14, dtype=np.int64))
+  server = RandomByteServer(blocks=blocks, capacity=1 << 16)
+  received, error = asyncio.run(serve_and_request(server, gate, [1 << 15], True))
+  assert received == [b'']
+  assert 'Repetition count test failed' in str(error.__cause__)
+
+
+def test_requests_get_exact_byte_counts():
+  # Requests within the buffered bytes are served in full
+  gate, blocks = gated_blocks()
+  server = RandomByteServer(blocks=blocks, capacity=1 << 16)
+  received, error = asyncio.run(serve_and_request(server, gate, [10, 1000, 32], False))
+  assert [len(data) for data in received] == [10, 1000, 32]
+  assert len(set(received)) == 3
+  assert isinstance(error, RuntimeError)
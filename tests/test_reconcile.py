@@ -0,0 +1,67 @@
+# Tests: reconcile
+# These tests check the single hash join of reconcile against a quadratic search of every message for every word, and the conflict resolution built on it for pairs, groups and batches of messages.
+
+
+# Import libraries
+import random # A library for generating random numbers
+import pytest # A library for testing
+from core import format_message, parse_message # The message primitives
+from conflict_resolver import reconcile, resolve_batch, resolve_conflict, resolve_conflicts, similar, vocab # The CR droplet
+
+
+# Define functions
+def search_reconcile(*records):
+  # This function reconciles records by searching every message for every word, in order of first appearance
+  words = []
+  for message in records:
+    for word, frequency in message:
+      if word not in words:
+        words.append(word)
+  result = []
+  for word in words:
+    frequencies = [next(frequency for other, frequency in message if other == word) for message in records if any(other == word for other, frequency in message)]
+    result.append((word, round(sum(frequencies) / len(frequencies))))
+  return result
+
+
+def random_records(rng, length):
+  # This function returns random records, possibly repeating a word
+  return [(rng.choice(vocab), rng.randrange(100)) for part in range(length)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_reconcile_matches_a_search(seed):
+  rng = random.Random(seed)
+  records = [random_records(rng, rng.randrange(8)) for vm in range(rng.randrange(1, 5))]
+  assert reconcile(*records) == search_reconcile(*records)
+
+
+def test_reconcile_examples():
+  assert reconcile([('jinx', 3), ('karma', 4)], [('karma', 7), ('eerie', 1)]) == [('jinx', 3), ('karma', 6), ('eerie', 1)]
+  assert reconcile([('jinx', 3), ('jinx', 9)], [('jinx', 5)]) == [('jinx', 4)]
+  assert reconcile() == [] and reconcile([]) == []
+
+
+def test_similar_messages_are_kept():
+  message = 'abracadabra: 12, boogeyman: 7'
+  assert resolve_conflict(message, message) == (message, message)
+  assert resolve_conflict(message, message[:-1] + '8') == (message, message[:-1] + '8')
+
+
+def test_conflicting_messages_get_the_consensus():
+  message1 = 'abracadabra: 12, boogeyman: 7'
+  message2 = 'lunatic: 3, boogeyman: 9, ghastly: 1'
+  consensus = format_message(reconcile(parse_message(message1), parse_message(message2)))
+  assert consensus == 'abracadabra: 12, boogeyman: 8, lunatic: 3, ghastly: 1'
+  assert resolve_conflict(message1, message2) == (consensus, consensus)
+  assert resolve_conflicts([message1, message1, message2]) == [format_message(reconcile(*(parse_message(message) for message in [message1, message1, message2])))] * 3
+  assert resolve_conflicts([message1, message1]) == [message1, message1]
+
+
+def test_resolve_batch_matches_resolve_conflict():
+  rng = random.Random(0)
+  messages1 = [format_message(random_records(rng, 3)) for pair in range(200)]
+  messages2 = [message if rng.random() < 0.3 else format_message(random_records(rng, 3)) for message in messages1]
+  resolved1, resolved2 = resolve_batch(messages1, messages2)
+  assert list(zip(resolved1, resolved2)) == [resolve_conflict(message1, message2) for message1, message2 in zip(messages1, messages2)]
+  assert any(not similar(message1, message2) for message1, message2 in zip(messages1, messages2))
@@ -0,0 +1,64 @@
+# Tests: sampling
+# These tests check that the alias tables reproduce the measurement distribution of a state exactly, that sampling follows it, and that the cache of tables is safe to share between threads.
+
+
+# Import libraries
+import threading # A library for multithreading
+import numpy as np # A library for scientific computing
+from core import build_alias_table, measure_states, random_state, sample_outcomes # The sampling primitives
+from core.sampling import ALIAS_CACHE_SIZE, alias_tables # The cache of alias tables
+
+
+# Define functions
+def test_alias_table_reproduces_probabilities():
+  # Each outcome gets its own acceptance mass plus the rejected mass of every column aliasing it
+  state = random_state(6)
+  accept, alias = build_alias_table(state)
+  mass = accept + np.bincount(alias, weights=1 - accept, minlength=len(accept))
+  assert np.allclose(mass / len(accept), np.abs(state)**2)
+
+
+def test_alias_table_of_basis_state():
+  state = np.zeros(8)
+  state[5] = 1
+  assert set(sample_outcomes(state, 1000)) == {5}
+
+
+def test_samples_follow_probabilities():
+  # The frequencies of many samples are within a few standard deviations of the probabilities
+  state = random_state(4)
+  probs = np.abs(state)**2
+  m = 200000
+  frequencies = np.bincount(sample_outcomes(state, m), minlength=len(state)) / m
+  assert np.all(np.abs(frequencies - probs) < 5 * np.sqrt(probs * (1 - probs) / m) + 1e-9)
+
+
+def test_measure_states_follows_probabilities():
+  states = np.stack([random_state(3) for _ in range(4)])
+  m = 100000
+  counts = measure_states(states, m)
+  assert (counts.sum(axis=1) == m).all()
+  assert np.allclose(counts / m, np.abs(states)**2, atol=0.01)
+
+
+def test_cache_is_thread_safe():
+  # Threads sampling more states than the cache holds keep evicting each other's tables
+  states = [random_state(3) for _ in range(2 * ALIAS_CACHE_SIZE)]
+  errors = []
+
+
+  def sample(offset):
+    try:
+      for i in range(2000):
+        sample_outcomes(states[(offset + i) % len(states)], 4)
+    except Exception as error:
+      errors.append(error)
+
+
+  threads = [threading.Thread(target=sample, args=(offset,)) for offset in range(8)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  assert errors == []
+  assert len(alias_tables) <= ALIAS_CACHE_SIZE
@@ -0,0 +1,60 @@
+# Tests: bulk signatures
+# These tests check that batches of messages signed with a one-time pad verify with the same pad, and only with it.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+from quantum_cryptography import H, KeyPool, sign_messages, verify_messages # The signatures and the key pool
+
+
+# Define functions
+def seeded_generator(seed):
+  # This function returns a key generator yielding the same bits for the same seed, standing in for the two ends of a key exchange
+  # Input: seed, an integer seeding the key bits
+  # Output: a function returning a binary string of 256 key bits per call
+  rng = np.random.default_rng(seed)
+  return lambda: ''.join(rng.choice(['0', '1'], size=256))
+
+
+def test_pad_taken_once_verifies_large_batch():
+  # A pad taken explicitly from one pool and passed to both sides verifies, even for more messages than the default pool holds
+  messages = ['message %d' % i for i in range(5000)]
+  pool = KeyPool(seeded_generator(0)).start()
+  try:
+    pad = pool.take_bytes(H * len(messages), timeout=60)
+  finally:
+    pool.stop()
+  signatures = sign_messages(messages, pad)
+  assert verify_messages(messages, signatures, pad).all()
+  assert not verify_messages(messages[1:] + messages[:1], signatures, pad).any()
+
+
+def test_synchronised_pools_verify():
+  # Two pools yielding the same key bits sign and verify the same batch
+  messages = ['alpha', b'beta', 'gamma']
+  signer = KeyPool(seeded_generator(1)).start()
+  verifier = KeyPool(seeded_generator(1)).start()
+  try:
+    signatures = sign_messages(messages, signer)
+    assert verify_messages(messages, signatures, verifier).all()
+  finally:
+    signer.stop()
+    verifier.stop()
+
+
+def test_single_pool_cannot_verify_its_own_pad():
+  # The pool the batch was signed with has used up the pad, so it cannot verify the batch
+  messages = ['alpha', 'beta']
+  pool = KeyPool(seeded_generator(2)).start()
+  try:
+    signatures = sign_messages(messages, pool)
+    assert not verify_messages(messages, signatures, pool).any()
+  finally:
+    pool.stop()
+
+
+def test_shared_key_signs_like_repeated_pad():
+  # A key of H bytes masks every message like a pad repeating it
+  messages = ['one', 'two']
+  key = bytes(range(H))
+  assert (sign_messages(messages, key) == sign_messages(messages, key * 2)).all()
@@ -0,0 +1,106 @@
+# Tests: similarity
+# These tests check that similar scores messages with records on their records and the others with the full matcher, that its screening tiers never change that decision, and that MinHash signatures and their locality-sensitive buckets find the similar pairs among many messages.
+
+
+# Import libraries
+import itertools # A library for iterators
+import random # A library for generating random numbers
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from core import format_message, parse_message # The message primitives
+from conflict_resolver import compare_messages, compare_records, similar, minhash_signatures, similar_pairs, vocab, PERMUTATIONS # The CR droplet
+
+
+# Define functions
+def random_message(rng):
+  # This function returns a random message of one to four parts
+  return format_message((rng.choice(vocab), rng.randrange(100)) for part in range(rng.randrange(1, 5)))
+
+
+def mutate(rng, message):
+  # This function changes a few characters of a message, and sometimes drops its end
+  characters = list(message)
+  for change in range(rng.randrange(4)):
+    if characters:
+      characters[rng.randrange(len(characters))] = rng.choice('abcxyz0123: ')
+  if rng.random() < 0.2:
+    characters = characters[:len(characters) // 2]
+  return ''.join(characters)
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.8, 0.95])
+def test_similar_matches_the_full_matcher(threshold):
+  rng = random.Random(threshold)
+  for pair in range(2000):
+    message1 = random_message(rng)
+    message2 = mutate(rng, message1) if rng.random() < 0.5 else random_message(rng)
+    records1, records2 = parse_message(message1), parse_message(message2)
+    score = compare_records(records1, records2) if records1 and records2 else compare_messages(message1, message2)
+    assert similar(message1, message2, threshold) == (score >= threshold)
+
+
+def score_records(records1, records2):
+  # This function scores two lists of records with a loop over every pair of words
+  words1 = [word for i, (word, frequency) in enumerate(records1) if word not in [other for other, count in records1[:i]]]
+  words2 = [word for i, (word, frequency) in enumerate(records2) if word not in [other for other, count in records2[:i]]]
+  matches = 0.0
+  for word in words1:
+    for other in words2:
+      if word == other:
+        first = next(frequency for name, frequency in records1 if name == word)
+        second = next(frequency for name, frequency in records2 if name == word)
+        matches += min(first, second) / max(first, second) if max(first, second) else 1.0
+  return 2.0 * matches / (len(words1) + len(words2)) if words1 or words2 else 1.0
+
+
+def test_compare_records_matches_a_loop():
+  rng = random.Random(2)
+  for pair in range(500):
+    records1 = parse_message(random_message(rng))
+    records2 = parse_message(random_message(rng)) if rng.random() < 0.5 else [(word, max(0, frequency + rng.randrange(-3, 4))) for word, frequency in records1]
+    assert compare_records(records1, records2) == pytest.approx(score_records(records1, records2))
+
+
+def test_records_decide_over_characters():
+  # The same records in another order are one message to the resolver, though their characters differ a lot
+  message1, message2 = 'jinx: 3, karma: 40', 'karma: 40, jinx: 3'
+  assert compare_messages(message1, message2) < 0.8
+  assert similar(message1, message2)
+  # A near copy with a far frequency is not, though its characters barely differ
+  message1, message2 = 'jinx: 3, karma: 40', 'jinx: 3, karma: 4'
+  assert compare_messages(message1, message2) >= 0.8
+  assert not similar(message1, message2)
+  assert compare_records([('jinx', 3), ('jinx', 9)], [('jinx', 3)]) == 1.0
+
+
+def test_similar_edge_cases():
+  assert similar('', '')
+  assert not similar('', 'jinx: 1')
+  assert similar('jinx: 1', 'jinx: 1', threshold=1.0)
+
+
+def test_signatures_estimate_jaccard_similarity():
+  messages = ['abracadabra: 12, boogeyman: 7', 'abracadabra: 12, boogeyman: 8', 'lunatic: 3']
+  signatures = minhash_signatures(messages)
+  assert signatures.shape == (3, PERMUTATIONS)
+  assert (minhash_signatures(messages[:1]) == signatures[:1]).all()
+  shingles = [{message[i:i + 3] for i in range(len(message) - 2)} for message in messages]
+  jaccard = len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+  assert abs(np.mean(signatures[0] == signatures[1]) - jaccard) < 0.2
+  assert np.mean(signatures[0] == signatures[2]) < 0.2
+
+
+def test_similar_pairs_are_verified_and_found():
+  rng = random.Random(1)
+  messages = [random_message(rng) for message in range(100)]
+  messages += [message[:-1] + 'x' for message in messages[:30]]
+  pairs = similar_pairs(messages)
+  assert pairs == sorted(set(pairs))
+  assert all(first < second and similar(messages[first], messages[second]) for first, second in pairs)
+
+
+  # Near copies share most shingles, so their buckets find almost all of them
+  expected = {(first, second) for first, second in itertools.combinations(range(len(messages)), 2) if similar(messages[first], messages[second])}
+  copies = {(i, 100 + i) for i in range(30)} & expected
+  assert copies and len(copies & set(pairs)) >= 0.9 * len(copies)
+  assert set(pairs) <= expected
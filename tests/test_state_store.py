@@ -0,0 +1,83 @@
+# Tests: state store
+# These tests check that the state store keeps each distinct state once, finds the states of an earlier store when reopened, and maps them back without copying.
+
+
+# Import libraries
+import os # A library for files and directories
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from data_logger import StateStore, open_states, STATES_FILE, HASHES_FILE, HASH_SIZE # The state store
+
+
+# Define constants
+N = 3 # The number of qubits of the stored states
+
+
+# Define functions
+def random_states(count, seed=0):
+  # This function returns random normalized states on N qubits
+  rng = np.random.default_rng(seed)
+  states = rng.normal(size=(count, 2**N)) + 1j * rng.normal(size=(count, 2**N))
+  return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def test_equal_states_share_an_id(tmp_path):
+  states = random_states(4)
+  store = StateStore(str(tmp_path), N)
+  ids = store.add_many(np.concatenate([states, states[::-1], states[:2]]))
+  assert ids.tolist() == [0, 1, 2, 3, 3, 2, 1, 0, 0, 1]
+  assert store.add(states[2].copy()) == 2
+  # Negative zeros are stored as positive zeros, so both spellings of a state are one state
+  basis = np.zeros(2**N, dtype=np.complex128)
+  basis[0] = 1
+  signed = basis.copy()
+  signed.imag = -0.0
+  assert signed.tobytes() != basis.tobytes()
+  assert store.add(basis) == store.add(signed) == 4
+  store.close()
+  assert os.path.getsize(tmp_path / STATES_FILE) == 5 * 2**N * 16
+  assert os.path.getsize(tmp_path / HASHES_FILE) == 5 * HASH_SIZE
+
+
+def test_reopen_finds_stored_states(tmp_path):
+  states = random_states(6)
+  store = StateStore(str(tmp_path), N)
+  store.add_many(states[:4])
+  store.close()
+  store = StateStore(str(tmp_path), N)
+  assert store.add_many(states[2:]).tolist() == [2, 3, 4, 5]
+  store.close()
+  assert np.array_equal(open_states(str(tmp_path), N), states)
+
+
+def test_reopen_drops_a_torn_state(tmp_path):
+  states = random_states(3)
+  store = StateStore(str(tmp_path), N)
+  store.add_many(states)
+  store.close()
+  # A state written without its hash is dropped
+  with open(tmp_path / HASHES_FILE, 'r+b') as file:
+    file.truncate(2 * HASH_SIZE + 3)
+  store = StateStore(str(tmp_path), N)
+  assert store.count == 2
+  assert store.add(states[2]) == 2
+  store.close()
+  assert np.array_equal(open_states(str(tmp_path), N), states)
+
+
+def test_open_states_maps_the_file(tmp_path):
+  assert open_states(str(tmp_path), N).shape == (0, 2**N)
+  store = StateStore(str(tmp_path), N)
+  store.add_many(random_states(5))
+  store.close()
+  states = open_states(str(tmp_path), N)
+  assert isinstance(states, np.memmap)
+  assert not states.flags.writeable
+  assert np.array_equal(states[[4, 1]], random_states(5)[[4, 1]])
+
+
+def test_wrong_size_is_rejected(tmp_path):
+  store = StateStore(str(tmp_path), N)
+  with pytest.raises(ValueError):
+    store.add(np.zeros(2**(N + 1)))
+  store.close()
@@ -0,0 +1,61 @@
+# Tests: statevector arithmetic
+# These tests check the reversible adders and the multiplier on every basis state of small registers, and that they refuse states without room for their registers.
+
+
+# Import libraries
+import numpy as np # A library for scientific computing
+import pytest # A library for testing
+from quantum_logic import controlled_multiply, cuccaro_add, draper_add # The statevector arithmetic
+
+
+# Define functions
+def basis_state(num_qubits, index):
+  # This function returns the basis state |index> of num_qubits qubits
+  state = np.zeros(2**num_qubits, dtype=complex)
+  state[index] = 1
+  return state
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_cuccaro_add_basis_states(n):
+  # |a>|b>|c> goes to |a>|a+b mod 2**n>|c XOR carry>
+  for a in range(2**n):
+    for b in range(2**n):
+      result = cuccaro_add(basis_state(2 * n + 1, a | b << n), n, carry=True)
+      total = a + b
+      assert result[a | (total % 2**n) << n | (total >> n) << (2 * n)] == 1
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_draper_add_matches_cuccaro_add(n):
+  state = np.random.default_rng(n).normal(size=2**(2 * n + 1)) + 0j
+  state /= np.linalg.norm(state)
+  assert np.allclose(draper_add(state, n), cuccaro_add(state, n))
+
+
+@pytest.mark.parametrize('controlled', [False, True])
+def test_controlled_multiply_basis_states(controlled):
+  # |a>|b>|p>|c> goes to |a>|b>|p + c*a*b mod 2**(2n)>|c>
+  n = 2
+  for index in range(2**(4 * n + controlled)):
+    a, b, p, c = index & 3, index >> 2 & 3, index >> 4 & 15, index >> 8 & 1
+    product = a * b * (c if controlled else 1)
+    result = controlled_multiply(basis_state(4 * n + controlled, index), n, controlled)
+    assert result[(index & ~(15 << 4)) | ((p + product) % 16) << 4] == 1
+
+
+def test_batch_of_states():
+  states = np.stack([basis_state(4, 1 | 2 << 2), basis_state(4, 3 | 3 << 2)])
+  result = cuccaro_add(states, 2)
+  assert result[0, 1 | 3 << 2] == 1 and result[1, 3 | 2 << 2] == 1
+
+
+@pytest.mark.parametrize('operation, num_qubits', [(lambda state: cuccaro_add(state, 2, carry=True), 4), (lambda state: draper_add(state, 3), 5), (lambda state: controlled_multiply(state, 2), 8)])
+def test_too_few_qubits_raise_value_error(operation, num_qubits):
+  with pytest.raises(ValueError, match='needs at least'):
+    operation(basis_state(num_qubits, 0))
+
+
+def test_state_size_must_be_power_of_two():
+  with pytest.raises(ValueError):
+    cuccaro_add(np.ones(6), 1)